@@ -0,0 +1,309 @@
+from Core.ArchivesManager import ArchiveFileManager
+
+import hashlib
+import logging
+import sqlite3
+import shutil
+import os
+
+
+
+log = logging.getLogger(__name__)
+
+
+class ArchiveIndex(object):
+
+    def __init__(self, path):
+        """
+        Persistent index of already ingested archives, stored in SQLite database
+        (usually next to the library). Archive is identified by its path and destination
+        library, size, modification time, set of member CRCs and ExtractionProfile it was
+        extracted with, and maps to extracted asset folder. The same archive ingested to
+        other library is a separate entry.
+
+        Safe to share between processes: every process opens own connection,
+        database runs in WAL mode so readers do not block the writer.
+
+        :param path: < str > path to database file
+        """
+        super(ArchiveIndex, self).__init__()
+
+        if not isinstance(path, str):
+            raise TypeError("Expected < str >")
+
+        self._path = path
+        self._connection = None
+        self._pid = None
+
+
+    @property
+    def path(self):
+        return self._path
+
+
+    def _db(self):
+        # connection can not be shared with forked worker processes
+
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        directory = os.path.dirname(os.path.abspath(self._path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._connection = sqlite3.connect(self._path, timeout=60)
+        self._pid = os.getpid()
+
+        self._connection.execute("PRAGMA journal_mode=WAL")
+
+        columns = [row[1] for row in self._connection.execute("PRAGMA table_info(archives)")]
+
+        if columns and "destination" not in columns:
+            self._migrate(columns)
+        else:
+            self._createTable()
+
+        self._connection.commit()
+
+        return self._connection
+
+
+    def _createTable(self):
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS archives ("
+            "path TEXT, destination TEXT, size INTEGER, mtime INTEGER, crc TEXT, folder TEXT, "
+            "profile TEXT DEFAULT '', PRIMARY KEY (path, destination))"
+        )
+
+
+    def _migrate(self, columns):
+        # databases keyed by archive path only, destination library is parent of asset folder;
+        # databases created before profiles were stored, their archives used default profile
+
+        profile = "profile" if "profile" in columns else "''"
+        rows = self._connection.execute(
+            "SELECT path, size, mtime, crc, folder, %s FROM archives" % profile
+        ).fetchall()
+
+        self._connection.execute("DROP TABLE archives")
+        self._createTable()
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO archives (path, destination, size, mtime, crc, folder, profile) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(path, self._destination(folder), size, mtime, crc, folder, stored or "")
+             for path, size, mtime, crc, folder, stored in rows]
+        )
+
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+
+    @staticmethod
+    def _destination(folder):
+        # destination library of asset folder
+        return ArchiveIndex._key(os.path.dirname(os.path.abspath(folder)))
+
+
+    @staticmethod
+    def profileKey(profile):
+        """
+        :param profile: < ExtractionProfile > or None for default profile of extractor
+        :return: < str > stored fingerprint of profile
+        """
+        return profile.fingerprint() if profile is not None else ""
+
+
+    @staticmethod
+    def _digest(checksums):
+        digest = hashlib.sha1()
+
+        for name, crc in sorted(checksums):
+            digest.update(("%s:%08x\n" % (name, crc)).encode("utf-8"))
+
+        return digest.hexdigest()
+
+
+    @staticmethod
+    def checksumFromInfos(infos):
+        """
+        Digest of member names and CRCs
+
+        :param infos: list of zipfile.ZipInfo / rarfile.RarInfo objects
+        :return: < str >
+        """
+
+        return ArchiveIndex._digest((info.filename, info.CRC) for info in infos)
+
+
+    @staticmethod
+    def checksum(path):
+        """
+        Digest of member names and CRCs of archive, only archive directory is read
+
+        :param path: path to archive
+        :return: < str >
+        """
+
+        manager = ArchiveFileManager()
+        manager.archiveFile = path
+
+        if not manager.open():
+            return ""
+
+        try:
+            checksums = manager.checksums()
+        finally:
+            manager.close()
+
+        return ArchiveIndex._digest(checksums.items())
+
+
+    def lookup(self, path, destination, profile=None):
+        """
+        Return extracted asset folder if archive was already ingested to destination
+        library with the same profile and did not change, otherwise empty string.
+        Size and modification time are compared first, member CRCs are read only if
+        modification time changed but size did not (i.e. copied file).
+
+        :param path: path to archive
+        :param destination: destination library folder
+        :param profile: < ExtractionProfile > archive is extracted with, None for default
+        :return: < str >
+        """
+
+        key = (self._key(path), self._key(destination))
+
+        row = self._db().execute(
+            "SELECT size, mtime, crc, folder, profile FROM archives WHERE path = ? AND destination = ?", key
+        ).fetchone()
+
+        if row is None:
+            return ""
+
+        size, mtime, crc, folder, stored = row
+
+        if (stored or "") != self.profileKey(profile):
+            return ""
+
+        if not os.path.isdir(folder):
+            return ""
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return ""
+
+        if stat.st_size != size:
+            return ""
+
+        if stat.st_mtime_ns == mtime:
+            return folder
+
+        if self.checksum(path) != crc:
+            return ""
+
+        db = self._db()
+        db.execute("UPDATE archives SET mtime = ? WHERE path = ? AND destination = ?", (stat.st_mtime_ns,) + key)
+        db.commit()
+
+        return folder
+
+
+    def folder(self, path, destination):
+        """
+        Asset folder recorded for archive in destination library, even if archive changed since
+
+        :param path: path to archive
+        :param destination: destination library folder
+        :return: < str > folder or empty string if archive was never ingested to destination
+        """
+
+        row = self._db().execute(
+            "SELECT folder FROM archives WHERE path = ? AND destination = ?", (self._key(path), self._key(destination))
+        ).fetchone()
+
+        return row[0] if row else ""
+
+
+    def record(self, path, folder, archive=None, profile=None):
+        """
+        Store archive fingerprint and its extracted asset folder
+
+        :param path: path to archive
+        :param folder: extracted asset folder, its parent is destination library
+        :param archive: optional opened zipfile.ZipFile / rarfile.RarFile of "path"
+                        to read CRCs without reopening archive
+        :param profile: < ExtractionProfile > archive was extracted with, None for default
+        """
+
+        stat = os.stat(path)
+
+        if archive is not None:
+            crc = self.checksumFromInfos(archive.infolist())
+        else:
+            crc = self.checksum(path)
+
+        db = self._db()
+        db.execute(
+            "INSERT OR REPLACE INTO archives (path, destination, size, mtime, crc, folder, profile) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (self._key(path), self._destination(folder), stat.st_size, stat.st_mtime_ns, crc, folder,
+             self.profileKey(profile))
+        )
+        db.commit()
+
+
+    @staticmethod
+    def discardFolder(stale, folder, catalogue=None):
+        """
+        Remove asset folder of previous ingest of archive, which was replaced by
+        new extraction, and its catalogue row, so library keeps one copy of asset.
+        Extractors call it only if their "replaceStale" is set. Folder which is not
+        asset folder of the same library as new folder is never removed.
+
+        :param stale: folder returned by folder() before archive was extracted again
+        :param folder: new asset folder, nothing is removed if it is the same
+        :param catalogue: < LibraryCatalogue > to remove stale asset from, if any
+
+        :return: < bool > stale folder was removed
+        """
+
+        if not stale or ArchiveIndex._key(stale) == ArchiveIndex._key(folder):
+            return False
+
+        if ArchiveIndex._destination(stale) != ArchiveIndex._destination(folder):
+            log.warning("Stale folder %s is not in library of %s, it is kept", stale, folder)
+            return False
+
+        if catalogue is not None:
+            assetID = catalogue.assetIDFromFolder(stale)
+            if assetID: catalogue.removeAsset(assetID)
+
+        log.info("Removing stale folder %s replaced by %s", stale, folder)
+        shutil.rmtree(stale, ignore_errors=True)
+
+        return True
+
+
+    def remove(self, path, destination=None):
+        """
+        Forget archive in destination library, in all libraries if destination is None
+        """
+
+        db = self._db()
+
+        if destination is None:
+            db.execute("DELETE FROM archives WHERE path = ?", (self._key(path),))
+        else:
+            db.execute("DELETE FROM archives WHERE path = ? AND destination = ?", (self._key(path), self._key(destination)))
+
+        db.commit()
+
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+        self._pid = None
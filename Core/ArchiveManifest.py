@@ -0,0 +1,157 @@
+import os
+
+
+
+class ArchiveMember(object):
+
+    __slots__ = (
+        "name",
+        "extension",
+        "textureType",
+        "lod",
+        "variation",
+        "resolution",
+        "isImage",
+        "isGeometry",
+        "isPreview",
+        "isBillboard",
+        "isHiresGeometry",
+        "isJSON",
+    )
+
+    def __init__(self, name):
+        """
+        Classification of single archive member. Filled by ArchiveManifest.
+
+        :param name: < str > archive member name
+        """
+        self.name = name
+        self.extension = os.path.splitext(name)[-1]
+        self.textureType = ""
+        self.lod = ""
+        self.variation = ""
+        self.resolution = 0
+        self.isImage = False
+        self.isGeometry = False
+        self.isPreview = False
+        self.isBillboard = False
+        self.isHiresGeometry = False
+        self.isJSON = False
+
+
+
+class ArchiveManifest(object):
+
+    def __init__(self, names, classifier, textureMode=3):
+        """
+        Classify every archive member exactly once, so texture, geometry, preview
+        and json lookups can share the result instead of rescanning namelist().
+
+        :param names: list of archive member names
+        :param classifier: object providing string parsing functions
+                           textureTypeFromString(string, mode), LODFromString(string, caseSense),
+                           variationFromString(string, caseSense), isImage(string),
+                           isGeometry(string), isMatchedWithExtensions(string, extensions)
+                           and optionally isPreview(string), isBillboardTexture(string),
+                           isHiresGeometry(string), textureSizeFromString(string)
+        :param textureMode: < int > search mode for textureTypeFromString
+        """
+        super(ArchiveManifest, self).__init__()
+
+        self._members = []
+        self._byName = {}
+
+        isPreview = getattr(classifier, "isPreview", None)
+        isBillboard = getattr(classifier, "isBillboardTexture", None)
+        isHires = getattr(classifier, "isHiresGeometry", None)
+        resolution = getattr(classifier, "textureSizeFromString", None)
+
+        for name in names:
+            member = ArchiveMember(name)
+
+            member.textureType = classifier.textureTypeFromString(name, textureMode)
+            member.lod = classifier.LODFromString(name, caseSense=True)
+            member.variation = classifier.variationFromString(name, caseSense=False)
+            member.isImage = classifier.isImage(name)
+            member.isGeometry = classifier.isGeometry(name)
+            member.isJSON = classifier.isMatchedWithExtensions(name, ["json"])
+
+            if isPreview: member.isPreview = isPreview(name)
+            if isBillboard: member.isBillboard = isBillboard(name)
+            if isHires: member.isHiresGeometry = isHires(name)
+
+            if resolution and member.isImage:
+                size = resolution(name)
+                if size: member.resolution = max(size)
+
+            self._members.append(member)
+            self._byName[name] = member
+
+
+    def __len__(self):
+        return len(self._members)
+
+
+    def __iter__(self):
+        return iter(self._members)
+
+
+    def __getitem__(self, name):
+        return self._byName[name]
+
+
+    @property
+    def members(self):
+        return self._members
+
+
+    def names(self):
+        return [member.name for member in self._members]
+
+
+    def textures(self, billboard=False):
+        """
+        Members with recognized texture type
+
+        :param billboard: < bool > False - skip billboards, True - only billboards, None - all
+
+        :return: list<ArchiveMember>
+        """
+
+        return [
+            member for member in self._members
+            if member.textureType and (billboard is None or member.isBillboard == billboard)
+        ]
+
+
+    def billboards(self):
+        return self.textures(billboard=True)
+
+
+    def geometry(self, hires=False):
+        """
+        Geometry members
+
+        :param hires: < bool > include hires geometry
+
+        :return: list<ArchiveMember>
+        """
+
+        return [
+            member for member in self._members
+            if member.isGeometry and (hires or not member.isHiresGeometry)
+        ]
+
+
+    def preview(self):
+        """
+        First preview member or None
+        """
+        for member in self._members:
+            if member.isPreview:
+                return member
+        return None
+
+
+    def jsonFiles(self):
+        return [member for member in self._members if member.isJSON]
@@ -1,295 +1,1305 @@
-import rarfile
-import zipfile
-import tarfile
-import os
-
-PATH_TO_UNRAREXE = "C:/Program Files/WinRAR/UnRAR.exe"
-rarfile.UNRAR_TOOL = PATH_TO_UNRAREXE
-
-
-class ArchiveFileManager(object):
-
-    # Archive types
-
-    RAR = 'rar'
-    ZIP = 'zip'
-    TAR = "tar"
-    NOT_ARCHIVE = ""
-
-
-    @staticmethod
-    def isArchive(filepath):
-        """
-        If file path is archive return True, otherwise False
-
-        :param filepath: path to archive file
-
-        :return: bool
-        """
-
-        if not isinstance(filepath, str):
-            raise TypeError("Expected string")
-
-        if zipfile.is_zipfile(filepath): return True
-
-        if rarfile.is_rarfile(filepath): return True
-
-        return False
-
-
-    @staticmethod
-    def archiveType(filepath):
-        """
-        Determine archive type
-
-        :param filepath: path to archive file
-
-        :return: archive type Archives.RAR/Archives.ZIP/Archives.NOT_ARCHIVE
-        """
-
-        if zipfile.is_zipfile(filepath): return ArchiveFileManager.ZIP
-
-        if rarfile.is_rarfile(filepath): return ArchiveFileManager.RAR
-
-        return ArchiveFileManager.NOT_ARCHIVE
-
-
-    @staticmethod
-    def isRarArchive(filepath):
-        """
-        Return True if is .rar archive, otherwise False
-        :return: bool
-        """
-        return  rarfile.is_rarfile(filepath)
-
-
-    @staticmethod
-    def isZipArchive(filepath):
-        """
-        Return True if is .zip archive, otherwise False
-        :return: bool
-        """
-        return zipfile.is_zipfile(filepath)
-
-
-
-    def __init__(self):
-        super(ArchiveFileManager, self).__init__()
-        """
-        Provide archive file management. 
-        Supported types [".rar", ".zip"]
-        """
-
-        self._archiveFile = ""
-        self._archive = None
-        self._isOpened = False
-        self._isBinded = False
-
-
-
-    @property
-    def archiveFile(self):
-        return self._archiveFile
-
-
-    @property
-    def isOpened(self):
-        return self._isOpened
-
-
-    @property
-    def isBinded(self):
-        return self._isBinded
-
-
-    @archiveFile.setter
-    def archiveFile(self, archiveFile):
-
-        if not isinstance(archiveFile, str):
-            raise TypeError("Expected string")
-
-        self._archiveFile = archiveFile
-        self._isBinded = True
-
-
-
-
-    def open(self):
-        """
-        Open archive file
-
-        :return: bool True if opened
-        """
-        if zipfile.is_zipfile(self._archiveFile):
-            self._archive = zipfile.ZipFile(self._archiveFile, "r")
-            self._isOpened = True
-            return True
-
-        if rarfile.is_rarfile(self._archiveFile):
-            self._archive = rarfile.RarFile(self._archiveFile, "r")
-            self._isOpened = False
-            return True
-
-        return False
-
-
-    def close(self):
-        """
-        Close opened archive file
-        """
-        if self._archive != None:
-            self._isOpened = False
-            self._archive.close()
-
-
-    def clear(self):
-        self.close()
-        self._archive = None
-        self._archiveFile = ""
-        self._isBinded = False
-
-
-    def content(self, extensionFilter=[]):
-        """
-        Return content of archive
-
-        :param extensionFilter: list of supported file extensions (i.e. ["jpg", "fbx", ""].
-                        if filter is empty, all file extensions are supported
-
-        :return: list<str>
-        """
-
-        if self._archive == None:
-            raise StandardError("Archive was not open")
-
-        names = self._archive.namelist()
-
-
-        content = []
-        if extensionFilter:
-            for name in names:
-                extension = os.path.splitext(name)[-1]
-                try:
-                    extension = extension[1:]
-                    extension = extension.lower()
-                except:
-                    pass
-                if extension in extensionFilter:
-                    content.append(name)
-        else:
-            for name in names:
-                content.append(name)
-
-        return content
-
-
-    def extractAll(self, directory):
-        """
-        Extract all archive content in "directory"
-
-        :param directory: destination path to extract
-        """
-        if self._archive == None:
-            raise StandardError("Archive was not open")
-
-        self._archive.extractall(directory)
-
-
-    def extractMember(self, directory, name):
-        """
-        Extract archive member in "directory"
-
-        :param directory: destination path to extract
-        :param name: name of member to extract
-
-        """
-        if self._archive == None:
-            raise StandardError("Archive was not open")
-
-        self._archive.extract(name, directory)
-
-
-    def extractMembers(self, directory, names):
-        """
-        Extract any archive members in "directory"
-
-        :param directory: destination path to extract
-        :param names: list of member names to extract
-
-        """
-        if self._archive == None:
-            raise StandardError("Archive was not open")
-
-        self._archive.extractall(directory, names)
-
-
-    def extract(self, directory, namemap):
-        """
-        Extract files from archive and rename them
-
-        :param directory: destination directory path
-
-        :param namemap: map for extractable name map { archive_member_name: new_name }.
-                        new name can be with no extension, if new name is empty, member
-                        will not be extracted
-
-        """
-
-        if self._archive == None:
-            raise StandardError("Archive was not open")
-
-
-        for name in namemap:
-            new_name = namemap[name]
-            extension = os.path.splitext(name)[-1]
-
-            if new_name == "":
-                new_name = name
-
-            self._archive.extract(name, directory)
-
-            if new_name != name:
-                os.rename(
-                    os.path.join(directory, name),
-                    os.path.join(directory, new_name + extension)
-                )
-
-
-
-
-if __name__ == '__main__':
-
-    testdir = "C:/Users/edward/Desktop/archtest"
-
-    rardstdir = os.path.join(testdir, "extract_rar")
-    zipdstdir = os.path.join(testdir, "extract_zip")
-
-    rarpath = os.path.join(testdir, "Andesite.rar")
-    zippath = os.path.join(testdir, "Debris.zip")
-
-    manager = ArchiveFileManager()
-
-    targz = "C:/Users/edward/Desktop/openexr-2.3.0.tar.gz"
-    #manager.archiveFile = "C:/Users/edward/Desktop/openexr-2.3.0.tar.gz"
-    #print manager.isArchive(targz)
-
-
-    # tar.open()
-
-    # print tar.getnames()
-
-
-    # name = "Dbrs_wood_twig_T_ojDlND_4K_Albedo.jpg"
-    # names = manager.content(["fbx"])
-    # namesmap = {
-    #     "Dbrs_wood_twig_T_ojDlND_4K_Albedo.jpg": "albedo",
-    #     "Debris_Wood_Twig_ojDlND_3d_Preview.png": "preview"
-    # }
-
-
-    # manager.extract(zipdstdir, name=name)
-    # manager.extract(zipdstdir, names=names)
-    #manager.extract(zipdstdir, namesmap=namesmap)
-
-    # manager.archiveFile = rarpath
-    # manager.extract(rardstdir)
+import rarfile
+import zipfile
+import tarfile
+import gzip
+import bz2
+import lzma
+import collections
+import contextlib
+import functools
+import zlib
+import threading
+import subprocess
+import tempfile
+import struct
+import shutil
+import os
+
+# unrar executable: environment variable, WinRAR default on Windows, unrar from PATH
+
+UNRAR_TOOL_ENVIRONMENT = "ASSET_LIBRARY_UNRAR"
+PATH_TO_UNRAREXE = "C:/Program Files/WinRAR/UnRAR.exe"
+
+
+def unrarTool():
+    """
+    Path to unrar executable
+
+    :return: < str >
+    """
+
+    tool = os.environ.get(UNRAR_TOOL_ENVIRONMENT, "")
+    if tool: return tool
+
+    if os.name == "nt" and os.path.isfile(PATH_TO_UNRAREXE):
+        return PATH_TO_UNRAREXE
+
+    return "unrar"
+
+
+rarfile.UNRAR_TOOL = unrarTool()
+
+EXTRACT_BUFFER_SIZE = 1024 * 1024
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None   # tar.zst is not supported
+
+# tar compression magic bytes
+
+TAR_COMPRESSIONS = [
+    ("gz",  b"\x1f\x8b"),
+    ("bz2", b"BZh"),
+    ("xz",  b"\xfd7zXZ\x00"),
+    ("zst", b"\x28\xb5\x2f\xfd")
+]
+
+RAR_MAGICS = (b"Rar!\x1a\x07\x00", b"Rar!\x1a\x07\x01\x00")
+ZIP_END_MAGIC = b"PK\x05\x06"
+
+# bytes read from start and end of file to determine archive type, zip end of
+# central directory record with maximal comment is 22 + 65535 bytes long
+
+SNIFF_HEAD_SIZE = 8192
+SNIFF_TAIL_SIZE = 4096
+SNIFF_ZIP_TAIL_SIZE = 22 + 65535
+SNIFF_CACHE_SIZE = 65536
+
+
+
+def tarMemberName(name):
+    """
+    Member name as it is used by zip (i.e. "./textures/albedo.jpg" -> "textures/albedo.jpg")
+    """
+
+    while name.startswith("./"):
+        name = name[2:]
+
+    return name
+
+
+
+def memberPath(directory, name):
+    """
+    Destination path of archive member in directory. Member names leading out of
+    directory (absolute, with drive letter or ".." components) are refused.
+
+    :param directory: destination directory path
+    :param name: member name (or relative path to write member to)
+
+    :return: path of member in directory
+    """
+
+    parts = name.replace("\\", "/").split("/")
+
+    if os.path.isabs(name) or parts[0] == "" or parts[0][1:2] == ":" or ".." in parts:
+        raise IOError("Unsafe member path " + name)
+
+    return os.path.join(directory, *[part for part in parts if part not in ("", ".")])
+
+
+
+class TarMemberInfo(object):
+
+    __slots__ = ("filename", "file_size", "CRC")
+
+    def __init__(self, info):
+        """
+        zipfile.ZipInfo like description of tar member. Tar has no data checksum,
+        header checksum (covers name, size and modification time) is used as CRC.
+        """
+        self.filename = tarMemberName(info.name)
+        self.file_size = info.size
+        self.CRC = info.chksum
+
+
+
+class TarArchive(object):
+
+    def __init__(self, path, compression=None):
+        """
+        Read only zipfile.ZipFile like interface of tar archive (namelist, infolist,
+        open, read, extract, extractall, close), so ArchiveFileManager works with tar
+        the same way as with zip and rar.
+
+        Compressed tar has no random access: gz / bz2 / xz members are read by seeking
+        in decompressed stream, zst is decompressed from the beginning for every member.
+        Use ArchiveFileManager.streamMembers / extractStream to read many members
+        in one forward pass.
+
+        :param path: path to tar archive
+        :param compression: "", "gz", "bz2", "xz", "zst" or None to detect
+        """
+        super(TarArchive, self).__init__()
+
+        if compression is None:
+            compression = ArchiveFileManager.tarCompression(path)
+
+        if compression is None:
+            raise tarfile.ReadError(path + " is not tar archive")
+
+        self.filename = path
+        self.compression = compression
+        self._tar = None
+        self._members = collections.OrderedDict()
+
+        if self.seekable:
+            self._tar = tarfile.TarFile(fileobj=ArchiveFileManager.tarStream(path, compression))
+            members = self._tar.getmembers()
+        else:
+            with tarfile.open(fileobj=ArchiveFileManager.tarStream(path, compression), mode="r|") as tar:
+                members = list(tar)
+
+        for member in members:
+            if member.isfile():
+                self._members[tarMemberName(member.name)] = member
+
+
+    @property
+    def seekable(self):
+        return self.compression != "zst"
+
+
+    def clone(self):
+        """
+        Archive object sharing member list with own decompression stream
+        """
+
+        clone = TarArchive.__new__(TarArchive)
+        clone.__dict__.update(self.__dict__)
+
+        if self.seekable:
+            clone._tar = tarfile.TarFile(fileobj=ArchiveFileManager.tarStream(self.filename, self.compression))
+
+        return clone
+
+
+    def namelist(self):
+        return list(self._members)
+
+
+    def infolist(self):
+        return [TarMemberInfo(member) for member in self._members.values()]
+
+
+    def getinfo(self, name):
+        return TarMemberInfo(self._members[name])
+
+
+    def open(self, name):
+        member = self._members[name]
+
+        if self.seekable:
+            return self._tar.extractfile(member)
+
+        for found, stream in ArchiveFileManager.streamMembers(self.filename, [name], keepOpen=True):
+            return stream
+
+        raise KeyError(name)
+
+
+    def read(self, name):
+        with self.open(name) as stream:
+            return stream.read()
+
+
+    def extract(self, name, path=""):
+        return ArchiveFileManager.copyMember(self, name, memberPath(path, name))
+
+
+    def extractall(self, path="", members=None):
+        for name in (members if members is not None else self._members):
+            self.extract(name, path)
+
+
+    def close(self):
+        if self._tar is not None:
+            self._tar.fileobj.close()
+            self._tar.close()
+            self._tar = None
+
+
+
+class _TarMemberStream(object):
+
+    def __init__(self, stream, tar, source):
+        """
+        Member of streamed tar which closes the tar stream with itself
+        """
+        self._stream = stream
+        self._tar = tar
+        self._source = source
+
+
+    def read(self, size=-1):
+        return self._stream.read(size)
+
+
+    def readable(self):
+        return True
+
+
+    def close(self):
+        self._stream.close()
+        self._tar.close()
+        self._source.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ArchiveHandlePool(object):
+
+    def __init__(self, capacity=8):
+        """
+        Cache of opened archives keyed by path. Every thread reads members through
+        its own archive object and file handle, so threads read the same archive in
+        parallel without locking each other. Zip directory is parsed again for every
+        thread (once per thread and archive, cheap compared to member reads).
+
+        Handles are reference counted, archives which are not in use are evicted
+        in least recently used order when there are more than "capacity" of them.
+        Archive changed on disk is reopened on next acquire if it is not in use.
+
+        :param capacity: < int > number of unused archives kept open
+        """
+        super(ArchiveHandlePool, self).__init__()
+
+        self._capacity = capacity
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, capacity):
+        if not isinstance(capacity, int):
+            raise TypeError("Expected < int >")
+
+        with self._lock:
+            self._capacity = capacity
+            self._evict()
+
+
+    def __len__(self):
+        return len(self._entries)
+
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+
+    @staticmethod
+    def _stamp(path):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+
+    @staticmethod
+    def _open(path):
+        archiveType, compression = ArchiveFileManager.sniff(path)
+
+        if archiveType == ArchiveFileManager.ZIP:
+            return zipfile.ZipFile(path, "r")
+
+        if archiveType == ArchiveFileManager.RAR:
+            return rarfile.RarFile(path, "r")
+
+        if archiveType == ArchiveFileManager.TAR:
+            return TarArchive(path, compression)
+
+        return None
+
+
+    @staticmethod
+    def _clone(archive):
+        """
+        Archive object of the same file with own file handle.
+        RarFile opens every member by itself, it is shared as is.
+        """
+
+        if isinstance(archive, TarArchive):
+            return archive.clone()
+
+        if not isinstance(archive, zipfile.ZipFile):
+            return archive
+
+        return zipfile.ZipFile(archive.filename, "r")
+
+
+    @staticmethod
+    def _close(entry):
+        for handle in set(entry["handles"].values()):
+            handle.close()
+
+
+    def _evict(self):
+        unused = [key for key, entry in self._entries.items() if not entry["references"]]
+
+        for key in unused[:max(0, len(unused) - self._capacity)]:
+            self._close(self._entries.pop(key))
+
+
+    def _checkProcess(self):
+        # handles are not shared with forked processes, parent closes its own
+
+        if self._pid != os.getpid():
+            self._entries = collections.OrderedDict()
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+
+
+    def acquire(self, path):
+        """
+        Opened archive for current thread, must be released with release()
+
+        :param path: path to archive file
+        :return: zipfile.ZipFile / rarfile.RarFile or None if file is not archive
+        """
+
+        self._checkProcess()
+
+        key = self._key(path)
+        stamp = self._stamp(path)
+        thread = threading.get_ident()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry["stamp"] != stamp and not entry["references"]:
+                self._close(self._entries.pop(key))
+                entry = None
+
+            if entry is None:
+                archive = self._open(path)
+                if archive is None: return None
+
+                entry = {"stamp": stamp, "handles": {thread: archive}, "archive": archive, "references": 0}
+                self._entries[key] = entry
+
+            handle = entry["handles"].get(thread)
+
+            if handle is None:
+                handle = entry["handles"][thread] = self._clone(entry["archive"])
+
+            entry["references"] += 1
+            self._entries.move_to_end(key)
+
+            return handle
+
+
+    def release(self, path):
+        """
+        Release archive acquired with acquire()
+
+        :param path: path to archive file
+        """
+
+        key = self._key(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None: return
+
+            entry["references"] = max(0, entry["references"] - 1)
+            self._evict()
+
+
+    @contextlib.contextmanager
+    def handle(self, path):
+        """
+        Context manager of acquire() / release()
+        """
+
+        archive = self.acquire(path)
+
+        try:
+            yield archive
+        finally:
+            if archive is not None: self.release(path)
+
+
+    def clear(self):
+        """
+        Close all archives which are not in use
+        """
+
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if not entry["references"]]:
+                self._close(self._entries.pop(key))
+
+
+
+class ArchiveFileManager(object):
+
+    # Archive types
+
+    RAR = 'rar'
+    ZIP = 'zip'
+    TAR = "tar"
+    NOT_ARCHIVE = ""
+
+
+    @staticmethod
+    def sniff(filepath):
+        """
+        Determine archive type and tar compression from magic bytes. Only first and
+        last few KB of file are read, once: result is cached by path, size and
+        modification time, so repeated checks of unchanged file cost one stat.
+
+        :param filepath: path to file
+
+        :return: (archive type, tar compression) archive type is
+                 ArchiveFileManager.RAR/ZIP/TAR/NOT_ARCHIVE, tar compression is
+                 "", "gz", "bz2", "xz", "zst" or None if file is not tar
+        """
+
+        if not isinstance(filepath, str):
+            raise TypeError("Expected string")
+
+        try:
+            stat = os.stat(filepath)
+        except (IOError, OSError):
+            return ArchiveFileManager.NOT_ARCHIVE, None
+
+        return ArchiveFileManager._sniff(os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns)
+
+
+    @staticmethod
+    @functools.lru_cache(maxsize=SNIFF_CACHE_SIZE)
+    def _sniff(filepath, size, mtime):
+        try:
+            with open(filepath, "rb") as f:
+                head = f.read(SNIFF_HEAD_SIZE)
+
+                if head.startswith(RAR_MAGICS):
+                    return ArchiveFileManager.RAR, None
+
+                if ArchiveFileManager._hasZipEnd(f, size, SNIFF_TAIL_SIZE):
+                    return ArchiveFileManager.ZIP, None
+
+                # zip with long comment
+
+                if head.startswith(b"PK") and size > SNIFF_TAIL_SIZE:
+                    if ArchiveFileManager._hasZipEnd(f, size, SNIFF_ZIP_TAIL_SIZE):
+                        return ArchiveFileManager.ZIP, None
+
+        except (IOError, OSError):
+            return ArchiveFileManager.NOT_ARCHIVE, None
+
+        compression = ArchiveFileManager._tarCompression(filepath, head)
+
+        if compression is not None:
+            return ArchiveFileManager.TAR, compression
+
+        return ArchiveFileManager.NOT_ARCHIVE, None
+
+
+    @staticmethod
+    def _hasZipEnd(f, size, tailSize):
+        tailSize = min(size, tailSize)
+        f.seek(size - tailSize)
+        tail = f.read(tailSize)
+
+        index = tail.rfind(ZIP_END_MAGIC)
+
+        # record is 22 bytes, comment length field must fit the rest of file
+
+        if index < 0 or len(tail) - index < 22:
+            return False
+
+        comment = struct.unpack("<H", tail[index + 20:index + 22])[0]
+
+        return index + 22 + comment <= len(tail)
+
+
+    @staticmethod
+    def _tarCompression(filepath, head):
+        compression = ""
+
+        for name, magic in TAR_COMPRESSIONS:
+            if head.startswith(magic):
+                compression = name
+                break
+
+        if compression == "zst" and zstandard is None:
+            return None
+
+        # first header block is decompressed from already read bytes if possible
+
+        block = b""
+
+        try:
+            if compression == "":
+                block = head[:tarfile.BLOCKSIZE]
+            elif compression == "gz":
+                block = zlib.decompressobj(31).decompress(head, tarfile.BLOCKSIZE)
+            elif compression == "xz":
+                block = lzma.LZMADecompressor().decompress(head, tarfile.BLOCKSIZE)
+            elif compression == "zst":
+                block = zstandard.ZstdDecompressor().decompressobj().decompress(head)[:tarfile.BLOCKSIZE]
+        except Exception:
+            return None
+
+        try:
+            if len(block) < tarfile.BLOCKSIZE and compression:
+                # bz2 block or tiny head, decompress from file
+
+                with ArchiveFileManager.tarStream(filepath, compression) as stream:
+                    block = b""
+                    while len(block) < tarfile.BLOCKSIZE:
+                        data = stream.read(tarfile.BLOCKSIZE - len(block))
+                        if not data: break
+                        block += data
+
+            tarfile.TarInfo.frombuf(block, tarfile.ENCODING, "surrogateescape")
+        except Exception:
+            return None
+
+        return compression
+
+
+    @staticmethod
+    def isArchive(filepath):
+        """
+        If file path is archive return True, otherwise False
+
+        :param filepath: path to archive file
+
+        :return: bool
+        """
+
+        return ArchiveFileManager.sniff(filepath)[0] != ArchiveFileManager.NOT_ARCHIVE
+
+
+    @staticmethod
+    def archiveType(filepath):
+        """
+        Determine archive type
+
+        :param filepath: path to archive file
+
+        :return: archive type Archives.RAR/Archives.ZIP/Archives.TAR/Archives.NOT_ARCHIVE
+        """
+
+        return ArchiveFileManager.sniff(filepath)[0]
+
+
+    @staticmethod
+    def isRarArchive(filepath):
+        """
+        Return True if is .rar archive, otherwise False
+        :return: bool
+        """
+        return ArchiveFileManager.sniff(filepath)[0] == ArchiveFileManager.RAR
+
+
+    @staticmethod
+    def isZipArchive(filepath):
+        """
+        Return True if is .zip archive, otherwise False
+        :return: bool
+        """
+        return ArchiveFileManager.sniff(filepath)[0] == ArchiveFileManager.ZIP
+
+
+    @staticmethod
+    def isTarArchive(filepath):
+        """
+        Return True if is .tar archive (plain, gz, bz2, xz or zst compressed), otherwise False
+        :return: bool
+        """
+        return ArchiveFileManager.sniff(filepath)[0] == ArchiveFileManager.TAR
+
+
+    @staticmethod
+    def tarCompression(filepath):
+        """
+        Detect tar archive and its compression by magic bytes and the first header block
+
+        :param filepath: path to archive file
+
+        :return: "", "gz", "bz2", "xz", "zst" or None if file is not tar archive
+        """
+
+        return ArchiveFileManager.sniff(filepath)[1]
+
+
+    @staticmethod
+    def rarExtractCommand(filepath, listFile, directory):
+        """
+        Command extracting all members listed in "listFile" from RAR archive in one
+        tool invocation, member paths are kept. unrar is preferred, bsdtar (libarchive)
+        and 7z are used where unrar is not installed (i.e. Linux without non-free unrar).
+
+        :param filepath: path to RAR archive
+        :param listFile: path to text file with member names, one per line
+        :param directory: destination directory
+
+        :return: list of command arguments or None if no tool is available
+        """
+
+        unrar = shutil.which(rarfile.UNRAR_TOOL)
+        if unrar:
+            return [unrar, "x", "-y", "-idq", "-p-", "-o+", filepath, "@" + listFile, directory + os.sep]
+
+        bsdtar = shutil.which("bsdtar")
+        if bsdtar:
+            return [bsdtar, "-x", "-f", filepath, "-C", directory, "-T", listFile]
+
+        sevenzip = shutil.which("7z") or shutil.which("7za")
+        if sevenzip:
+            return [sevenzip, "x", "-y", "-bd", "-o" + directory, filepath, "@" + listFile]
+
+        return None
+
+
+    @staticmethod
+    def extractRarMembers(filepath, names, directory):
+        """
+        Extract RAR archive members to directory (member paths are kept) with one
+        tool process instead of one process per member
+
+        :param filepath: path to RAR archive
+        :param names: list of member names
+        :param directory: destination directory
+
+        :return: bool False if no extraction tool is available, nothing is extracted then
+        """
+
+        if not names: return True
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        handle, listFile = tempfile.mkstemp(suffix=".lst", dir=directory)
+
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as f:
+                f.write("\n".join(names) + "\n")
+
+            command = ArchiveFileManager.rarExtractCommand(filepath, listFile, directory)
+            if command is None: return False
+
+            result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+            if result.returncode != 0:
+                raise IOError("Can not extract %s: %s" % (filepath, result.stderr.decode("utf-8", "replace").strip()))
+        finally:
+            os.remove(listFile)
+
+        return True
+
+
+    @staticmethod
+    def tarStream(filepath, compression):
+        """
+        Open decompressed stream of tar archive
+
+        :param filepath: path to archive file
+        :param compression: "", "gz", "bz2", "xz" or "zst"
+
+        :return: binary file-like object, seekable except of "zst"
+        """
+
+        if compression == "gz": return gzip.open(filepath, "rb")
+        if compression == "bz2": return bz2.open(filepath, "rb")
+        if compression == "xz": return lzma.open(filepath, "rb")
+
+        if compression == "zst":
+            if zstandard is None:
+                raise tarfile.CompressionError("zstandard module is not installed")
+
+            return zstandard.ZstdDecompressor().stream_reader(open(filepath, "rb"), closefd=True)
+
+        return open(filepath, "rb")
+
+
+    @staticmethod
+    def streamMembers(filepath, names=None, keepOpen=False):
+        """
+        Iterate archive members in one forward pass in archive order. Iteration stops
+        as soon as all requested members are found. Stream of member is valid until
+        the next iteration, unless "keepOpen" is set (then iterate only once and close
+        returned stream).
+
+        :param filepath: path to archive file
+        :param names: optional collection of member names to read, all files if None
+        :param keepOpen: < bool > internal, see above
+
+        :return: generator of (name, binary file-like object)
+        """
+
+        remaining = set(names) if names is not None else None
+
+        compression = ArchiveFileManager.tarCompression(filepath)
+
+        if compression is None:
+            manager = ArchiveFileManager()
+            manager.archiveFile = filepath
+
+            if not manager.open():
+                raise IOError(filepath + " is not archive")
+
+            try:
+                for info in manager._archive.infolist():
+                    if info.is_dir(): continue
+                    if remaining is not None and info.filename not in remaining: continue
+
+                    with manager.openMember(info.filename) as stream:
+                        yield info.filename, stream
+
+                    if remaining is not None:
+                        remaining.discard(info.filename)
+                        if not remaining: break
+            finally:
+                manager.close()
+            return
+
+        source = ArchiveFileManager.tarStream(filepath, compression)
+        tar = tarfile.open(fileobj=source, mode="r|")
+
+        try:
+            for member in tar:
+                if not member.isfile(): continue
+
+                name = tarMemberName(member.name)
+                if remaining is not None and name not in remaining: continue
+
+                stream = tar.extractfile(member)
+
+                if keepOpen:
+                    source, tar, stream = None, None, _TarMemberStream(stream, tar, source)
+                    yield name, stream
+                    return
+
+                yield name, stream
+
+                if remaining is not None:
+                    remaining.discard(name)
+                    if not remaining: break
+        finally:
+            if tar is not None:
+                tar.close()
+                source.close()
+
+
+
+    @staticmethod
+    def _copyStoredZipMember(archive, info, target):
+        """
+        Copy uncompressed (stored) zip member straight from archive file to target
+        with copy_file_range / sendfile, data does not pass through python buffers.
+        CRC is not verified on this path.
+
+        :return: bool False if kernel copy is not available, nothing is written then
+        """
+
+        copy = getattr(os, "copy_file_range", None) or getattr(os, "sendfile", None)
+
+        if copy is None or not isinstance(archive.filename, str):
+            return False
+
+        if not os.path.isfile(archive.filename):
+            return False
+
+        with open(archive.filename, "rb") as source:
+            source.seek(info.header_offset)
+            header = source.read(30)
+
+            if len(header) != 30 or header[:4] != b"PK\x03\x04":
+                return False
+
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+            offset = info.header_offset + 30 + name_length + extra_length
+            remaining = info.file_size
+
+            with open(target, "wb") as destination:
+                while remaining > 0:
+                    if copy is os.sendfile:
+                        copied = os.sendfile(destination.fileno(), source.fileno(), offset, remaining)
+                    else:
+                        copied = os.copy_file_range(source.fileno(), destination.fileno(), remaining, offset)
+
+                    if copied <= 0:
+                        raise IOError("Unexpected end of archive member " + info.filename)
+
+                    offset += copied
+                    remaining -= copied
+
+        return True
+
+
+    @staticmethod
+    def copyMember(archive, name, target, bufferSize=EXTRACT_BUFFER_SIZE):
+        """
+        Extract archive member directly to target path (no extract + rename).
+        Decompressed stream is copied with large buffer, stored zip members are
+        copied by kernel where possible. Missing target directories are created.
+
+        :param archive: opened zipfile.ZipFile / rarfile.RarFile object
+        :param name: name of member to extract
+        :param target: destination file path
+        :param bufferSize: < int > copy buffer size
+
+        :return: target
+        """
+
+        directory = os.path.dirname(target)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        if isinstance(archive, zipfile.ZipFile):
+            info = archive.getinfo(name)
+            stored = info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1
+
+            try:
+                if stored and ArchiveFileManager._copyStoredZipMember(archive, info, target):
+                    return target
+            except OSError:
+                pass   # i.e. copy_file_range across file systems, fall back to stream copy
+
+        with archive.open(name) as source:
+            with open(target, "wb") as destination:
+                shutil.copyfileobj(source, destination, bufferSize)
+
+        return target
+
+
+
+    def __init__(self, pool=None):
+        super(ArchiveFileManager, self).__init__()
+        """
+        Provide archive file management. 
+        Supported types [".rar", ".zip"]
+
+        :param pool: optional < ArchiveHandlePool >, archives are then acquired from
+                     the pool on open() and released on close() instead of being
+                     parsed again every time
+        """
+
+        self._archiveFile = ""
+        self._archive = None
+        self._isOpened = False
+        self._isBinded = False
+        self._pool = pool
+        self._acquired = ""
+
+
+
+    @property
+    def archiveFile(self):
+        return self._archiveFile
+
+
+    @property
+    def isOpened(self):
+        return self._isOpened
+
+
+    @property
+    def isBinded(self):
+        return self._isBinded
+
+
+    @property
+    def pool(self):
+        return self._pool
+
+
+    @archiveFile.setter
+    def archiveFile(self, archiveFile):
+
+        if not isinstance(archiveFile, str):
+            raise TypeError("Expected string")
+
+        self._archiveFile = archiveFile
+        self._isBinded = True
+
+
+
+
+    def open(self):
+        """
+        Open archive file
+
+        :return: bool True if opened
+        """
+        if self._pool is not None:
+            self.close()
+
+            self._archive = self._pool.acquire(self._archiveFile)
+            if self._archive is None: return False
+
+            self._acquired = self._archiveFile
+            self._isOpened = True
+            return True
+
+        archiveType, compression = ArchiveFileManager.sniff(self._archiveFile)
+
+        if archiveType == ArchiveFileManager.ZIP:
+            self._archive = zipfile.ZipFile(self._archiveFile, "r")
+            self._isOpened = True
+            return True
+
+        if archiveType == ArchiveFileManager.RAR:
+            self._archive = rarfile.RarFile(self._archiveFile, "r")
+            self._isOpened = True
+            return True
+
+        if archiveType == ArchiveFileManager.TAR:
+            self._archive = TarArchive(self._archiveFile, compression)
+            self._isOpened = True
+            return True
+
+        return False
+
+
+    def close(self):
+        """
+        Close opened archive file
+        """
+        if self._acquired:
+            self._pool.release(self._acquired)
+            self._acquired = ""
+            self._archive = None
+            self._isOpened = False
+            return
+
+        if self._archive != None:
+            self._isOpened = False
+            self._archive.close()
+
+
+    def clear(self):
+        self.close()
+        self._archive = None
+        self._archiveFile = ""
+        self._isBinded = False
+
+
+    def content(self, extensionFilter=[]):
+        """
+        Return content of archive
+
+        :param extensionFilter: list of supported file extensions (i.e. ["jpg", "fbx", ""].
+                        if filter is empty, all file extensions are supported
+
+        :return: list<str>
+        """
+
+        if self._archive == None:
+            raise StandardError("Archive was not open")
+
+        names = self._archive.namelist()
+
+
+        content = []
+        if extensionFilter:
+            for name in names:
+                extension = os.path.splitext(name)[-1]
+                try:
+                    extension = extension[1:]
+                    extension = extension.lower()
+                except:
+                    pass
+                if extension in extensionFilter:
+                    content.append(name)
+        else:
+            for name in names:
+                content.append(name)
+
+        return content
+
+
+    def checksums(self):
+        """
+        CRC of every archive member, read from archive directory without decompression
+
+        :return: dict { member_name: crc }
+        """
+        if self._archive == None:
+            raise StandardError("Archive was not open")
+
+        return dict((info.filename, info.CRC) for info in self._archive.infolist())
+
+
+    def openMember(self, name):
+        """
+        Open archive member for streaming read, nothing is written to disk
+
+        :param name: name of member
+
+        :return: binary file-like object
+        """
+        if self._archive == None:
+            raise StandardError("Archive was not open")
+
+        return self._archive.open(name)
+
+
+    def readMember(self, name):
+        """
+        Read whole archive member into memory
+
+        :param name: name of member
+
+        :return: bytes
+        """
+        if self._archive == None:
+            raise StandardError("Archive was not open")
+
+        return self._archive.read(name)
+
+
+    def extractMemberTo(self, name, target):
+        """
+        Extract archive member directly to target file path
+
+        :param name: name of member to extract
+        :param target: destination file path
+
+        :return: target
+        """
+        if self._archive == None:
+            raise StandardError("Archive was not open")
+
+        return ArchiveFileManager.copyMember(self._archive, name, target)
+
+
+    def extractAll(self, directory):
+        """
+        Extract all archive content in "directory"
+
+        :param directory: destination path to extract
+        """
+        if self._archive == None:
+            raise StandardError("Archive was not open")
+
+        self._archive.extractall(directory)
+
+
+    def extractMember(self, directory, name):
+        """
+        Extract archive member in "directory"
+
+        :param directory: destination path to extract
+        :param name: name of member to extract
+
+        """
+        if self._archive == None:
+            raise StandardError("Archive was not open")
+
+        self._archive.extract(name, directory)
+
+
+    def extractMembers(self, directory, names):
+        """
+        Extract any archive members in "directory"
+
+        :param directory: destination path to extract
+        :param names: list of member names to extract
+
+        """
+        if self._archive == None:
+            raise StandardError("Archive was not open")
+
+        self._archive.extractall(directory, names)
+
+
+    def extract(self, directory, namemap):
+        """
+        Extract files from archive and rename them
+
+        :param directory: destination directory path
+
+        :param namemap: map for extractable name map { archive_member_name: new_name }.
+                        new name can be with no extension, if new name is empty, member
+                        is extracted with its archive name. Member names and new names
+                        leading out of directory raise IOError.
+
+        """
+
+        if self._archive == None:
+            raise StandardError("Archive was not open")
+
+        # all targets are checked before anything is written
+
+        targets = dict((name, self._targetPath(directory, name, namemap[name])) for name in namemap)
+
+        # compressed RAR members are decompressed by external tool, one process for all of them
+
+        if isinstance(self._archive, rarfile.RarFile) and len(namemap) > 1:
+            compressed = [name for name in namemap if self._archive.getinfo(name).compress_type != rarfile.RAR_M0]
+
+            if compressed and self._extractRar(directory, namemap): return
+
+        for name in namemap:
+            ArchiveFileManager.copyMember(self._archive, name, targets[name])
+
+
+    @staticmethod
+    def _targetPath(directory, name, new_name):
+        if new_name == "" or new_name == name:
+            return memberPath(directory, name)
+
+        return memberPath(directory, new_name + os.path.splitext(name)[-1])
+
+
+    def _extractRar(self, directory, namemap):
+        """
+        Extract RAR members with one tool process to staging folder inside
+        destination directory, then move them to their targets (same file system)
+
+        :return: bool False if no extraction tool is available
+        """
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        staging = tempfile.mkdtemp(prefix=".extract_", dir=directory)
+
+        try:
+            if not ArchiveFileManager.extractRarMembers(self._archiveFile, list(namemap), staging):
+                return False
+
+            for name in namemap:
+                target = self._targetPath(directory, name, namemap[name])
+
+                target_directory = os.path.dirname(target)
+                if target_directory and not os.path.isdir(target_directory):
+                    os.makedirs(target_directory)
+
+                os.replace(os.path.join(staging, *name.split("/")), target)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        return True
+
+
+    def extractStream(self, directory, namemap):
+        """
+        Same as extract(), but members are read in one forward pass through archive
+        (archive does not need to be opened). Prefer it for compressed tar archives,
+        which have no random access.
+
+        :param directory: destination directory path
+        :param namemap: see extract()
+
+        :return: list of extracted file paths
+        """
+
+        # all targets are checked before archive is read
+
+        targets = dict((name, self._targetPath(directory, name, namemap[name])) for name in namemap)
+        extracted = []
+
+        for name, stream in ArchiveFileManager.streamMembers(self._archiveFile, namemap):
+            target = targets[name]
+
+            target_directory = os.path.dirname(target)
+            if target_directory and not os.path.isdir(target_directory):
+                os.makedirs(target_directory)
+
+            with open(target, "wb") as destination:
+                shutil.copyfileobj(stream, destination, EXTRACT_BUFFER_SIZE)
+
+            extracted.append(target)
+
+        return extracted
+
+
+
+
+if __name__ == '__main__':
+
+    # benchmark: threads reading all members of one archive, reopened for every
+    # member against shared pool handles
+
+    from concurrent.futures import ThreadPoolExecutor
+    import tempfile
+    import time
+
+    path = os.path.join(tempfile.mkdtemp(), "3dplant.zip")
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for index in range(2000):
+            archive.writestr("Var%d/Plant_LOD%d_%d.fbx" % (index % 10, index % 5, index), os.urandom(1024) * 64)
+
+    names = zipfile.ZipFile(path).namelist()
+
+    def reopened(name):
+        manager = ArchiveFileManager()
+        manager.archiveFile = path
+        manager.open()
+        data = manager.readMember(name)
+        manager.close()
+        return len(data)
+
+    pool = ArchiveHandlePool()
+
+    def pooled(name):
+        manager = ArchiveFileManager(pool)
+        manager.archiveFile = path
+        manager.open()
+        data = manager.readMember(name)
+        manager.close()
+        return len(data)
+
+    for function in (reopened, pooled):
+        start = time.time()
+        with ThreadPoolExecutor(8) as executor:
+            size = sum(executor.map(function, names))
+        print("%-8s %.2f s, %d bytes" % (function.__name__, time.time() - start, size))
+
+    assert len(pool) == 1
+
+    # RAR: one tool process per compressed member against one batched process,
+    # RAR archive can not be written here, pass one as argument
+
+    import sys
+
+    if len(sys.argv) > 1:
+        manager = ArchiveFileManager()
+        manager.archiveFile = sys.argv[1]
+        manager.open()
+        names = [name for name in manager.content() if not manager._archive.getinfo(name).is_dir()]
+        directory = tempfile.mkdtemp()
+
+        start = time.time()
+        for name in names:
+            ArchiveFileManager.copyMember(manager._archive, name, os.path.join(directory, "single", name))
+        print("rar per member %.2f s, %d members" % (time.time() - start, len(names)))
+
+        start = time.time()
+        manager.extract(os.path.join(directory, "batched"), dict((name, "") for name in names))
+        print("rar batched    %.2f s, %d members" % (time.time() - start, len(names)))
+
+        manager.close()
+        shutil.rmtree(directory)
+
+    # type checks as done by QuixelBase.assetArchive (isArchive + open), probing
+    # zip / rar / tar one after another against one cached sniff
+
+    start = time.time()
+    for _ in range(2000):
+        zipfile.is_zipfile(path) or rarfile.is_rarfile(path) or tarfile.is_tarfile(path)
+        zipfile.is_zipfile(path) or rarfile.is_rarfile(path) or tarfile.is_tarfile(path)
+    print("probing  %.2f s" % (time.time() - start))
+
+    start = time.time()
+    for _ in range(2000):
+        ArchiveFileManager.isArchive(path)
+        ArchiveFileManager.archiveType(path)
+    print("sniffing %.2f s" % (time.time() - start))
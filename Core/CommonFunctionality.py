@@ -1,31 +1,174 @@
-import json
-from datetime import datetime
-
-
-
-
-class CommonFunctions(object):
-
-    def __init__(self):
-        """
-        This class provide common functions.
-
-        """
-        super(CommonFunctions, self).__init__()
-
-
-    def uniqueID(self):
-        return datetime.now().strftime('%Y%m%d%H%M%S%f')
-
-
-    def saveToJSON(self, obj, path):
-        f = open(path, "w")
-        json.dump(obj, f, indent=4)
-        f.close()
-
-
-    def loadFromJSON(self, path):
-        f = open(path, "r")
-        data = json.load(f)
-        f.close()
-        return data
+from __future__ import print_function
+
+from Core.Serialization import Serializer, SerializationFormats
+
+import threading
+import weakref
+import time
+import os
+
+
+
+class UniqueIDGenerator(object):
+
+    def __init__(self, worker=None):
+        """
+        Monotonic unique ID source, safe across threads and processes of one host.
+
+        ID is 30 digits: UTC timestamp with microseconds (%Y%m%d%H%M%S%f, same prefix
+        as former timestamp IDs), 7 digits of worker (process id by default) and
+        3 digits of sequence for IDs minted in the same microsecond. If the clock
+        goes backwards or the sequence overflows, the timestamp is advanced
+        virtually, so IDs of one worker always increase.
+
+        Lock is recreated in child process after fork, so fork while other thread
+        holds it does not deadlock the child.
+
+        :param worker: < int > worker number, process id if None
+        """
+        super(UniqueIDGenerator, self).__init__()
+
+        self._lock = threading.Lock()
+        self._fixedWorker = worker
+        self._pid = None
+        self._worker = 0
+        self._last = 0
+        self._sequence = 0
+        self._second = -1
+        self._secondPrefix = ""
+
+        _generators.add(self)
+
+
+    def _reset(self):
+        # called on first use and after fork: child gets own worker component
+
+        self._pid = os.getpid()
+        self._worker = self._fixedWorker if self._fixedWorker is not None else self._pid
+        self._worker %= 10000000
+
+
+    def _afterFork(self):
+        self._lock = threading.Lock()
+        self._pid = None
+
+
+    def next(self):
+        """
+        Mint new ID
+
+        :return: < str >
+        """
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+
+            now = time.time_ns() // 1000
+
+            if now > self._last:
+                self._sequence = 0
+            else:
+                now = self._last
+                self._sequence += 1
+                if self._sequence > 999:
+                    now += 1
+                    self._sequence = 0
+
+            self._last = now
+            sequence = self._sequence
+
+            second, micro = divmod(now, 1000000)
+            if second != self._second:
+                self._second = second
+                self._secondPrefix = time.strftime("%Y%m%d%H%M%S", time.gmtime(second))
+            prefix = self._secondPrefix
+
+        return "%s%06d%07d%03d" % (prefix, micro, self._worker, sequence)
+
+
+
+# generators of process, their locks are recreated in forked child
+
+_generators = weakref.WeakSet()
+
+
+def _afterFork():
+    for generator in list(_generators):
+        generator._afterFork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_afterFork)
+
+
+_generator = UniqueIDGenerator()
+
+
+def uniqueID():
+    """
+    Mint ID from process wide UniqueIDGenerator
+    """
+    return _generator.next()
+
+
+
+class CommonFunctions(object):
+
+    def __init__(self):
+        """
+        This class provide common functions.
+
+        """
+        super(CommonFunctions, self).__init__()
+
+
+    def uniqueID(self):
+        return uniqueID()
+
+
+    def saveToJSON(self, obj, path, compact=False):
+        """
+        :param compact: < bool > without indentation, for files read only by tools
+        """
+        Serializer.save(obj, path, SerializationFormats.JSON, compact)
+
+
+    def loadFromJSON(self, path):
+        return Serializer.load(path, SerializationFormats.JSON)
+
+
+    def loadFromJSONData(self, data):
+        """
+        Load json from in-memory data (i.e. bytes of archive member)
+
+        :param data: < bytes > or < str >
+        """
+        return Serializer.loadsJSON(data)
+
+
+
+
+if __name__ == '__main__':
+
+    # stress test: mint IDs from a process pool, every process runs several threads
+
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    def mintThreaded(count, threads=4):
+        with ThreadPoolExecutor(threads) as executor:
+            chunks = executor.map(lambda n: [uniqueID() for _ in range(n)], [count // threads] * threads)
+            return [i for chunk in chunks for i in chunk]
+
+    processes = os.cpu_count() or 4
+    perProcess = 250000
+
+    start = time.time()
+    with ProcessPoolExecutor(processes) as executor:
+        ids = [i for chunk in executor.map(mintThreaded, [perProcess] * processes * 2) for i in chunk]
+    elapsed = time.time() - start
+
+    print("%d ids from %d tasks in %.2fs (%.1fM ids/min), unique: %d" % (
+        len(ids), processes * 2, elapsed, len(ids) / elapsed * 60 / 1e6, len(set(ids))))
+
+    assert len(set(ids)) == len(ids), "collision"
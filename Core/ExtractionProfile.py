@@ -0,0 +1,181 @@
+from Core.NameConvention import NamesConventionTextures as NCTextures
+
+import hashlib
+import json
+
+
+
+class ExtractionProfile(object):
+
+    def __init__(self, textureTypes=None, textureLODs=None, variations=None, maxResolution=0,
+                 formats=None, geometry=True, geometryLODs=None, preview=True):
+        """
+        Declarative description of archive members to extract. Selection works on
+        ArchiveManifest members, so members which are not selected are never read.
+        Filters set to None accept everything, names are compared case insensitive.
+
+        :param textureTypes: < list(str) > texture types to extract (i.e. ["albedo", "normal"])
+        :param textureLODs: < list(str) > texture LODs, "" for textures without LOD (i.e. ["", "LOD0"])
+        :param variations: < list(str) > variations, "" for members without variation
+        :param maxResolution: < int > if set, only one texture of each type / LOD / variation
+                              is extracted: the highest resolution not greater than
+                              maxResolution, or the lowest one if all are greater
+        :param formats: < list(str) > accepted texture extensions in order of preference
+                        (i.e. ["jpg", "png"]), preference breaks ties of equal resolution
+        :param geometry: < bool > extract geometry
+        :param geometryLODs: < list(str) > geometry LODs
+        :param preview: < bool > extract preview image
+        """
+        super(ExtractionProfile, self).__init__()
+
+        self.textureTypes = textureTypes
+        self.textureLODs = textureLODs
+        self.variations = variations
+        self.maxResolution = maxResolution
+        self.formats = formats
+        self.geometry = geometry
+        self.geometryLODs = geometryLODs
+        self.preview = preview
+
+
+    @staticmethod
+    def previewLibrary(maxResolution=1024):
+        """
+        Profile of lightweight preview library: base PBR maps of LOD0 at limited
+        resolution, jpg/png only, lowest geometry LOD
+        """
+        return ExtractionProfile(
+            textureTypes=[
+                NCTextures.Albedo,
+                NCTextures.Normal,
+                NCTextures.Roughness,
+                NCTextures.Opacity
+            ],
+            textureLODs=["", "LOD0"],
+            variations=["", "VAR1"],
+            maxResolution=maxResolution,
+            formats=["jpg", "jpeg", "png"],
+            geometryLODs=["LOD0"]
+        )
+
+
+    def fingerprint(self):
+        """
+        :return: < str > digest of all filters, profiles selecting the same members
+                 have the same fingerprint
+        """
+        filters = dict((key, self._lower(value)) for key, value in vars(self).items())
+
+        return hashlib.sha1(json.dumps(filters, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+    @staticmethod
+    def _lower(values):
+        if not isinstance(values, list): return values
+        return [value.lower() for value in values]
+
+
+    @staticmethod
+    def _accepts(values, value):
+        return values is None or (value or "").lower() in ExtractionProfile._lower(values)
+
+
+    def _format(self, member):
+        return member.extension[1:].lower()
+
+
+    def acceptsTexture(self, member):
+        """
+        Check member against texture filters (resolution is not checked)
+
+        :param member: < ArchiveMember >
+        :return: bool
+        """
+
+        if not member.textureType: return False
+
+        if not self._accepts(self.textureTypes, member.textureType): return False
+        if not self._accepts(self.textureLODs, member.lod): return False
+        if not self._accepts(self.variations, member.variation): return False
+
+        if not self._accepts(self.formats, self._format(member)):
+            return False
+
+        return True
+
+
+    def selectTextures(self, members):
+        """
+        Select textures to extract
+
+        :param members: list<ArchiveMember>
+        :return: list<ArchiveMember> in archive order
+        """
+
+        members = [member for member in members if self.acceptsTexture(member)]
+
+        if not self.maxResolution:
+            return members
+
+        groups = {}
+
+        for member in members:
+            key = (member.textureType, member.lod, member.variation, member.isBillboard)
+            groups.setdefault(key, []).append(member)
+
+        selected = set()
+
+        for group in groups.values():
+            selected.add(id(min(group, key=self._rank)))
+
+        return [member for member in members if id(member) in selected]
+
+
+    def _rank(self, member):
+        # lower is better: fitting resolutions first (highest first), then oversized (lowest first)
+
+        resolution = member.resolution or self.maxResolution
+
+        if resolution <= self.maxResolution:
+            rank = (0, -resolution)
+        else:
+            rank = (1, resolution)
+
+        if self.formats is not None:
+            rank += (self._lower(self.formats).index(self._format(member)),)
+
+        return rank
+
+
+    def selectGeometry(self, members):
+        """
+        Select geometry to extract
+
+        :param members: list<ArchiveMember>
+        :return: list<ArchiveMember>
+        """
+
+        if not self.geometry: return []
+
+        return [member for member in members if self._accepts(self.geometryLODs, member.lod)]
+
+
+
+if __name__ == '__main__':
+
+    from Core.ArchiveManifest import ArchiveMember
+
+    profile = ExtractionProfile.previewLibrary(2048)
+
+    members = []
+    for name, texture_type, resolution in [
+        ("a_8K_Albedo.jpg", "albedo", 8192), ("a_2K_Albedo.jpg", "albedo", 2048),
+        ("a_2K_Albedo.exr", "albedo", 2048), ("a_4K_Normal.jpg", "normal", 4096),
+        ("a_4K_Displacement.exr", "displacement", 4096)
+    ]:
+        member = ArchiveMember(name)
+        member.textureType = texture_type
+        member.resolution = resolution
+        members.append(member)
+
+    print([member.name for member in profile.selectTextures(members)])
@@ -1,84 +1,198 @@
-
-import fbx
-
-fbx.FbxNodeAttribute
-
-class FBXWrapper(object):
-
-    def __init__(self):
-        super(FBXWrapper, self).__init__()
-
-        self._manager = fbx.FbxManager.Create()
-        self._scene = fbx.FbxScene.Create(self._manager, "")
-        self._importer = fbx.FbxImporter.Create(self._manager, "")
-        self._exporter = fbx.FbxExporter.Create(self._manager, "")
-
-
-    def importFile(self, file_path):
-        self._importer.Initialize(file_path, -1)
-        self._importer.Import(self._scene)
-
-
-    def exportFile(self, file_path):
-        self._exporter.Initialize(file_path, -1)
-        self._exporter.Export(self._scene)
-
-
-    def sceneUnits(self):
-        units = self._scene.GetGlobalSettings().GetSystemUnit()
-
-        if units == fbx.FbxSystemUnit.mm: return "mm"
-        elif units == fbx.FbxSystemUnit.cm: return "cm"
-        elif units == fbx.FbxSystemUnit.dm: return "dm"
-        elif units == fbx.FbxSystemUnit.m: return "m"
-        elif units == fbx.FbxSystemUnit.km: return "km"
-        elif units == fbx.FbxSystemUnit.Inch: return "inch"
-        elif units == fbx.FbxSystemUnit.Foot: return "foot"
-        elif units == fbx.FbxSystemUnit.Mile: return "mile"
-        elif units == fbx.FbxSystemUnit.Yard: return "yard"
-        else: return ""
-
-
-    def sceneBounds(self, precision=3):
-
-        min = fbx.FbxVector4()
-        max = fbx.FbxVector4()
-        center = fbx.FbxVector4()
-
-        self._scene.ComputeBoundingBoxMinMaxCenter(min, max, center)
-
-        x = round(max[0] - min[0], precision)
-        y = round(max[1] - min[1], precision)
-        z = round(max[2] - min[2], precision)
-
-        return x, y, z
-
-
-    def scenePointsCount(self):
-        pass
-
-
-    def LODs(self):
-
-        root = self._scene.GetRootNode()
-
-        for i in range(root.GetChildCount()):
-            node = root.GetChild(i)
-            lod = root.GetChild(i).GetNodeAttribute()
-
-            for j in range(node.GetChildCount()):
-                print node.GetChild(j).GetName()
-
-
-
-
-
-if __name__ == '__main__':
-
-    fbxpath = "C:/users/edward/Desktop/out.fbx"
-
-    w = FBXWrapper()
-
-    w.importFile(fbxpath)
-
-    w.LODs()
+from __future__ import print_function
+
+from Core.StringParser import firstMatch, REGEXP_LOD_NOCASE
+
+try:
+    import fbx
+except ImportError:
+    fbx = None   # Core.FBXBinary.FBXBinaryReader reads binary files without SDK
+
+
+
+class FBXWrapper(object):
+
+    def __init__(self):
+        """
+        FBX SDK scene of one manager. Creating FbxManager is expensive, so one wrapper
+        should be reused for many files: importFile() clears the scene before import.
+        """
+        super(FBXWrapper, self).__init__()
+
+        if fbx is None:
+            raise ImportError("FBX SDK python bindings (fbx) are not installed")
+
+        self._manager = fbx.FbxManager.Create()
+        self._manager.SetIOSettings(fbx.FbxIOSettings.Create(self._manager, fbx.IOSROOT))
+        self._scene = fbx.FbxScene.Create(self._manager, "")
+        self._exporter = fbx.FbxExporter.Create(self._manager, "")
+
+
+    def importFile(self, file_path):
+        """
+        Replace scene content with file content
+
+        :param file_path: path to .fbx file
+        """
+
+        self.clear()
+
+        # importer keeps file open until destroyed
+        importer = fbx.FbxImporter.Create(self._manager, "")
+
+        try:
+            if not importer.Initialize(file_path, -1, self._manager.GetIOSettings()):
+                raise IOError("Can not open %s: %s" % (file_path, importer.GetStatus().GetErrorString()))
+
+            if not importer.Import(self._scene):
+                raise IOError("Can not import %s: %s" % (file_path, importer.GetStatus().GetErrorString()))
+        finally:
+            importer.Destroy()
+
+
+    def exportFile(self, file_path):
+        self._exporter.Initialize(file_path, -1)
+        self._exporter.Export(self._scene)
+
+
+    def clear(self):
+        """
+        Remove all objects of scene, manager and scene are kept
+        """
+        self._scene.Clear()
+
+
+    def destroy(self):
+        self._manager.Destroy()
+        self._manager = None
+        self._scene = None
+        self._exporter = None
+
+
+    def sceneUnits(self):
+        units = self._scene.GetGlobalSettings().GetSystemUnit()
+
+        if units == fbx.FbxSystemUnit.mm: return "mm"
+        elif units == fbx.FbxSystemUnit.cm: return "cm"
+        elif units == fbx.FbxSystemUnit.dm: return "dm"
+        elif units == fbx.FbxSystemUnit.m: return "m"
+        elif units == fbx.FbxSystemUnit.km: return "km"
+        elif units == fbx.FbxSystemUnit.Inch: return "inch"
+        elif units == fbx.FbxSystemUnit.Foot: return "foot"
+        elif units == fbx.FbxSystemUnit.Mile: return "mile"
+        elif units == fbx.FbxSystemUnit.Yard: return "yard"
+        else: return ""
+
+
+    def sceneBoundsMinMax(self, precision=3):
+        """
+        :return: ((min x, min y, min z), (max x, max y, max z))
+        """
+
+        min = fbx.FbxVector4()
+        max = fbx.FbxVector4()
+        center = fbx.FbxVector4()
+
+        self._scene.ComputeBoundingBoxMinMaxCenter(min, max, center)
+
+        return (
+            tuple(round(min[i], precision) for i in range(3)),
+            tuple(round(max[i], precision) for i in range(3))
+        )
+
+
+    def sceneBounds(self, precision=3):
+        min, max = self.sceneBoundsMinMax(precision)
+
+        x = round(max[0] - min[0], precision)
+        y = round(max[1] - min[1], precision)
+        z = round(max[2] - min[2], precision)
+
+        return x, y, z
+
+
+    def _nodes(self, node=None):
+        node = node or self._scene.GetRootNode()
+        nodes = [node]
+
+        for i in range(node.GetChildCount()):
+            nodes.extend(self._nodes(node.GetChild(i)))
+
+        return nodes
+
+
+    def meshNodes(self, node=None):
+        """
+        :return: list of nodes with mesh attribute under node (scene root if None)
+        """
+        return [n for n in self._nodes(node) if n.GetMesh() is not None]
+
+
+    def scenePointsCount(self, node=None):
+        return sum(n.GetMesh().GetControlPointsCount() for n in self.meshNodes(node))
+
+
+    def scenePolygonsCount(self, node=None):
+        return sum(n.GetMesh().GetPolygonCount() for n in self.meshNodes(node))
+
+
+    def LODs(self):
+        """
+        LOD levels of scene. Children of LOD group nodes are levels, otherwise
+        meshes are grouped by LOD in their names (i.e. "Rock_LOD1"). Scene without
+        LODs is one level.
+
+        :return: list of levels from the most detailed, level is list of mesh nodes
+        """
+
+        levels = []
+
+        for node in self._nodes():
+            attribute = node.GetNodeAttribute()
+
+            if attribute is None or attribute.GetAttributeType() != fbx.FbxNodeAttribute.eLODGroup:
+                continue
+
+            for i in range(node.GetChildCount()):
+                if i == len(levels): levels.append([])
+                levels[i].extend(self.meshNodes(node.GetChild(i)))
+
+        if levels:
+            return levels
+
+        named = {}
+
+        for node in self.meshNodes():
+            lod = firstMatch(REGEXP_LOD_NOCASE, node.GetName())
+            named.setdefault(int(lod[3:]) if lod else 0, []).append(node)
+
+        return [named[lod] for lod in sorted(named)]
+
+
+    def LODCounts(self):
+        """
+        :return: list of (points count, polygons count) of LOD levels
+        """
+
+        return [
+            (
+                sum(n.GetMesh().GetControlPointsCount() for n in level),
+                sum(n.GetMesh().GetPolygonCount() for n in level)
+            )
+            for level in self.LODs()
+        ]
+
+
+
+if __name__ == '__main__':
+
+    import sys
+
+    w = FBXWrapper()
+
+    for fbxpath in sys.argv[1:]:
+        w.importFile(fbxpath)
+
+        print(fbxpath, w.sceneUnits(), w.sceneBoundsMinMax())
+
+        for i, (points, polygons) in enumerate(w.LODCounts()):
+            print("    LOD%d %d points %d polygons" % (i, points, polygons))
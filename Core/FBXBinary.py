@@ -0,0 +1,444 @@
+from __future__ import print_function
+
+from Core.StringParser import firstMatch, REGEXP_LOD_NOCASE
+
+import numpy
+import struct
+import zlib
+
+
+
+FBX_MAGIC = b"Kaydara FBX Binary  \x00"
+
+# node record header is 64 bit since FBX 7.5
+FBX_VERSION_64BIT = 7500
+
+_SCALAR_FORMATS = {
+    b"Y": "<h",
+    b"C": "<?",
+    b"I": "<i",
+    b"F": "<f",
+    b"D": "<d",
+    b"L": "<q"
+}
+
+_ARRAY_TYPES = {
+    b"f": numpy.float32,
+    b"d": numpy.float64,
+    b"l": numpy.int64,
+    b"i": numpy.int32,
+    b"b": numpy.bool_
+}
+
+# GlobalSettings UnitScaleFactor is size of unit in centimeters
+_UNIT_SCALES = [
+    (0.1, "mm"),
+    (1.0, "cm"),
+    (10.0, "dm"),
+    (100.0, "m"),
+    (100000.0, "km"),
+    (2.54, "inch"),
+    (30.48, "foot"),
+    (160934.4, "mile"),
+    (91.44, "yard")
+]
+
+
+
+# Lcl properties of Model node
+
+_TRANSFORMS = (b"Lcl Translation", b"Lcl Rotation", b"Lcl Scaling")
+
+
+
+def _localMatrix(transform):
+    # FBX node matrix T * R * S, Euler rotation in degrees applied in X, Y, Z order
+
+    x, y, z = numpy.radians(transform.get(b"Lcl Rotation", (0.0, 0.0, 0.0)))
+
+    rx = numpy.array([[1, 0, 0], [0, numpy.cos(x), -numpy.sin(x)], [0, numpy.sin(x), numpy.cos(x)]])
+    ry = numpy.array([[numpy.cos(y), 0, numpy.sin(y)], [0, 1, 0], [-numpy.sin(y), 0, numpy.cos(y)]])
+    rz = numpy.array([[numpy.cos(z), -numpy.sin(z), 0], [numpy.sin(z), numpy.cos(z), 0], [0, 0, 1]])
+
+    matrix = numpy.identity(4)
+    matrix[:3, :3] = rz.dot(ry).dot(rx) * numpy.array(transform.get(b"Lcl Scaling", (1.0, 1.0, 1.0)))
+    matrix[:3, 3] = transform.get(b"Lcl Translation", (0.0, 0.0, 0.0))
+
+    return matrix
+
+
+
+def isBinaryFBX(file_path):
+    with open(file_path, "rb") as f:
+        return f.read(len(FBX_MAGIC)) == FBX_MAGIC
+
+
+
+class FBXBinaryReader(object):
+
+    def __init__(self):
+        """
+        Reader of FBX binary files, which does not need FBX SDK. Has the same
+        statistics interface as Core.FBX.FBXWrapper (importFile, sceneUnits,
+        sceneBoundsMinMax, sceneBounds, scenePointsCount, scenePolygonsCount,
+        LODCounts, clear).
+
+        File is read as stream of node records: only GlobalSettings, Objects
+        (Geometry and Model nodes) and Connections are visited, every other node
+        is skipped by its end offset. Only "Vertices" and "PolygonVertexIndex"
+        arrays of geometries are decompressed, other arrays (normals, UVs ...)
+        are never read.
+
+        Bounds are computed in scene space: Lcl Translation / Rotation / Scaling of
+        model of geometry and of its parent models are applied to vertices (rotation
+        order XYZ, pivots, pre / post rotation and geometric transforms are not).
+        Vertices are kept until clear() for that, bounds of geometries without
+        transforms are taken as read.
+        """
+        super(FBXBinaryReader, self).__init__()
+
+        self.clear()
+
+
+    def clear(self):
+        self._version = 0
+        self._unitScale = 1.0
+        self._geometries = []       # list of dict { id, name, points, polygons, min, max, vertices }
+        self._models = {}           # { model id: (name, class) }
+        self._transforms = {}       # { model id: { Lcl property name: (x, y, z) } }
+        self._parents = {}          # { object id: parent id }
+        self._children = {}         # { parent id: [object ids] } in connection order
+
+
+    # **************** NODE RECORDS *****************#
+
+    def _nodeHeader(self, f):
+        """
+        :return: (end offset, properties count, name) or None for null record
+        """
+
+        if self._version >= FBX_VERSION_64BIT:
+            end, count, length = struct.unpack("<QQQ", f.read(24))
+        else:
+            end, count, length = struct.unpack("<III", f.read(12))
+
+        name = f.read(ord(f.read(1)))
+
+        if end == 0:
+            return None
+
+        return end, count, name
+
+
+    def _nodes(self, f, end):
+        """
+        Iterate nodes until end offset or null record, file is at properties
+        of yielded node, after it is consumed file is moved to its end
+        """
+
+        while f.tell() < end:
+            header = self._nodeHeader(f)
+            if header is None: return
+
+            nodeEnd, count, name = header
+            yield name, count, nodeEnd
+
+            f.seek(nodeEnd)
+
+
+    @staticmethod
+    def _array(f, dtype):
+        length, encoding, size = struct.unpack("<III", f.read(12))
+        data = f.read(size)
+
+        if encoding == 1:
+            data = zlib.decompress(data)
+
+        return numpy.frombuffer(data, dtype=dtype, count=length)
+
+
+    def _properties(self, f, count):
+        properties = []
+
+        for i in range(count):
+            code = f.read(1)
+
+            if code in _SCALAR_FORMATS:
+                fmt = _SCALAR_FORMATS[code]
+                properties.append(struct.unpack(fmt, f.read(struct.calcsize(fmt)))[0])
+            elif code in _ARRAY_TYPES:
+                properties.append(self._array(f, _ARRAY_TYPES[code]))
+            elif code in (b"S", b"R"):
+                properties.append(f.read(struct.unpack("<I", f.read(4))[0]))
+            else:
+                raise IOError("Unknown FBX property type %r" % code)
+
+        return properties
+
+
+    @staticmethod
+    def _objectName(name):
+        # "Name\x00\x01Class" -> "Name"
+        return name.split(b"\x00\x01")[0].decode("utf-8", "replace")
+
+
+    # **************** SECTIONS *****************#
+
+    def _readGlobalSettings(self, f, end):
+        for name, count, nodeEnd in self._nodes(f, end):
+            if name != b"Properties70": continue
+
+            for pname, pcount, pend in self._nodes(f, nodeEnd):
+                if pname != b"P": continue
+
+                properties = self._properties(f, pcount)
+                if properties and properties[0] == b"UnitScaleFactor":
+                    self._unitScale = float(properties[4])
+
+
+    def _readGeometry(self, f, count, end):
+        properties = self._properties(f, count)
+
+        geometry = {
+            "id": properties[0],
+            "name": self._objectName(properties[1]) if len(properties) > 1 else "",
+            "points": 0,
+            "polygons": 0,
+            "min": None,
+            "max": None,
+            "vertices": None
+        }
+
+        for name, pcount, nodeEnd in self._nodes(f, end):
+            if name == b"Vertices":
+                vertices = self._properties(f, pcount)[0].reshape(-1, 3)
+                geometry["points"] = len(vertices)
+                if len(vertices):
+                    geometry["vertices"] = vertices
+                    geometry["min"] = vertices.min(axis=0)
+                    geometry["max"] = vertices.max(axis=0)
+
+            elif name == b"PolygonVertexIndex":
+                # last index of polygon is stored as (-index - 1)
+                geometry["polygons"] = int(numpy.count_nonzero(self._properties(f, pcount)[0] < 0))
+
+        self._geometries.append(geometry)
+
+
+    def _readObjects(self, f, end):
+        for name, count, nodeEnd in self._nodes(f, end):
+            if name == b"Geometry":
+                self._readGeometry(f, count, nodeEnd)
+
+            elif name == b"Model":
+                properties = self._properties(f, count)
+                self._models[properties[0]] = (
+                    self._objectName(properties[1]),
+                    properties[2].decode("utf-8", "replace") if len(properties) > 2 else ""
+                )
+                self._readTransform(f, nodeEnd, properties[0])
+
+
+    def _readTransform(self, f, end, model):
+        for name, count, nodeEnd in self._nodes(f, end):
+            if name != b"Properties70": continue
+
+            for pname, pcount, pend in self._nodes(f, nodeEnd):
+                if pname != b"P": continue
+
+                properties = self._properties(f, pcount)
+                if properties and properties[0] in _TRANSFORMS:
+                    transform = self._transforms.setdefault(model, {})
+                    transform[properties[0]] = tuple(float(v) for v in properties[4:7])
+
+
+    def _readConnections(self, f, end):
+        for name, count, nodeEnd in self._nodes(f, end):
+            if name != b"C": continue
+
+            properties = self._properties(f, count)
+            if properties[0] != b"OO": continue
+
+            child, parent = properties[1], properties[2]
+            self._parents.setdefault(child, parent)
+            self._children.setdefault(parent, []).append(child)
+
+
+    def importFile(self, file_path):
+        """
+        Read statistics of FBX binary file
+
+        :param file_path: path to .fbx file
+        """
+
+        self.clear()
+
+        with open(file_path, "rb") as f:
+            if f.read(len(FBX_MAGIC)) != FBX_MAGIC:
+                raise IOError("Not FBX binary file: " + file_path)
+
+            f.read(2)
+            self._version = struct.unpack("<I", f.read(4))[0]
+
+            f.seek(0, 2)
+            size = f.tell()
+            f.seek(27)
+
+            sections = {
+                b"GlobalSettings": self._readGlobalSettings,
+                b"Objects": self._readObjects,
+                b"Connections": self._readConnections
+            }
+
+            for name, count, nodeEnd in self._nodes(f, size):
+                if name in sections:
+                    self._properties(f, count)
+                    sections[name](f, nodeEnd)
+
+
+    # **************** STATISTICS *****************#
+
+    def sceneUnits(self):
+        for scale, units in _UNIT_SCALES:
+            if abs(self._unitScale - scale) <= scale * 1e-6:
+                return units
+        return ""
+
+
+    def _worldMatrix(self, model):
+        """
+        :return: matrix of model and its parent models, None if it is identity
+                 (exporters often write default Lcl properties)
+        """
+
+        matrix = numpy.identity(4)
+
+        while model in self._models:
+            if model in self._transforms:
+                matrix = _localMatrix(self._transforms[model]).dot(matrix)
+
+            model = self._parents.get(model)
+
+        return None if numpy.array_equal(matrix, numpy.identity(4)) else matrix
+
+
+    def sceneBoundsMinMax(self, precision=3):
+        """
+        :return: ((min x, min y, min z), (max x, max y, max z)) in scene space
+        """
+
+        minimums = []
+        maximums = []
+
+        for geometry in self._geometries:
+            if geometry["vertices"] is None: continue
+
+            matrix = self._worldMatrix(self._parents.get(geometry["id"]))
+
+            if matrix is None:
+                minimums.append(geometry["min"])
+                maximums.append(geometry["max"])
+            else:
+                vertices = geometry["vertices"].dot(matrix[:3, :3].T) + matrix[:3, 3]
+                minimums.append(vertices.min(axis=0))
+                maximums.append(vertices.max(axis=0))
+
+        if not minimums:
+            return (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
+
+        minimum = numpy.min(minimums, axis=0)
+        maximum = numpy.max(maximums, axis=0)
+
+        return (
+            tuple(round(float(v), precision) for v in minimum),
+            tuple(round(float(v), precision) for v in maximum)
+        )
+
+
+    def sceneBounds(self, precision=3):
+        min, max = self.sceneBoundsMinMax(precision)
+
+        x = round(max[0] - min[0], precision)
+        y = round(max[1] - min[1], precision)
+        z = round(max[2] - min[2], precision)
+
+        return x, y, z
+
+
+    def scenePointsCount(self):
+        return sum(g["points"] for g in self._geometries)
+
+
+    def scenePolygonsCount(self):
+        return sum(g["polygons"] for g in self._geometries)
+
+
+    def _level(self, geometry):
+        # child index under LOD group, else LOD in model or geometry name, else 0
+
+        model = self._parents.get(geometry["id"])
+        node = model
+
+        while node in self._models:
+            parent = self._parents.get(node)
+
+            if parent in self._models and self._models[parent][1] == "LodGroup":
+                levels = [child for child in self._children[parent] if child in self._models]
+                return levels.index(node)
+
+            node = parent
+
+        for name in (self._models.get(model, ("", ""))[0], geometry["name"]):
+            lod = firstMatch(REGEXP_LOD_NOCASE, name)
+            if lod: return int(lod[3:])
+
+        return 0
+
+
+    def LODCounts(self):
+        """
+        :return: list of (points count, polygons count) of LOD levels
+        """
+
+        levels = {}
+
+        for geometry in self._geometries:
+            counts = levels.setdefault(self._level(geometry), [0, 0])
+            counts[0] += geometry["points"]
+            counts[1] += geometry["polygons"]
+
+        return [tuple(levels[level]) for level in sorted(levels)]
+
+
+
+if __name__ == '__main__':
+
+    # benchmark: statistics of synthetic FBX 7.4 binary LOD files (zlib compressed arrays),
+    # run from repository root: python -m Core.FBXBinary
+
+    from tests.fbx_files import mesh, triangles, writeFBX
+
+    import tempfile
+    import time
+    import os
+
+    directory = tempfile.mkdtemp()
+    files = []
+
+    for i in range(200):
+        vertices, polygons = triangles(40000 >> (i % 4), seed=i)
+        path = os.path.join(directory, "Rock_%d_LOD%d.fbx" % (i, i % 4))
+        files.append(writeFBX(path, [mesh("Rock_LOD%d" % (i % 4), vertices, polygons)]))
+
+    reader = FBXBinaryReader()
+
+    start = time.time()
+    for path in files:
+        reader.importFile(path)
+        reader.LODCounts()
+        reader.sceneBoundsMinMax()
+        reader.sceneUnits()
+    elapsed = time.time() - start
+
+    print("%d files %.2f s, %d files per hour" % (len(files), elapsed, len(files) / elapsed * 3600))
+    print(reader.sceneUnits(), reader.sceneBoundsMinMax(), reader.LODCounts())
@@ -0,0 +1,312 @@
+from __future__ import print_function
+
+from Core.InfoFileManagement import InfoRecord, InfoRecordGroup
+from Core.Serialization import Serializer
+from Core.NameConvention import NamesConventionInfo as NCInfo
+from Core.StringParser import firstMatch, REGEXP_LOD_NOCASE
+from Core.FBXBinary import FBXBinaryReader
+from Core.FBX import FBXWrapper
+from Core import FBX
+
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import traceback
+import os
+
+
+
+# geometry reader of process, created by first analyzed file and reused for all next
+
+_reader = None
+
+
+def geometryReader():
+    """
+    :return: reader of this process, FBXWrapper if FBX SDK is installed,
+             otherwise FBXBinaryReader (binary FBX files only)
+    """
+
+    global _reader
+
+    if _reader is None:
+        _reader = FBXWrapper() if FBX.fbx is not None else FBXBinaryReader()
+
+    return _reader
+
+
+def _analyzeFile(path):
+    """
+    Worker: import geometry file to scene of process reader and measure it
+
+    :param path: path to geometry file
+
+    :return: (path, result, error) result is dict { "units": str, "min": [x, y, z], "max": [x, y, z],
+             "lods": [[points, polygons], ...] } or None on error, error is empty string on success
+    """
+
+    try:
+        reader = geometryReader()
+    except Exception:
+        return path, None, traceback.format_exc()
+
+    try:
+        reader.importFile(path)
+        minimum, maximum = reader.sceneBoundsMinMax()
+
+        return path, {
+            "units": reader.sceneUnits(),
+            "min": list(minimum),
+            "max": list(maximum),
+            "lods": [list(counts) for counts in reader.LODCounts()]
+        }, ""
+    except Exception:
+        return path, None, traceback.format_exc()
+    finally:
+        reader.clear()
+
+
+
+class GeometryAnalyzer(object):
+
+    def __init__(self):
+        """
+        Measure geometry of extracted assets: point and polygon count of every LOD,
+        bounds and units. Results are written to "Meshes" and "Bound" info groups
+        of asset info file (flat info gets "point_count", "polygon_count", "lod_count",
+        "units", "bound_min" and "bound_max" keys) and to catalogue if it is set.
+
+        Files are processed in process pool. Every worker creates one FBX manager
+        and clears its scene between files, number of queued files is bounded.
+        Without FBX SDK binary files are read by Core.FBXBinary.FBXBinaryReader.
+
+        LOD of file is taken from file name (Quixel ships one file per LOD), file
+        without LOD in name gives its LOD levels from scene hierarchy. Counts of files
+        of the same LOD (i.e. plant variations) are summed, bounds are union of all files.
+        """
+        super(GeometryAnalyzer, self).__init__()
+
+        self.extensions = ["fbx"]
+
+        # Core.LibraryCatalogue.LibraryCatalogue, if set geometry is recorded in it too
+        self.catalogue = None
+
+        self._workers = os.cpu_count() or 1
+
+
+    @property
+    def workers(self):
+        return self._workers
+
+    @workers.setter
+    def workers(self, workers):
+        if not isinstance(workers, int):
+            raise TypeError("Expected < int >")
+
+        self._workers = workers if workers > 0 else (os.cpu_count() or 1)
+
+
+    def files(self, folder):
+        """
+        :param folder: asset folder
+        :return: sorted list of geometry files in folder and its subfolders
+        """
+
+        files = []
+
+        for root, dirs, names in os.walk(folder):
+            for name in names:
+                if os.path.splitext(name)[1][1:].lower() in self.extensions:
+                    files.append(os.path.join(root, name))
+
+        return sorted(files)
+
+
+    @staticmethod
+    def geometryFromResults(results):
+        """
+        Combine file results of one asset
+
+        :param results: dict { path: result of file }
+        :return: dict { "units": str, "points": [per LOD], "polygons": [per LOD], "min": [x, y, z],
+                 "max": [x, y, z] } or None if there is no result
+        """
+
+        levels = {}
+        units = ""
+        minimum = None
+        maximum = None
+
+        for path in sorted(results):
+            result = results[path]
+            lod = firstMatch(REGEXP_LOD_NOCASE, os.path.basename(path))
+
+            if lod and len(result["lods"]) == 1:
+                counts = {int(lod[3:]): result["lods"][0]}
+            else:
+                counts = dict(enumerate(result["lods"]))
+
+            for level, (points, polygons) in counts.items():
+                total = levels.setdefault(level, [0, 0])
+                total[0] += points
+                total[1] += polygons
+
+            units = units or result["units"]
+            minimum = result["min"] if minimum is None else [min(a, b) for a, b in zip(minimum, result["min"])]
+            maximum = result["max"] if maximum is None else [max(a, b) for a, b in zip(maximum, result["max"])]
+
+        if not levels:
+            return None
+
+        return {
+            "units": units,
+            "points": [levels[level][0] for level in sorted(levels)],
+            "polygons": [levels[level][1] for level in sorted(levels)],
+            "min": minimum,
+            "max": maximum
+        }
+
+
+    @staticmethod
+    def infoGroups(geometry):
+        """
+        :param geometry: dict of geometryFromResults()
+        :return: (mesh group, bound group) < InfoRecordGroup >
+        """
+
+        mesh = InfoRecordGroup()
+        mesh.name = NCInfo.GroupMesh
+
+        record = InfoRecord(NCInfo.MeshPointCount)
+        record.setValueIntList(geometry["points"])
+        mesh.addRecord(record)
+
+        record = InfoRecord(NCInfo.MeshPolyCount)
+        record.setValueIntList(geometry["polygons"])
+        mesh.addRecord(record)
+
+        record = InfoRecord(NCInfo.MeshLODs)
+        record.setValueInt(len(geometry["points"]))
+        mesh.addRecord(record)
+
+        record = InfoRecord(NCInfo.MeshUnits)
+        record.setValueString(geometry["units"])
+        mesh.addRecord(record)
+
+        bound = InfoRecordGroup()
+        bound.name = NCInfo.GroupBound
+
+        record = InfoRecord(NCInfo.BoundMin)
+        record.setValueFloatList([float(v) for v in geometry["min"]])
+        bound.addRecord(record)
+
+        record = InfoRecord(NCInfo.BoundMax)
+        record.setValueFloatList([float(v) for v in geometry["max"]])
+        bound.addRecord(record)
+
+        return mesh, bound
+
+
+    @staticmethod
+    def _infoWithGeometry(info, geometry):
+        if isinstance(info, dict):
+            info["point_count"] = geometry["points"]
+            info["polygon_count"] = geometry["polygons"]
+            info["lod_count"] = len(geometry["points"])
+            info["units"] = geometry["units"]
+            info["bound_min"] = geometry["min"]
+            info["bound_max"] = geometry["max"]
+            return info
+
+        groups = GeometryAnalyzer.infoGroups(geometry)
+        names = [group.name for group in groups]
+
+        info = [group for group in info if group.get("group") not in names]
+        info.extend(group.toDict() for group in groups)
+
+        return info
+
+
+    def recordGeometry(self, folder, geometry):
+        """
+        Write geometry into info file of asset and to catalogue if it is set
+        """
+
+        path = Serializer.infoFile(folder)
+
+        if path:
+            Serializer.save(self._infoWithGeometry(Serializer.load(path), geometry), path)
+
+        if self.catalogue is not None:
+            assetID = self.catalogue.assetIDFromFolder(folder)
+
+            if assetID:
+                asset = self.catalogue.asset(assetID)
+                self.catalogue.addAsset(assetID, folder, self._infoWithGeometry(asset.info, geometry))
+
+
+    def process(self, folders, callback=None, emptyCallback=None):
+        """
+        Analyze geometry of asset folders and record it
+
+        :param folders: list of asset folders
+        :param callback: optional callable(path, error) called for every processed file
+        :param emptyCallback: optional callable(folder) called for every folder without
+                              geometry files (i.e. surface assets), nothing is recorded for it
+
+        :return: list of (path, error) for failed files
+        """
+
+        failed = []
+        remaining = {}
+        results = {}
+        queue = []
+
+        for folder in folders:
+            files = self.files(folder)
+
+            if not files:
+                if emptyCallback: emptyCallback(folder)
+                continue
+
+            remaining[folder] = len(files)
+            results[folder] = {}
+            queue.extend((folder, path) for path in files)
+
+        def finish(folder, path, result, error):
+            if error: failed.append((path, error))
+            else: results[folder][path] = result
+            if callback: callback(path, error)
+
+            remaining[folder] -= 1
+            if not remaining[folder]:
+                geometry = self.geometryFromResults(results.pop(folder))
+                if geometry: self.recordGeometry(folder, geometry)
+
+        if self._workers == 1:
+            for folder, path in queue:
+                finish(folder, *_analyzeFile(path))
+            return failed
+
+        maxPending = self._workers * 2
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            pending = {}
+            jobs = iter(queue)
+
+            while True:
+                for folder, path in jobs:
+                    pending[executor.submit(_analyzeFile, path)] = (folder, path)
+                    if len(pending) >= maxPending: break
+
+                if not pending: break
+
+                done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    folder, path = pending.pop(future)
+                    try:
+                        path, result, error = future.result()
+                    except Exception:
+                        result, error = None, traceback.format_exc()
+                    finish(folder, path, result, error)
+
+        return failed
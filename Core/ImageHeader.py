@@ -0,0 +1,243 @@
+import struct
+import os
+
+
+
+class ImageHeader(object):
+
+    # JPEG start of frame markers, all of them store height and width the same way
+
+    JPEG_SOF = (
+        0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+        0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF
+    )
+
+    PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+    EXR_MAGIC = b"\x76\x2f\x31\x01"
+
+
+    @staticmethod
+    def sizeFromFile(path):
+        """
+        Read image width and height from file header, pixels are not decoded.
+        Supported: JPEG, PNG, TIFF (and BigTIFF), TGA, EXR
+
+        :param path: path to image file
+
+        :return: (width, height) or None if format is not recognized
+        """
+
+        extension = os.path.splitext(path)[-1][1:]
+
+        with open(path, "rb") as stream:
+            return ImageHeader.sizeFromStream(stream, extension)
+
+
+    @staticmethod
+    def sizeFromStream(stream, extension=""):
+        """
+        Read image width and height from binary stream positioned at image start
+        (i.e. file object or ArchiveFileManager.openMember() stream). Stream is
+        only read forward, so compressed archive members are never rewound.
+
+        :param stream: binary file-like object
+        :param extension: file extension, required for TGA which has no signature
+
+        :return: (width, height) or None if format is not recognized
+        """
+
+        reader = _ForwardReader(stream)
+
+        try:
+            head = reader.read(8)
+
+            if head.startswith(ImageHeader.PNG_MAGIC):
+                return ImageHeader._sizePNG(reader)
+
+            if head.startswith(b"\xff\xd8"):
+                return ImageHeader._sizeJPEG(reader)
+
+            if head[:4] in (b"II*\x00", b"MM\x00*", b"II+\x00", b"MM\x00+"):
+                return ImageHeader._sizeTIFF(reader, head)
+
+            if head.startswith(ImageHeader.EXR_MAGIC):
+                return ImageHeader._sizeEXR(reader)
+
+            if extension.lower() == "tga":
+                return ImageHeader._sizeTGA(reader)
+
+        except (struct.error, EOFError):
+            return None
+
+        return None
+
+
+    @staticmethod
+    def _sizePNG(reader):
+        # IHDR is always the first chunk: length, "IHDR", width, height
+        length, name, width, height = struct.unpack(">I4sII", reader.read(16))
+
+        if name != b"IHDR": return None
+
+        return width, height
+
+
+    @staticmethod
+    def _sizeJPEG(reader):
+        while True:
+            byte = reader.read(1)
+
+            if byte != b"\xff": continue
+
+            marker = ord(reader.read(1))
+
+            while marker == 0xFF:
+                marker = ord(reader.read(1))
+
+            # markers without segment
+
+            if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+                continue
+
+            if marker == 0xD9:
+                return None
+
+            length = struct.unpack(">H", reader.read(2))[0]
+
+            if marker in ImageHeader.JPEG_SOF:
+                precision, height, width = struct.unpack(">BHH", reader.read(5))
+                return width, height
+
+            reader.skip(length - 2)
+
+
+    @staticmethod
+    def _sizeTIFF(reader, head):
+        order = "<" if head[:2] == b"II" else ">"
+        big = head[2:4] in (b"+\x00", b"\x00+")
+
+        if big:
+            offset = struct.unpack(order + "Q", reader.read(8))[0]
+            reader.skipTo(offset)
+            count = struct.unpack(order + "Q", reader.read(8))[0]
+            entrySize, countFormat = 20, order + "HHQ"
+        else:
+            offset = struct.unpack(order + "I", head[4:8])[0]
+            reader.skipTo(offset)
+            count = struct.unpack(order + "H", reader.read(2))[0]
+            entrySize, countFormat = 12, order + "HHI"
+
+        width = height = None
+
+        for i in range(count):
+            entry = reader.read(entrySize)
+            tag, kind, values = struct.unpack(countFormat, entry[:struct.calcsize(countFormat)])
+
+            if tag not in (256, 257): continue
+
+            data = entry[struct.calcsize(countFormat):]
+
+            if kind == 3:
+                value = struct.unpack(order + "H", data[:2])[0]
+            elif kind == 4:
+                value = struct.unpack(order + "I", data[:4])[0]
+            elif kind == 16:
+                value = struct.unpack(order + "Q", data[:8])[0]
+            else:
+                continue
+
+            if tag == 256: width = value
+            else: height = value
+
+            if width is not None and height is not None:
+                return width, height
+
+        return None
+
+
+    @staticmethod
+    def _sizeEXR(reader):
+        # version field is already read with magic, attributes follow:
+        # name\0 type\0 size(int32) value, header ends with empty name
+
+        while True:
+            name = reader.readString()
+
+            if not name: return None
+
+            kind = reader.readString()
+            size = struct.unpack("<i", reader.read(4))[0]
+
+            if name == b"dataWindow" and kind == b"box2i":
+                xMin, yMin, xMax, yMax = struct.unpack("<iiii", reader.read(16))
+                return xMax - xMin + 1, yMax - yMin + 1
+
+            reader.skip(size)
+
+
+    @staticmethod
+    def _sizeTGA(reader):
+        # 18 bytes header, 8 of them are already read
+        header = reader.read(10)
+        width, height = struct.unpack("<HH", header[4:8])
+
+        if not width or not height: return None
+
+        return width, height
+
+
+
+class _ForwardReader(object):
+
+    def __init__(self, stream):
+        """
+        Forward only reader keeping track of position, skips by reading
+        if stream is not seekable.
+        """
+        self._stream = stream
+        self._position = 0
+
+        try:
+            self._seekable = stream.seekable()
+        except AttributeError:
+            self._seekable = False
+
+
+    def read(self, size):
+        data = self._stream.read(size)
+
+        if len(data) != size:
+            raise EOFError("Unexpected end of image header")
+
+        self._position += size
+
+        return data
+
+
+    def readString(self, limit=256):
+        chars = []
+
+        while len(chars) < limit:
+            char = self.read(1)
+            if char == b"\x00": break
+            chars.append(char)
+
+        return b"".join(chars)
+
+
+    def skip(self, size):
+        if size <= 0: return
+
+        if self._seekable:
+            self._stream.seek(size, os.SEEK_CUR)
+            self._position += size
+            return
+
+        while size > 0:
+            chunk = min(size, 65536)
+            self.read(chunk)
+            size -= chunk
+
+
+    def skipTo(self, offset):
+        self.skip(offset - self._position)
@@ -1,172 +1,561 @@
-
-from PIL import Image as PILImage
-from PIL import ImageStat as PILImageStat
-from PIL import ImageEnhance as PILImageEnhance
-from PIL import ImageOps as PILImageOps
-from colormap import rgb2hex
-import math
-import os
-
-
-class ImageFormats(object):
-    TIF     = "tif"
-    TIFF    = "tiff"
-    TGA     = "TGA"
-    JPG     = "jpg"
-    PNG     = "png"
-    JPEG    = "jpeg"
-
-
-class ColorModes(object):
-    MONO    = "1"       # 1-bit pixels, black and white, stored with one pixel per byte
-    L       = "L"       # 8-bit pixels, black and white
-    RGB     = "RGB"     # 3x8-bit pixels, true color
-    RGBA    = "RGBA"    # 4x8-bit pixels, true color with transparency mask
-    CMYK    = "CMYK"    # 4x8-bit pixels, color separation
-    YCbCr   = "YCbCr"   # 3x8-bit pixels, color video format
-    LAB     = "LAB"     # 3x8-bit pixels, the L*a*b color space
-    HSV     = "HSV"     # 3x8-bit pixels, Hue, Saturation, Value color space
-    I       = "I"       # 32-bit signed integer pixels
-    F       = "F"       # 32-bit floating point pixels
-
-
-
-class ImageProcessor(object):
-
-    def __init__(self):
-        super(ImageProcessor, self).__init__()
-
-        self._image = None
-        self._imageFile = ""
-        self._supportedFormats = [
-            ImageFormats.TIFF,
-            ImageFormats.JPEG,
-            ImageFormats.TIF,
-            ImageFormats.TGA,
-            ImageFormats.JPG,
-            ImageFormats.PNG
-        ]
-
-    @property
-    def imageFile(self):
-        return self._imageFile
-
-    @imageFile.setter
-    def imageFile(self, imageFile):
-        if not isinstance(imageFile, str):
-            raise TypeError("Expected < str >")
-
-        if not os.path.isfile(imageFile):
-            raise StandardError(imageFile + " is not file")
-
-        extension = os.path.splitext(imageFile)[-1][1:]
-
-        if extension not in self._supportedFormats:
-            raise StandardError("Unsupportable image extension")
-
-        self._imageFile = imageFile
-
-
-    def open(self):
-        self._image = PILImage.open(self._imageFile)
-
-
-    def close(self):
-        if self._image:
-            self._image.close()
-            self._image = None
-
-
-    def width(self):
-        return self._image.width
-
-
-    def height(self):
-        return self._image.height
-
-
-    def mode(self):
-        return self._image.mode
-
-
-    def desaturate(self):
-        self._image = PILImageOps.grayscale(self._image)
-
-
-    def invert(self):
-        self._image = PILImageOps.invert(self._image)
-
-
-    def changeSaturation(self, scale=1.0):
-        enhancer = PILImageEnhance.Color(self._image)
-        self._image = enhancer.enhance(scale)
-
-
-    def changeBrightness(self, scale=1.0):
-        enhancer = PILImageEnhance.Brightness(self._image)
-        self._image = enhancer.enhance(scale)
-
-
-    def changeContrast(self, scale=1.0):
-        enhancer = PILImageEnhance.Contrast(self._image)
-        self._image = enhancer.enhance(scale)
-
-
-    def changeSharpness(self, scale=1.0):
-        enhancer = PILImageEnhance.Sharpness(self._image)
-        self._image = enhancer.enhance(scale)
-
-
-    def convertTo(self, colorMode=ColorModes.RGB):
-        self._image = self._image.convert(colorMode)
-
-
-    def resize(self, width, height):
-        self._image.thumbnail((width, height), PILImage.ANTIALIAS)
-
-
-    def scale(self, width=0.5, height=0.5):
-        w = self._image.width
-        h = self._image.height
-
-        w = math.ceil(w * width)
-        h = math.ceil(h * height)
-
-        self._image.thumbnail((w, h), PILImage.ANTIALIAS)
-
-
-    def averageColor(self, hexType=True):
-        color = PILImageStat.Stat(self._image).mean
-        if hexType:
-            color = rgb2hex(color[0], color[1], color[2])
-        return color
-
-
-    def minMax(self):
-        extrema = PILImageStat.Stat(self._image).extrema
-        return {
-            "r": {"min": extrema[0][0], "max": extrema[0][1]},
-            "g": {"min": extrema[1][0], "max": extrema[1][1]},
-            "b": {"min": extrema[2][0], "max": extrema[2][1]},
-        }
-
-
-    def save(self, directory, name, format=ImageFormats.JPEG, compress=True, quality=100):
-        path = os.path.join(directory, name + "." + format)
-        self._image.save(path, format, optimize=compress, quality=quality)
-
-
-
-if __name__ == '__main__':
-    srcdir = "C:/Users/edward/Desktop/imgtest"
-    dstdir = "C:/Users/edward/Desktop/imgtest"
-
-    albedo = os.path.join(srcdir, "Albedo.png")
-
-    manager = ImageProcessor()
-    manager.imageFile = albedo
-    manager.open()
-    print manager.averageColor()
-    #manager.save(dstdir, "processed", format=ImageFormats.JPEG)
-    manager.close()
-
+
+from PIL import Image as PILImage
+from PIL import ImageStat as PILImageStat
+from PIL import ImageEnhance as PILImageEnhance
+from PIL import ImageOps as PILImageOps
+from colormap import rgb2hex
+from Core.ImageHeader import ImageHeader
+import numpy
+import math
+import os
+
+
+class ImageFormats(object):
+    TIF     = "tif"
+    TIFF    = "tiff"
+    TGA     = "TGA"
+    JPG     = "jpg"
+    PNG     = "png"
+    JPEG    = "jpeg"
+
+
+class ColorModes(object):
+    MONO    = "1"       # 1-bit pixels, black and white, stored with one pixel per byte
+    L       = "L"       # 8-bit pixels, black and white
+    RGB     = "RGB"     # 3x8-bit pixels, true color
+    RGBA    = "RGBA"    # 4x8-bit pixels, true color with transparency mask
+    CMYK    = "CMYK"    # 4x8-bit pixels, color separation
+    YCbCr   = "YCbCr"   # 3x8-bit pixels, color video format
+    LAB     = "LAB"     # 3x8-bit pixels, the L*a*b color space
+    HSV     = "HSV"     # 3x8-bit pixels, Hue, Saturation, Value color space
+    I       = "I"       # 32-bit signed integer pixels
+    F       = "F"       # 32-bit floating point pixels
+
+
+
+def colorStatistics(pixels, paletteSize=5):
+    """
+    Mean, per channel minimum / maximum and dominant palette of RGB pixels.
+    Palette is built from 4096 bins (4 bits per channel) counted by one bincount,
+    color of palette entry is the mean of pixels in its bin.
+
+    :param pixels: numpy array of shape (N, 3), uint8 RGB
+    :param paletteSize: < int > number of dominant colors
+
+    :return: dict { "mean": (r, g, b), "min": (r, g, b), "max": (r, g, b),
+                    "palette": [((r, g, b), weight), ...] } weights sum to 1
+    """
+
+    pixels = numpy.asarray(pixels).reshape(-1, 3)
+    count = len(pixels)
+
+    minimum = pixels.min(axis=0)
+    maximum = pixels.max(axis=0)
+
+    wide = pixels.astype(numpy.int64)
+    keys = ((wide[:, 0] >> 4) << 8) | ((wide[:, 1] >> 4) << 4) | (wide[:, 2] >> 4)
+
+    counts = numpy.bincount(keys, minlength=4096)
+    sums = [numpy.bincount(keys, weights=wide[:, c], minlength=4096) for c in range(3)]
+
+    mean = tuple(float(channel.sum()) / count for channel in sums)
+
+    palette = []
+    for key in numpy.argsort(counts)[::-1][:paletteSize]:
+        if not counts[key]: break
+        color = tuple(int(round(channel[key] / counts[key])) for channel in sums)
+        palette.append((color, float(counts[key]) / count))
+
+    return {
+        "mean": mean,
+        "min": tuple(int(v) for v in minimum),
+        "max": tuple(int(v) for v in maximum),
+        "palette": palette
+    }
+
+
+
+class ImageOperations(object):
+    INVERT      = "invert"
+    BRIGHTNESS  = "brightness"
+    CONTRAST    = "contrast"
+    DESATURATE  = "desaturate"
+    SATURATION  = "saturation"
+    SHARPNESS   = "sharpness"
+    CONVERT     = "convert"
+    RESIZE      = "resize"
+    SCALE       = "scale"
+
+    # per pixel operations which can be fused into one lookup table
+    POINT       = (INVERT, BRIGHTNESS, CONTRAST)
+    # operations changing image size
+    SIZE        = (RESIZE, SCALE)
+    # fusable modes, operations on other modes are executed one by one
+    POINT_MODES = (ColorModes.L, ColorModes.RGB)
+
+
+
+class ImageProcessor(object):
+
+    def __init__(self):
+        """
+        Image adjustments on top of PIL.
+
+        property "lazy": if True, operations are only recorded and executed at once when
+                         result is required (save, statistics, mode, size ...) or on execute().
+                         Consecutive invert / brightness / contrast are fused into one lookup
+                         table pass, resizes are moved in front of operations which commute
+                         with resampling (invert, desaturate, brightness and contrast not
+                         greater than 1), so the rest of operations runs on smaller image.
+                         Result may differ from eager mode by rounding only.
+                         Operations can be recorded before open(), image is opened when
+                         they are executed.
+        """
+        super(ImageProcessor, self).__init__()
+
+        self._image = None
+        self._imageFile = ""
+        self._headerSize = None
+        self._lazy = False
+        self._operations = []
+        self._supportedFormats = [
+            ImageFormats.TIFF,
+            ImageFormats.JPEG,
+            ImageFormats.TIF,
+            ImageFormats.TGA,
+            ImageFormats.JPG,
+            ImageFormats.PNG
+        ]
+
+    @property
+    def imageFile(self):
+        return self._imageFile
+
+    @imageFile.setter
+    def imageFile(self, imageFile):
+        if not isinstance(imageFile, str):
+            raise TypeError("Expected < str >")
+
+        if not os.path.isfile(imageFile):
+            raise StandardError(imageFile + " is not file")
+
+        extension = os.path.splitext(imageFile)[-1][1:]
+
+        if extension not in self._supportedFormats:
+            raise StandardError("Unsupportable image extension")
+
+        self._imageFile = imageFile
+        self._headerSize = None
+
+
+    @property
+    def lazy(self):
+        return self._lazy
+
+    @lazy.setter
+    def lazy(self, lazy):
+        if not isinstance(lazy, bool):
+            raise TypeError("Expected < bool >")
+
+        if not lazy: self.execute()
+
+        self._lazy = lazy
+
+
+    def open(self):
+        self._image = PILImage.open(self._imageFile)
+
+
+    def openReduced(self, size=256):
+        """
+        Open image decoded at reduced resolution. JPEG is decoded with DCT scaling
+        (never less than "size" on the shorter side), other formats are decoded
+        fully and box reduced right after loading.
+
+        :param size: < int > minimal size of reduced image
+        """
+
+        self._image = PILImage.open(self._imageFile)
+
+        if self._image.format == "JPEG":
+            self._image.draft("RGB", (size, size))
+
+        self._image = self._reducible(self._image)
+
+        factor = min(self._image.width, self._image.height) // size
+
+        if factor > 1:
+            self._image = self._image.reduce(factor)
+
+
+    @staticmethod
+    def _reducible(image):
+        """
+        Image in mode supported by reduce(): palette images are converted to RGB(A)
+        (averaging palette indices is meaningless), 1 bit and 16 bit images to L,
+        reduced image is 8 bit anyway
+        """
+
+        mode = image.mode
+
+        if mode in ("P", "PA"):
+            if mode == "PA" or "transparency" in image.info:
+                return image.convert(ColorModes.RGBA)
+            return image.convert(ColorModes.RGB)
+
+        if mode == ColorModes.MONO:
+            return image.convert(ColorModes.L)
+
+        if mode.startswith("I;16"):
+            return image.convert(ColorModes.I).point(lambda i: i * (1.0 / 256)).convert(ColorModes.L)
+
+        return image
+
+
+    def close(self):
+        self._operations = []
+
+        if self._image:
+            self._image.close()
+            self._image = None
+
+
+    def size(self):
+        """
+        Width and height of image. If image is not opened, size is read
+        from file header without decoding pixels.
+
+        :return: (width, height)
+        """
+
+        if self._image is not None:
+            self.execute()
+            return self._image.width, self._image.height
+
+        if self._headerSize is None:
+            self._headerSize = ImageHeader.sizeFromFile(self._imageFile)
+
+            if self._headerSize is None:
+                image = PILImage.open(self._imageFile)
+                self._headerSize = image.size
+                image.close()
+
+        return self._headerSize
+
+
+    def width(self):
+        return self.size()[0]
+
+
+    def height(self):
+        return self.size()[1]
+
+
+    def mode(self):
+        self.execute()
+        return self._image.mode
+
+
+    def desaturate(self):
+        self._record(ImageOperations.DESATURATE)
+
+
+    def invert(self):
+        self._record(ImageOperations.INVERT)
+
+
+    def changeSaturation(self, scale=1.0):
+        self._record(ImageOperations.SATURATION, scale)
+
+
+    def changeBrightness(self, scale=1.0):
+        self._record(ImageOperations.BRIGHTNESS, scale)
+
+
+    def changeContrast(self, scale=1.0):
+        self._record(ImageOperations.CONTRAST, scale)
+
+
+    def changeSharpness(self, scale=1.0):
+        self._record(ImageOperations.SHARPNESS, scale)
+
+
+    def convertTo(self, colorMode=ColorModes.RGB):
+        self._record(ImageOperations.CONVERT, colorMode)
+
+
+    def resize(self, width, height):
+        self._record(ImageOperations.RESIZE, width, height)
+
+
+    def scale(self, width=0.5, height=0.5):
+        self._record(ImageOperations.SCALE, width, height)
+
+
+    def _record(self, operation, *args):
+        self._operations.append((operation, args))
+
+        if not self._lazy: self.execute()
+
+
+    def execute(self):
+        """
+        Execute recorded operations
+        """
+
+        if not self._operations: return
+
+        if self._image is None:
+            self.open()
+
+        operations = self._plan(self._operations)
+        self._operations = []
+
+        point = []
+
+        for operation in operations:
+            if operation[0] in ImageOperations.POINT:
+                point.append(operation)
+                continue
+
+            self._applyPoint(point)
+            point = []
+
+            self._apply(*operation)
+
+        self._applyPoint(point)
+
+
+    @staticmethod
+    def _commutesWithResize(operation):
+        name, args = operation
+
+        if name in (ImageOperations.INVERT, ImageOperations.DESATURATE):
+            return True
+
+        # not clipping scales keep the mapping affine
+
+        if name in (ImageOperations.BRIGHTNESS, ImageOperations.CONTRAST):
+            return 0.0 <= args[0] <= 1.0
+
+        return False
+
+
+    @staticmethod
+    def _plan(operations):
+        """
+        Reorder operations: every resize is moved in front of preceding
+        operations which commute with resampling
+        """
+
+        planned = []
+
+        for operation in operations:
+            index = len(planned)
+
+            if operation[0] in ImageOperations.SIZE:
+                while index and ImageProcessor._commutesWithResize(planned[index - 1]):
+                    index -= 1
+
+            planned.insert(index, operation)
+
+        return planned
+
+
+    def _apply(self, name, args):
+        if name == ImageOperations.DESATURATE:
+            self._image = PILImageOps.grayscale(self._image)
+
+        elif name == ImageOperations.INVERT:
+            self._image = PILImageOps.invert(self._image)
+
+        elif name == ImageOperations.SATURATION:
+            self._image = PILImageEnhance.Color(self._image).enhance(*args)
+
+        elif name == ImageOperations.BRIGHTNESS:
+            self._image = PILImageEnhance.Brightness(self._image).enhance(*args)
+
+        elif name == ImageOperations.CONTRAST:
+            self._image = PILImageEnhance.Contrast(self._image).enhance(*args)
+
+        elif name == ImageOperations.SHARPNESS:
+            self._image = PILImageEnhance.Sharpness(self._image).enhance(*args)
+
+        elif name == ImageOperations.CONVERT:
+            self._image = self._image.convert(*args)
+
+        elif name == ImageOperations.RESIZE:
+            self._image.thumbnail(args, PILImage.LANCZOS)
+
+        elif name == ImageOperations.SCALE:
+            w = math.ceil(self._image.width * args[0])
+            h = math.ceil(self._image.height * args[1])
+
+            self._image.thumbnail((w, h), PILImage.LANCZOS)
+
+
+    def _applyPoint(self, operations):
+        """
+        Execute point operations as one lookup table. Contrast needs mean luminance
+        of the image at its position, it is computed from histogram of the source
+        image mapped through the table built so far, so the image is read only twice.
+        """
+
+        if not operations: return
+
+        if len(operations) == 1 or self._image.mode not in ImageOperations.POINT_MODES:
+            for operation in operations:
+                self._apply(*operation)
+            return
+
+        histogram = None
+        table = numpy.arange(256, dtype=numpy.float64)
+
+        for name, args in operations:
+            if name == ImageOperations.INVERT:
+                table = 255.0 - table
+
+            elif name == ImageOperations.BRIGHTNESS:
+                table = table * args[0]
+
+            elif name == ImageOperations.CONTRAST:
+                if histogram is None:
+                    histogram = numpy.array(self._image.histogram(), dtype=numpy.float64).reshape(-1, 256)
+
+                means = histogram.dot(table) / histogram[0].sum()
+
+                if len(means) == 3:
+                    mean = means.dot((0.299, 0.587, 0.114))
+                else:
+                    mean = means[0]
+
+                mean = int(mean + 0.5)
+                table = mean + (table - mean) * args[0]
+
+            # every eager operation truncates result to 8 bit image
+
+            table = numpy.clip(numpy.floor(table + 1e-4), 0, 255)
+
+        table = table.astype(numpy.uint8).tolist()
+
+        self._image = self._image.point(table * len(self._image.getbands()))
+
+
+    def averageColor(self, hexType=True):
+        self.execute()
+        color = PILImageStat.Stat(self._image).mean
+        if hexType:
+            color = rgb2hex(*[int(round(c)) for c in color[:3]])
+        return color
+
+
+    def statistics(self, sampleSize=256, paletteSize=5, hexType=True):
+        """
+        Fast color statistics: mean, minimum / maximum and dominant palette
+        computed from reduced image. If image is not opened, it is decoded at
+        reduced resolution only for this call, operations recorded in lazy mode
+        are applied to it and stay recorded for the full image.
+
+        :param sampleSize: < int > approximate size of sampled image
+        :param paletteSize: < int > number of dominant colors
+        :param hexType: < bool > return colors in hex format
+
+        :return: dict { "mean", "min", "max", "palette" } (see colorStatistics)
+        """
+
+        opened = self._image is not None
+        operations = self._operations
+
+        if not opened:
+            self.openReduced(sampleSize)
+            self._operations = list(operations)
+
+        self.execute()
+
+        try:
+            image = self._image
+
+            if image.width > sampleSize * 2 and image.height > sampleSize * 2:
+                image = self._reducible(image).reduce(min(image.width, image.height) // sampleSize)
+
+            if image.mode != ColorModes.RGB:
+                image = image.convert(ColorModes.RGB)
+
+            stats = colorStatistics(numpy.asarray(image), paletteSize)
+        finally:
+            if not opened:
+                self.close()
+                self._operations = operations
+
+        if hexType:
+            stats["mean"] = rgb2hex(*[int(round(v)) for v in stats["mean"]])
+            stats["palette"] = [rgb2hex(*color) for color, weight in stats["palette"]]
+
+        return stats
+
+
+    def minMax(self):
+        self.execute()
+        extrema = PILImageStat.Stat(self._image).extrema
+        return {
+            "r": {"min": extrema[0][0], "max": extrema[0][1]},
+            "g": {"min": extrema[1][0], "max": extrema[1][1]},
+            "b": {"min": extrema[2][0], "max": extrema[2][1]},
+        }
+
+
+    def image(self):
+        """
+        :return: PIL image with recorded operations executed
+        """
+
+        self.execute()
+        return self._image
+
+
+    def save(self, directory, name, format=ImageFormats.JPEG, compress=True, quality=100):
+        self.execute()
+
+        path = os.path.join(directory, name + "." + format)
+        self._image.save(path, format, optimize=compress, quality=quality)
+
+
+
+if __name__ == '__main__':
+
+    # benchmark: eager against lazy execution of adjustment chain on generated 8K map,
+    # lazy mode resizes first (JPEG is decoded with DCT scaling) and fuses the point operations
+
+    import tempfile
+    import time
+
+    directory = tempfile.mkdtemp()
+    size = 8192
+
+    gradient = numpy.linspace(0, 255, size, dtype=numpy.float32)
+    noise = numpy.random.RandomState(1).randint(0, 64, (size, size, 3))
+    pixels = numpy.clip(gradient[None, :, None] * 0.75 + noise, 0, 255).astype(numpy.uint8)
+    PILImage.fromarray(pixels).save(os.path.join(directory, "albedo.jpg"), quality=95)
+
+    def adjust(lazy):
+        processor = ImageProcessor()
+        processor.lazy = lazy
+        processor.imageFile = os.path.join(directory, "albedo.jpg")
+        processor.open()
+        processor.invert()
+        processor.changeBrightness(0.9)
+        processor.changeContrast(0.8)
+        processor.desaturate()
+        processor.resize(2048, 2048)
+        processor.save(directory, "lazy" if lazy else "eager", format=ImageFormats.PNG)
+        processor.close()
+
+    for lazy in (False, True):
+        start = time.time()
+        adjust(lazy)
+        print("%s %.2f s" % ("lazy " if lazy else "eager", time.time() - start))
+
+    eager = numpy.asarray(PILImage.open(os.path.join(directory, "eager.png")), dtype=numpy.int32)
+    lazy = numpy.asarray(PILImage.open(os.path.join(directory, "lazy.png")), dtype=numpy.int32)
+    print("max difference %d, mean difference %.3f" % (
+        numpy.abs(eager - lazy).max(), numpy.abs(eager - lazy).mean()))
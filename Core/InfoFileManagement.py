@@ -1,283 +1,377 @@
-
-class InfoRecord(object):
-
-    RecordTypeInt           = "int"
-    RecordTypeBool          = "bool"
-    RecordTypeColor         = "color"
-    RecordTypeFloat         = "float"
-    RecordTypeString        = "string"
-    RecordTypeRangeInt      = "range_int"
-    RecordTypeRangeFloat    = "range_float"
-    RecordTypeResolution    = "resolution"
-    RecordTypeListString    = "list_string"
-    RecordTypeListFloat     = "list_float"
-    RecordTypeListColor     = "list_color"
-    RecordTypeListInt       = "list_int"
-
-
-
-    def __init__(self, name=""):
-        super(InfoRecord, self).__init__()
-
-        if not isinstance(name, str):
-            raise TypeError("Expected < str >")
-
-        self._name = name
-        self._type = ""
-        self._value = ""
-
-
-    def __eq__(self, other):
-        if not isinstance(other, InfoRecord):
-            return False
-
-        return self._name == other.name
-
-
-
-    @property
-    def name(self):
-        return self._name
-
-    @property
-    def type(self):
-        return self._type
-
-    @name.setter
-    def name(self, name):
-        if not isinstance(name, str):
-            raise TypeError("Expected < str >")
-
-        self._name = name
-
-
-    def toDict(self):
-        return {
-            "name": self._name,
-            "type": self._type,
-            "value": self._value
-        }
-
-
-    def setValueBool(self, value=0):
-        if not isinstance(value, bool):
-            raise TypeError("Expected < bool >")
-        self._type = InfoRecord.RecordTypeBool
-        self._value = value
-
-
-    def setValueInt(self, value=0):
-        if not isinstance(value, int):
-            raise TypeError("Expected < int >")
-        self._type = InfoRecord.RecordTypeInt
-        self._value = value
-
-
-    def setValueFloat(self, value=0.0):
-        if not isinstance(value, float):
-            raise TypeError("Expected < float >")
-        self._type = InfoRecord.RecordTypeFloat
-        self._value = value
-
-
-    def setValueString(self, value="abc"):
-        if not isinstance(value, str):
-            raise TypeError("Expected < str >")
-        self._type = InfoRecord.RecordTypeString
-        self._value = value
-
-
-    def setValueColor(self, value="#000000"):
-        if not isinstance(value, str):
-            raise TypeError("Expected < str >")
-        self._type = InfoRecord.RecordTypeColor
-        self._value = value
-
-
-    def setValueResolution(self, value=(1024, 1024)):
-        if not isinstance(value, tuple):
-            raise TypeError("Expected < tuple(int) >")
-        self._type = InfoRecord.RecordTypeResolution
-        self._value = value
-
-
-    def setValueRangeInt(self, value=(-10, 10)):
-        if not isinstance(value, tuple):
-            raise TypeError("Expected < tuple(int) >")
-        self._type = InfoRecord.RecordTypeRangeInt
-        self._value = value
-
-
-    def setValueRangeFloat(self, value=(0.0, 1.0)):
-        if not isinstance(value, tuple):
-            raise TypeError("Expected < tuple(float) >")
-        self._type = InfoRecord.RecordTypeRangeFloat
-        self._value = value
-
-
-    def setValueStringList(self, value=[""]):
-        if not isinstance(value, list):
-            raise TypeError("Expected < list(str) >")
-
-        self._type = InfoRecord.RecordTypeListString
-        self._value = value
-
-
-    def setValueColorList(self, value=[""]):
-        if not isinstance(value, list):
-            raise TypeError("Expected < list(color) >")
-
-        self._type = InfoRecord.RecordTypeListColor
-        self._value = value
-
-
-    def setValueFloatList(self, value=[""]):
-        if not isinstance(value, list):
-            raise TypeError("Expected < list(float) >")
-
-        self._type = InfoRecord.RecordTypeListFloat
-        self._value = value
-
-
-    def setValueIntList(self, value=[""]):
-        if not isinstance(value, list):
-            raise TypeError("Expected < list(int) >")
-
-        self._type = InfoRecord.RecordTypeListInt
-        self._value = value
-
-
-
-
-class InfoRecordGroup(object):
-
-    def __init__(self):
-        super(InfoRecordGroup, self).__init__()
-
-        self._name = ""
-        self._records = []
-
-
-    def __getitem__(self, item):
-        if isinstance(item, int):
-            return self._records[item]
-
-        if isinstance(item, str):
-            for record in self._records:
-                if record.name == item:
-                    return record
-
-            raise KeyError("No record named " + item)
-
-        raise KeyError("Unsupported key type. Expect < int > or < str >")
-
-
-    @property
-    def name(self):
-        return self._name
-
-    @name.setter
-    def name(self, name):
-        if not isinstance(name, str):
-            raise TypeError("Expected < str >")
-
-        self._name = name
-
-
-    def toDict(self):
-        return {
-            "group": self._name,
-            "records": [record.toDict() for record in self._records]
-        }
-
-
-    def addRecord(self, record, index=None):
-        """
-        Append record to group. If record already exist return False, otherwise True
-
-        :param record: < InfoRecord >
-
-        :param index: < int > insertion index, if None append
-
-        :return: bool
-        """
-
-        if not isinstance(record, InfoRecord):
-            return False
-
-        if record in self._records:
-            return False
-
-        if index == None:
-            self._records.append(record)
-            return True
-
-        self._records.insert(index, record)
-
-        return True
-
-
-    def removeRecord(self, item):
-        """
-        Remove record by index or record name.
-
-        :param item: index or record name
-
-        :return: bool
-        """
-
-        if isinstance(item, int):
-            self._records.pop(item)
-            return True
-
-        if isinstance(item, str):
-            for i, record in enumerate(self._records):
-                if record.name == item:
-                    self._records.pop(i)
-                    return True
-
-            raise KeyError("No record named " + item)
-
-        raise KeyError("Unsupported item type. Expect < int > or < str >")
-
-
-    def changeRecord(self, name, new_record):
-        if not isinstance(name, str):
-            raise TypeError("parm name: expected < str >")
-
-        if not isinstance(new_record, InfoRecord):
-            raise TypeError("parm new_record: expected < InfoRecord >")
-
-        for i, record in enumerate(self._records):
-            if record.name == name:
-                if new_record not in self._records:
-                    self._records[i] = record
-                    return True
-        return False
-
-
-    def makeDefault(self, uniqid, tags, categories, groups, sets, name):
-        rec_uniqid = InfoRecord("ID")
-        rec_tags = InfoRecord("Tags")
-        rec_categories = InfoRecord("Categories")
-        rec_groups = InfoRecord("Groups")
-        rec_name = InfoRecord("Name")
-        rec_set = InfoRecord("Sets")
-
-        rec_uniqid.setValueString(uniqid)
-        rec_tags.setValueStringList(tags)
-        rec_categories.setValueStringList(categories)
-        rec_groups.setValueStringList(groups)
-        rec_name.setValueString(name)
-        rec_set.setValueStringList(sets)
-
-
-        self._name = "asset"
-        self._records = [
-            rec_uniqid,
-            rec_tags,
-            rec_categories,
-            rec_groups,
-            rec_set,
-            rec_name
-        ]
+
+class InfoRecord(object):
+
+    RecordTypeInt           = "int"
+    RecordTypeBool          = "bool"
+    RecordTypeColor         = "color"
+    RecordTypeFloat         = "float"
+    RecordTypeString        = "string"
+    RecordTypeRangeInt      = "range_int"
+    RecordTypeRangeFloat    = "range_float"
+    RecordTypeResolution    = "resolution"
+    RecordTypeListString    = "list_string"
+    RecordTypeListFloat     = "list_float"
+    RecordTypeListColor     = "list_color"
+    RecordTypeListInt       = "list_int"
+
+    # records are created for every asset of catalogue, no per instance dict
+
+    __slots__ = ("_name", "_type", "_value")
+
+
+
+    def __init__(self, name=""):
+        super(InfoRecord, self).__init__()
+
+        if not isinstance(name, str):
+            raise TypeError("Expected < str >")
+
+        self._name = name
+        self._type = ""
+        self._value = ""
+
+
+    def __eq__(self, other):
+        if not isinstance(other, InfoRecord):
+            return False
+
+        return self._name == other.name
+
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+
+    def __hash__(self):
+        return hash(self._name)
+
+
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def type(self):
+        return self._type
+
+    @name.setter
+    def name(self, name):
+        if not isinstance(name, str):
+            raise TypeError("Expected < str >")
+
+        self._name = name
+
+
+    def toDict(self):
+        return {
+            "name": self._name,
+            "type": self._type,
+            "value": self._value
+        }
+
+
+    def setValueBool(self, value=0):
+        if not isinstance(value, bool):
+            raise TypeError("Expected < bool >")
+        self._type = InfoRecord.RecordTypeBool
+        self._value = value
+
+
+    def setValueInt(self, value=0):
+        if not isinstance(value, int):
+            raise TypeError("Expected < int >")
+        self._type = InfoRecord.RecordTypeInt
+        self._value = value
+
+
+    def setValueFloat(self, value=0.0):
+        if not isinstance(value, float):
+            raise TypeError("Expected < float >")
+        self._type = InfoRecord.RecordTypeFloat
+        self._value = value
+
+
+    def setValueString(self, value="abc"):
+        if not isinstance(value, str):
+            raise TypeError("Expected < str >")
+        self._type = InfoRecord.RecordTypeString
+        self._value = value
+
+
+    def setValueColor(self, value="#000000"):
+        if not isinstance(value, str):
+            raise TypeError("Expected < str >")
+        self._type = InfoRecord.RecordTypeColor
+        self._value = value
+
+
+    def setValueResolution(self, value=(1024, 1024)):
+        if not isinstance(value, tuple):
+            raise TypeError("Expected < tuple(int) >")
+        self._type = InfoRecord.RecordTypeResolution
+        self._value = value
+
+
+    def setValueRangeInt(self, value=(-10, 10)):
+        if not isinstance(value, tuple):
+            raise TypeError("Expected < tuple(int) >")
+        self._type = InfoRecord.RecordTypeRangeInt
+        self._value = value
+
+
+    def setValueRangeFloat(self, value=(0.0, 1.0)):
+        if not isinstance(value, tuple):
+            raise TypeError("Expected < tuple(float) >")
+        self._type = InfoRecord.RecordTypeRangeFloat
+        self._value = value
+
+
+    def setValueStringList(self, value=[""]):
+        if not isinstance(value, list):
+            raise TypeError("Expected < list(str) >")
+
+        self._type = InfoRecord.RecordTypeListString
+        self._value = value
+
+
+    def setValueColorList(self, value=[""]):
+        if not isinstance(value, list):
+            raise TypeError("Expected < list(color) >")
+
+        self._type = InfoRecord.RecordTypeListColor
+        self._value = value
+
+
+    def setValueFloatList(self, value=[""]):
+        if not isinstance(value, list):
+            raise TypeError("Expected < list(float) >")
+
+        self._type = InfoRecord.RecordTypeListFloat
+        self._value = value
+
+
+    def setValueIntList(self, value=[""]):
+        if not isinstance(value, list):
+            raise TypeError("Expected < list(int) >")
+
+        self._type = InfoRecord.RecordTypeListInt
+        self._value = value
+
+
+
+
+class InfoRecordGroup(object):
+
+    def __init__(self):
+        """
+        Named group of info records. Records are stored in insertion ordered dict
+        keyed by record name, so lookup by name is O(1). Index access uses list
+        of records cached until the group changes.
+
+        Record must not be renamed while it is in group, use changeRecord() instead.
+        """
+        super(InfoRecordGroup, self).__init__()
+
+        self._name = ""
+        self._records = {}
+        self._order = None
+
+
+    def __getitem__(self, item):
+        if isinstance(item, int):
+            return self._list()[item]
+
+        if isinstance(item, str):
+            try:
+                return self._records[item]
+            except KeyError:
+                raise KeyError("No record named " + item)
+
+        raise KeyError("Unsupported key type. Expect < int > or < str >")
+
+
+    def __len__(self):
+        return len(self._records)
+
+
+    def __iter__(self):
+        return iter(self._list())
+
+
+    def __contains__(self, item):
+        if isinstance(item, InfoRecord):
+            item = item.name
+
+        return item in self._records
+
+
+    def _list(self):
+        if self._order is None:
+            self._order = list(self._records.values())
+        return self._order
+
+
+    def _setRecords(self, records):
+        self._records = dict((record.name, record) for record in records)
+        self._order = None
+
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        if not isinstance(name, str):
+            raise TypeError("Expected < str >")
+
+        self._name = name
+
+
+    def toDict(self):
+        return {
+            "group": self._name,
+            "records": [record.toDict() for record in self._records.values()]
+        }
+
+
+    def addRecord(self, record, index=None):
+        """
+        Append record to group. If record already exist return False, otherwise True
+
+        :param record: < InfoRecord >
+
+        :param index: < int > insertion index, if None append
+
+        :return: bool
+        """
+
+        if not isinstance(record, InfoRecord):
+            return False
+
+        if record.name in self._records:
+            return False
+
+        if index == None:
+            self._records[record.name] = record
+
+            if self._order is not None:
+                self._order.append(record)
+
+            return True
+
+        records = list(self._list())
+        records.insert(index, record)
+        self._setRecords(records)
+
+        return True
+
+
+    def removeRecord(self, item):
+        """
+        Remove record by index or record name.
+
+        :param item: index or record name
+
+        :return: bool
+        """
+
+        if isinstance(item, int):
+            del self._records[self._list()[item].name]
+            self._order = None
+            return True
+
+        if isinstance(item, str):
+            if item not in self._records:
+                raise KeyError("No record named " + item)
+
+            del self._records[item]
+            self._order = None
+            return True
+
+        raise KeyError("Unsupported item type. Expect < int > or < str >")
+
+
+    def changeRecord(self, name, new_record):
+        """
+        Replace record "name" with "new_record" keeping its position. Fails if record
+        does not exist or other record of group is already named as "new_record".
+
+        :param name: < str > name of record to replace
+        :param new_record: < InfoRecord >
+
+        :return: bool
+        """
+        if not isinstance(name, str):
+            raise TypeError("parm name: expected < str >")
+
+        if not isinstance(new_record, InfoRecord):
+            raise TypeError("parm new_record: expected < InfoRecord >")
+
+        if name not in self._records:
+            return False
+
+        if new_record.name == name:
+            self._records[name] = new_record
+            self._order = None
+            return True
+
+        if new_record.name in self._records:
+            return False
+
+        self._setRecords(new_record if record.name == name else record for record in self._list())
+
+        return True
+
+
+    def makeDefault(self, uniqid, tags, categories, groups, sets, name):
+        rec_uniqid = InfoRecord("ID")
+        rec_tags = InfoRecord("Tags")
+        rec_categories = InfoRecord("Categories")
+        rec_groups = InfoRecord("Groups")
+        rec_name = InfoRecord("Name")
+        rec_set = InfoRecord("Sets")
+
+        rec_uniqid.setValueString(uniqid)
+        rec_tags.setValueStringList(tags)
+        rec_categories.setValueStringList(categories)
+        rec_groups.setValueStringList(groups)
+        rec_name.setValueString(name)
+        rec_set.setValueStringList(sets)
+
+
+        self._name = "asset"
+        self._setRecords([
+            rec_uniqid,
+            rec_tags,
+            rec_categories,
+            rec_groups,
+            rec_set,
+            rec_name
+        ])
+
+
+
+if __name__ == '__main__':
+
+    # benchmark: building large group, list backed group was quadratic
+
+    import time
+
+    for count in (1000, 10000, 100000):
+        start = time.time()
+
+        group = InfoRecordGroup()
+        for i in range(count):
+            record = InfoRecord("record_%d" % i)
+            record.setValueInt(i)
+            group.addRecord(record)
+
+        for i in range(0, count, 7):
+            group["record_%d" % i]
+
+        data = group.toDict()
+        print("%7d records %.3f s" % (count, time.time() - start))
+
+    assert group[5].name == "record_5" and len(data["records"]) == count
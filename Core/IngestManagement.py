@@ -0,0 +1,557 @@
+from __future__ import print_function
+
+from Core.ArchiveIndex import ArchiveIndex
+from Core.Serialization import SerializationFormats
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+import collections
+import traceback
+import os
+
+
+
+class IngestTask(object):
+
+    def __init__(self, archive, assetType, directory, classes=None, name="", indexFile="", profile=None,
+                 catalogueFile="", infoFiles=True, infoFormat=SerializationFormats.JSON, statistics=False,
+                 replaceStale=False):
+        """
+        Single archive scheduled for ingest.
+
+        :param archive: < str > path to asset archive
+        :param assetType: < str > asset type used to choose the handler (i.e. "surface", "3d")
+        :param directory: < str > destination library folder
+        :param classes: < list(str) > classes to which the asset belongs
+        :param name: < str > asset name, archive name without extension if empty
+        :param indexFile: < str > ArchiveIndex database the handler records archive to, if any
+        :param profile: < ExtractionProfile > members to extract, handler default if None
+        :param catalogueFile: < str > LibraryCatalogue database the handler adds asset info to, if any
+        :param infoFiles: < bool > handler writes info file to asset folder
+        :param infoFormat: < str > SerializationFormats of info file
+        :param statistics: < bool > handler measures extracted textures (resolution, colors)
+        :param replaceStale: < bool > asset folder of previous ingest of changed archive is removed
+        """
+        super(IngestTask, self).__init__()
+
+        if not name:
+            name = os.path.splitext(os.path.basename(archive))[0]
+
+        self.archive = archive
+        self.assetType = assetType
+        self.directory = directory
+        self.classes = list(classes or [])
+        self.name = name
+        self.indexFile = indexFile
+        self.profile = profile
+        self.catalogueFile = catalogueFile
+        self.infoFiles = infoFiles
+        self.infoFormat = infoFormat
+        self.statistics = statistics
+        self.replaceStale = replaceStale
+
+
+
+class IngestResult(object):
+
+    def __init__(self, task, success, folder="", error="", skipped=False):
+        """
+        Outcome of one ingest task.
+
+        :param task: < IngestTask >
+        :param success: < bool >
+        :param folder: < str > extracted asset folder, if handler returned it
+        :param error: < str > formatted traceback if failed
+        :param skipped: < bool > archive is unchanged since last ingest and was not extracted
+        """
+        super(IngestResult, self).__init__()
+
+        self.task = task
+        self.success = success
+        self.folder = folder
+        self.error = error
+        self.skipped = skipped
+
+
+
+def _runTask(handler, task):
+    """
+    Execute handler for task in worker process. Never raises, any failure
+    is reported in returned IngestResult so one bad archive does not abort the batch.
+    """
+
+    try:
+        folder = handler(task)
+        return IngestResult(task, True, folder=folder or "")
+    except Exception:
+        return IngestResult(task, False, error=traceback.format_exc())
+
+
+
+class IngestManager(object):
+
+    def __init__(self):
+        """
+        Discover asset archives and dispatch them to a process pool.
+
+        Handlers are registered per asset type and called as handler(task) in
+        worker processes, so they must be picklable (module level functions).
+        """
+        super(IngestManager, self).__init__()
+
+        self._handlers = {}
+        self._stages = {}
+        self._workers = os.cpu_count() or 1
+        self._archiveIndex = None
+
+        self.archiveExtensions = ["zip", "rar"]
+
+        # ExtractionProfile given to discovered tasks, handler default if None
+        self.extractionProfile = None
+
+        # LibraryCatalogue database given to discovered tasks, empty string disables it
+        self.catalogueFile = ""
+
+        # discovered tasks write info file of "infoFileFormat" to asset folders
+        self.writeInfoFiles = True
+        self.infoFileFormat = SerializationFormats.JSON
+
+        # discovered tasks measure extracted textures
+        self.computeStatistics = False
+
+        # discovered tasks remove asset folders of previous ingest of changed archives
+        self.replaceStale = False
+
+
+    @property
+    def workers(self):
+        return self._workers
+
+    @workers.setter
+    def workers(self, workers):
+        if not isinstance(workers, int):
+            raise TypeError("Expected < int >")
+
+        if workers < 1:
+            workers = os.cpu_count() or 1
+
+        self._workers = workers
+
+
+    @property
+    def handlers(self):
+        return self._handlers
+
+
+    @property
+    def stages(self):
+        return self._stages
+
+
+    @property
+    def archiveIndex(self):
+        return self._archiveIndex
+
+
+    @property
+    def indexFile(self):
+        if self._archiveIndex is None:
+            return ""
+        return self._archiveIndex.path
+
+    @indexFile.setter
+    def indexFile(self, indexFile):
+        """
+        ArchiveIndex database for incremental ingest, empty string disables it.
+        Archives unchanged since their last ingest are skipped without dispatching.
+        """
+        if not isinstance(indexFile, str):
+            raise TypeError("Expected < str >")
+
+        if self._archiveIndex is not None:
+            self._archiveIndex.close()
+
+        self._archiveIndex = ArchiveIndex(indexFile) if indexFile else None
+
+
+    def registerHandler(self, assetType, handler):
+        """
+        Set handler for asset type
+
+        :param assetType: < str >
+        :param handler: picklable callable(task) -> extracted folder path
+        """
+        if not callable(handler):
+            raise TypeError("Expected callable handler")
+
+        self._handlers[assetType] = handler
+
+
+    def registerStages(self, assetType, stages):
+        """
+        Set pipeline stages for asset type, used by IngestPipeline
+
+        :param assetType: < str >
+        :param stages: < IngestStages >
+        """
+        if not isinstance(stages, IngestStages):
+            raise TypeError("Expected < IngestStages >")
+
+        self._stages[assetType] = stages
+
+
+    def dispatchable(self, tasks, registry, finish):
+        """
+        Tasks to process: tasks without registered handler fail and unchanged archives
+        are skipped, both are passed to "finish" as IngestResult
+
+        :param tasks: list<IngestTask>
+        :param registry: dict { asset type: handler }
+        :param finish: callable(IngestResult)
+
+        :return: list of (handler, task)
+        """
+
+        pending = []
+
+        for task in tasks:
+            handler = registry.get(task.assetType)
+            if handler is None:
+                finish(IngestResult(task, False, error="No handler for asset type " + repr(task.assetType)))
+                continue
+
+            if self._archiveIndex is not None:
+                folder = self._archiveIndex.lookup(task.archive, task.directory, task.profile)
+                if folder:
+                    finish(IngestResult(task, True, folder=folder, skipped=True))
+                    continue
+
+            pending.append((handler, task))
+
+        return pending
+
+
+    def isArchiveName(self, filename):
+        extension = os.path.splitext(filename)[-1][1:].lower()
+        return extension in self.archiveExtensions
+
+
+    def discover(self, directory, assetType, destination, classes=None):
+        """
+        Recursively collect archives under "directory". Only file names are checked,
+        archives are not opened during discovery.
+
+        :param directory: root folder to scan
+        :param assetType: asset type of all found archives
+        :param destination: destination library folder
+        :param classes: list of classes to which assets belong
+
+        :return: list<IngestTask>
+        """
+
+        if not os.path.isdir(directory):
+            raise OSError(directory + " is not a directory")
+
+        tasks = []
+
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for f in sorted(files):
+                if not self.isArchiveName(f): continue
+                tasks.append(
+                    IngestTask(os.path.join(root, f), assetType, destination, classes,
+                               indexFile=self.indexFile, profile=self.extractionProfile,
+                               catalogueFile=self.catalogueFile, infoFiles=self.writeInfoFiles,
+                               infoFormat=self.infoFileFormat, statistics=self.computeStatistics,
+                               replaceStale=self.replaceStale)
+                )
+
+        return tasks
+
+
+    def run(self, tasks, callback=None):
+        """
+        Process tasks in a process pool sized by "workers".
+
+        :param tasks: list<IngestTask>
+        :param callback: optional callable(result) called in this process for every finished task
+
+        :return: list<IngestResult> in completion order
+        """
+
+        results = []
+
+        def finish(result):
+            results.append(result)
+            if callback: callback(result)
+
+        pending = self.dispatchable(tasks, self._handlers, finish)
+
+        if self._workers == 1:
+            for handler, task in pending:
+                finish(_runTask(handler, task))
+            return results
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            futures = {}
+            for handler, task in pending:
+                futures[executor.submit(_runTask, handler, task)] = task
+
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception:
+                    # worker died (i.e. crashed in native image code), report and continue
+                    result = IngestResult(futures[future], False, error=traceback.format_exc())
+                finish(result)
+
+        return results
+
+
+
+class IngestStages(object):
+
+    def __init__(self, read, write, analyze=None):
+        """
+        Handler of asset type split to stages of IngestPipeline:
+
+            read(task) -> (state, arguments)
+                I/O thread: read archive, extract members. "arguments" are passed
+                to "analyze", None skips analysis.
+
+            analyze(arguments) -> statistics
+                worker process: CPU bound measuring of extracted files, must be
+                picklable (module level function), arguments and result too.
+
+            write(task, state, statistics) -> (asset id, folder, info)
+                I/O thread: write asset info file, statistics is None if analysis
+                was skipped. Catalogue and archive index are recorded by pipeline.
+        """
+        super(IngestStages, self).__init__()
+
+        self.read = read
+        self.analyze = analyze
+        self.write = write
+
+
+
+class IngestPipeline(object):
+
+    def __init__(self, manager):
+        """
+        Ingest with overlapping stages: archives are read and written by I/O thread pool
+        while extracted textures of other assets are measured by process pool of
+        "manager.workers", so disks and CPUs are busy at the same time.
+
+        Back-pressure: at most "maxAssets" assets are between read and write and at most
+        two analyses per worker are queued, so memory does not grow with library size.
+        Archive index and catalogue (SQLite) are recorded by the calling thread only.
+
+        :param manager: < IngestManager > with stages registered for asset types
+        """
+        super(IngestPipeline, self).__init__()
+
+        self._manager = manager
+        self._ioWorkers = 4
+        self.maxAssets = 0      # 0: 2 * (I/O workers + workers)
+
+
+    @property
+    def ioWorkers(self):
+        return self._ioWorkers
+
+    @ioWorkers.setter
+    def ioWorkers(self, workers):
+        if not isinstance(workers, int):
+            raise TypeError("Expected < int >")
+
+        self._ioWorkers = max(1, workers)
+
+
+    @staticmethod
+    def _call(function, *args):
+        # stage result or formatted traceback, stages never raise into the pipeline
+
+        try:
+            return function(*args), ""
+        except Exception:
+            return None, traceback.format_exc()
+
+
+    def run(self, tasks, callback=None):
+        """
+        Process tasks through stages registered in manager
+
+        :param tasks: list<IngestTask>
+        :param callback: optional callable(result) called in this thread for every finished task
+
+        :return: list<IngestResult> in completion order
+        """
+
+        from Core.LibraryCatalogue import LibraryCatalogue
+
+        results = []
+        catalogues = {}
+
+        def finish(result):
+            results.append(result)
+            if callback: callback(result)
+
+        def commit(task, written):
+            assetID, folder, info = written
+            index = self._manager.archiveIndex
+            catalogue = None
+
+            if task.catalogueFile:
+                if task.catalogueFile not in catalogues:
+                    catalogues[task.catalogueFile] = LibraryCatalogue(task.catalogueFile)
+                catalogue = catalogues[task.catalogueFile]
+                catalogue.addAsset(assetID, folder, info)
+
+            if index is not None:
+                stale = index.folder(task.archive, task.directory)
+                index.record(task.archive, folder, profile=task.profile)
+                if task.replaceStale: index.discardFolder(stale, folder, catalogue)
+
+            finish(IngestResult(task, True, folder=folder))
+
+        jobs = iter(self._manager.dispatchable(tasks, self._manager.stages, finish))
+
+        workers = self._manager.workers
+        maxAssets = self.maxAssets or 2 * (self._ioWorkers + workers)
+        maxAnalyses = 2 * workers
+
+        reading = {}
+        analyzing = {}
+        writing = {}
+        waiting = collections.deque()    # read assets waiting for free analysis slot
+        suspects = collections.deque()   # analyses lost with broken process pool
+
+        # worker process dying (i.e. crash in native image code) breaks process pool and
+        # fails all its analyses. Pool is recreated when they are collected and lost
+        # analyses are run again one at a time, the one which breaks pool alone fails.
+
+        cpu = ProcessPoolExecutor(max_workers=workers)
+        broken = False
+
+        def analyze(job, alone):
+            stages, task, state, arguments = job
+
+            try:
+                analyzing[cpu.submit(stages.analyze, arguments)] = (job, alone)
+            except BrokenProcessPool:
+                (suspects if alone else waiting).appendleft(job)
+                return False
+
+            return True
+
+        with ThreadPoolExecutor(max_workers=self._ioWorkers) as io:
+            try:
+                while True:
+                    if broken and not analyzing:
+                        cpu.shutdown(wait=True)
+                        cpu = ProcessPoolExecutor(max_workers=workers)
+                        broken = False
+
+                    if not broken and suspects:
+                        if not analyzing:
+                            broken = not analyze(suspects.popleft(), True)
+
+                    elif not broken:
+                        while waiting and len(analyzing) < maxAnalyses:
+                            if not analyze(waiting.popleft(), False):
+                                broken = True
+                                break
+
+                    inFlight = len(reading) + len(analyzing) + len(writing) + len(waiting) + len(suspects)
+
+                    while inFlight < maxAssets:
+                        job = next(jobs, None)
+                        if job is None: break
+
+                        stages, task = job
+                        reading[io.submit(self._call, stages.read, task)] = (stages, task)
+                        inFlight += 1
+
+                    if not (reading or analyzing or writing):
+                        if waiting or suspects: continue
+                        break
+
+                    done, not_done = wait(list(reading) + list(analyzing) + list(writing), return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        if future in reading:
+                            stages, task = reading.pop(future)
+                            result, error = future.result()
+
+                            if error:
+                                finish(IngestResult(task, False, error=error))
+                            elif stages.analyze is None or result[1] is None:
+                                writing[io.submit(self._call, stages.write, task, result[0], None)] = task
+                            else:
+                                waiting.append((stages, task, result[0], result[1]))
+
+                        elif future in analyzing:
+                            job, alone = analyzing.pop(future)
+                            stages, task, state, arguments = job
+
+                            try:
+                                statistics = future.result()
+                            except BrokenProcessPool:
+                                broken = True
+                                if alone: finish(IngestResult(task, False, error=traceback.format_exc()))
+                                else: suspects.append(job)
+                                continue
+                            except Exception:
+                                finish(IngestResult(task, False, error=traceback.format_exc()))
+                                continue
+
+                            writing[io.submit(self._call, stages.write, task, state, statistics)] = task
+
+                        else:
+                            task = writing.pop(future)
+                            written, error = future.result()
+
+                            if error:
+                                finish(IngestResult(task, False, error=error))
+                                continue
+
+                            try:
+                                commit(task, written)
+                            except Exception:
+                                finish(IngestResult(task, False, error=traceback.format_exc()))
+            finally:
+                cpu.shutdown(wait=True)
+
+        for catalogue in catalogues.values():
+            catalogue.close()
+
+        return results
+
+
+
+if __name__ == '__main__':
+
+    # benchmark: sequential handler against pipeline with synthetic stages,
+    # I/O waits (sleep) of archive read / info write and CPU bound statistics.
+    # Stages are module level functions of test module, so they are pickled by
+    # reference with any start method. Run from repository root: python -m Core.IngestManagement
+
+    from tests.test_ingest_pipeline import benchRead, benchAnalyze, benchWrite, benchHandler
+
+    import time
+
+    manager = IngestManager()
+    manager.workers = os.cpu_count() or 1
+    manager.registerHandler("bench", benchHandler)
+    manager.registerStages("bench", IngestStages(benchRead, benchWrite, benchAnalyze))
+
+    tasks = [IngestTask("asset_%d.zip" % i, "bench", "library") for i in range(200)]
+
+    start = time.time()
+    assert all(result.success for result in manager.run(tasks))
+    print("process pool %.2f s" % (time.time() - start))
+
+    start = time.time()
+    assert all(result.success for result in IngestPipeline(manager).run(tasks))
+    print("pipeline     %.2f s" % (time.time() - start))
@@ -0,0 +1,278 @@
+from Core.Serialization import Serializer
+
+import sqlite3
+import os
+
+
+
+class CatalogueAsset(object):
+
+    __slots__ = ("id", "folder", "_data", "_info")
+
+    def __init__(self, assetID, folder, data):
+        """
+        Asset loaded from catalogue, info is decoded on first access
+
+        :param assetID: < str > asset id
+        :param folder: < str > absolute asset folder
+        :param data: < str > info JSON
+        """
+        self.id = assetID
+        self.folder = folder
+        self._data = data
+        self._info = None
+
+
+    @property
+    def info(self):
+        if self._info is None:
+            self._info = Serializer.loadsJSON(self._data)
+            self._data = None
+        return self._info
+
+
+
+class LibraryCatalogue(object):
+
+    def __init__(self, path):
+        """
+        Info of all library assets in one SQLite database, so library browser loads
+        one file instead of info.json of every asset folder. Asset info is stored as
+        compact JSON in the same layout as info.json (flat dict of QuixelParser or
+        list of info groups of QuixelBase).
+
+        Asset folders inside catalogue directory are stored relative to it, so the
+        library can be moved together with its catalogue.
+
+        Safe to share between processes: every process opens own connection,
+        database runs in WAL mode so readers do not block the writer.
+
+        :param path: < str > path to database file (i.e. <library>/library.db)
+        """
+        super(LibraryCatalogue, self).__init__()
+
+        if not isinstance(path, str):
+            raise TypeError("Expected < str >")
+
+        self._path = path
+        self._root = os.path.dirname(os.path.abspath(path))
+        self._connection = None
+        self._pid = None
+
+
+    @property
+    def path(self):
+        return self._path
+
+
+    def __len__(self):
+        return self._db().execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+
+
+    def _db(self):
+        # connection can not be shared with forked worker processes
+
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        if not os.path.exists(self._root):
+            os.makedirs(self._root)
+
+        self._connection = sqlite3.connect(self._path, timeout=60)
+        self._pid = os.getpid()
+
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS assets (id TEXT PRIMARY KEY, folder TEXT, info TEXT)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS assets_folder ON assets (folder)")
+        self._connection.commit()
+
+        return self._connection
+
+
+    def _relative(self, folder):
+        folder = os.path.abspath(folder)
+
+        try:
+            relative = os.path.relpath(folder, self._root)
+        except ValueError:
+            return folder   # other drive
+
+        if relative.startswith(os.pardir):
+            return folder
+
+        return relative.replace("\\", "/")
+
+
+    def _absolute(self, folder):
+        return os.path.normpath(os.path.join(self._root, folder))
+
+
+    @staticmethod
+    def _dumps(info):
+        return Serializer.dumpsJSON(info).decode("utf-8")
+
+
+    def addAsset(self, assetID, folder, info):
+        """
+        Add or replace asset
+
+        :param assetID: < str > asset id
+        :param folder: < str > asset folder
+        :param info: asset info (JSON serializable dict or list)
+        """
+
+        self.addAssets([(assetID, folder, info)])
+
+
+    def addAssets(self, assets):
+        """
+        Add or replace many assets in one transaction
+
+        :param assets: iterable of (assetID, folder, info)
+        """
+
+        db = self._db()
+        db.executemany(
+            "INSERT OR REPLACE INTO assets (id, folder, info) VALUES (?, ?, ?)",
+            ((str(assetID), self._relative(folder), self._dumps(info)) for assetID, folder, info in assets)
+        )
+        db.commit()
+
+
+    def removeAsset(self, assetID):
+        db = self._db()
+        db.execute("DELETE FROM assets WHERE id = ?", (str(assetID),))
+        db.commit()
+
+
+    def asset(self, assetID):
+        """
+        :param assetID: < str > asset id
+        :return: < CatalogueAsset > or None if asset is not in catalogue
+        """
+
+        row = self._db().execute("SELECT folder, info FROM assets WHERE id = ?", (str(assetID),)).fetchone()
+
+        if row is None: return None
+
+        return CatalogueAsset(str(assetID), self._absolute(row[0]), row[1])
+
+
+    def assetIDFromFolder(self, folder):
+        """
+        :param folder: < str > asset folder
+        :return: < str > id of asset extracted to folder or empty string
+        """
+
+        row = self._db().execute(
+            "SELECT id FROM assets WHERE folder = ?", (self._relative(folder),)
+        ).fetchone()
+
+        return row[0] if row else ""
+
+
+    def load(self):
+        """
+        Load whole library with one query. Info JSON is decoded lazily
+        by CatalogueAsset.info, so loading does not parse all assets at once.
+
+        :return: dict { asset_id: CatalogueAsset } in insertion order
+        """
+
+        absolute = self._absolute
+
+        return dict(
+            (assetID, CatalogueAsset(assetID, absolute(folder), info))
+            for assetID, folder, info in self._db().execute("SELECT id, folder, info FROM assets ORDER BY rowid")
+        )
+
+
+    def importLibrary(self, directory):
+        """
+        Add assets of existing library folder (asset folders with info file of any
+        Serializer format) to catalogue. Asset id is "id" of flat info or asset folder name.
+
+        :param directory: library folder
+
+        :return: < int > number of imported assets
+        """
+
+        assets = []
+
+        for name in sorted(os.listdir(directory)):
+            folder = os.path.join(directory, name)
+            path = Serializer.infoFile(folder)
+
+            if not path: continue
+
+            info = Serializer.load(path)
+
+            assetID = info.get("id", name) if isinstance(info, dict) else name
+            assets.append((assetID, folder, info))
+
+        self.addAssets(assets)
+
+        return len(assets)
+
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+        self._pid = None
+
+
+
+if __name__ == '__main__':
+
+    # benchmark: load of 40k assets from catalogue against 40k info.json files
+
+    import tempfile
+    import json
+    import time
+
+    directory = tempfile.mkdtemp()
+    count = 40000
+
+    info = {
+        "tileable": True, "width": 4096, "height": 4096, "company": ["Quixel"],
+        "class": ["nature"], "tags": ["rock", "moss", "wet", "cliff", "granite"],
+        "set": ["forest"], "region": ["Europe"], "average_color": "#7A6A5A",
+        "displacement_min": 0.1, "displacement_max": 0.9
+    }
+
+    catalogue = LibraryCatalogue(os.path.join(directory, "library.db"))
+    assets = []
+
+    for i in range(count):
+        folder = os.path.join(directory, "%06d" % i)
+        os.makedirs(folder)
+        data = dict(info, id=str(i), name="Rock_%d" % i)
+        with open(os.path.join(folder, "info.json"), "w") as f:
+            json.dump(data, f, indent=4)
+        assets.append((str(i), folder, data))
+
+    start = time.time()
+    catalogue.addAssets(assets)
+    print("write %d assets    %.2f s" % (count, time.time() - start))
+
+    start = time.time()
+    for i in range(count):
+        with open(os.path.join(directory, "%06d" % i, "info.json"), "r") as f:
+            json.load(f)
+    print("read info.json files %.2f s" % (time.time() - start))
+
+    catalogue.close()
+    catalogue = LibraryCatalogue(os.path.join(directory, "library.db"))
+
+    start = time.time()
+    library = catalogue.load()
+    print("load catalogue       %.2f s" % (time.time() - start))
+
+    start = time.time()
+    for asset in library.values(): asset.info
+    print("decode all infos     %.2f s" % (time.time() - start))
+
+    assert len(library) == count and library["5"].info["name"] == "Rock_5"
@@ -0,0 +1,502 @@
+from Core.NameConvention import NamesConventionInfo as NCInfo
+
+import bisect
+import numpy
+import re
+
+
+
+def rgbToLab(rgb):
+    """
+    Convert sRGB colors to CIE L*a*b* (D65)
+
+    :param rgb: array-like of shape (..., 3), 0-255
+    :return: numpy array of shape (..., 3)
+    """
+
+    c = numpy.asarray(rgb, dtype=numpy.float64) / 255.0
+    c = numpy.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+
+    xyz = c.dot(numpy.array([
+        [0.4124564, 0.3575761, 0.1804375],
+        [0.2126729, 0.7151522, 0.0721750],
+        [0.0193339, 0.1191920, 0.9503041]
+    ]).T) / numpy.array([0.95047, 1.0, 1.08883])
+
+    f = numpy.where(xyz > 0.008856, numpy.cbrt(xyz), 7.787 * xyz + 16.0 / 116.0)
+
+    return numpy.stack([
+        116.0 * f[..., 1] - 16.0,
+        500.0 * (f[..., 0] - f[..., 1]),
+        200.0 * (f[..., 1] - f[..., 2])
+    ], axis=-1)
+
+
+def hexToRGB(color):
+    """
+    :param color: < str > "#RRGGBB" or "RRGGBB"
+    :return: (r, g, b) or None if color is not valid
+    """
+
+    if not isinstance(color, str): return None
+
+    color = color.strip().lstrip("#")
+
+    if len(color) != 6: return None
+
+    try:
+        return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+    except ValueError:
+        return None
+
+
+
+class _RangeIndex(object):
+
+    def __init__(self):
+        """
+        Sorted (value, document) pairs, range query is two bisections
+        """
+        self._pairs = []
+        self._values = []
+        self._documents = []
+        self._sorted = True
+
+
+    def add(self, value, document):
+        self._pairs.append((value, document))
+        self._sorted = False
+
+
+    def _sort(self):
+        if self._sorted: return
+
+        self._pairs.sort()
+        self._values = [value for value, document in self._pairs]
+        self._documents = [document for value, document in self._pairs]
+        self._sorted = True
+
+
+    def between(self, low=None, high=None):
+        """
+        :return: set of documents with low <= value <= high, None bound is open
+        """
+
+        self._sort()
+
+        start = 0 if low is None else bisect.bisect_left(self._values, low)
+        end = len(self._values) if high is None else bisect.bisect_right(self._values, high)
+
+        return set(self._documents[start:end])
+
+
+    def remap(self, documents):
+        """
+        :param documents: dict { old document: new document }, documents missing in it are removed
+        """
+
+        self._pairs = [(value, documents[document]) for value, document in self._pairs if document in documents]
+        self._sorted = False
+
+
+
+class LibrarySearch(object):
+
+    # fields of inverted index, "terms" contains all of them and words of asset name
+
+    TermFields = ("tags", "categories", "classes", "groups", "sets", "regions", "companies")
+
+    # removed (or replaced) assets keep their document until index is compacted,
+    # compact() runs automatically when this fraction of documents is removed
+
+    CompactRatio = 0.25
+
+    def __init__(self):
+        """
+        In memory search index of library assets:
+            inverted indexes of tags, categories, classes, groups, sets, regions, companies
+            and free terms (all of them plus words of asset name), lower case
+            range indexes of resolution (longest side) and displacement range
+            nearest neighbour search on average color in L*a*b* space
+
+        Asset info of all layouts is accepted: flat dict of QuixelParser, info groups
+        of QuixelBase and record list of CommonFunctionality.makeDefaultRecords.
+        Displacement is indexed in 0-1 range (raw Megascans intensity of flat info is
+        divided by 256 as in QuixelBase).
+
+        Resolution is known only for flat info ("width" / "height") and records of
+        measured Quixel3D assets, info groups of QuixelBase carry none, so such assets
+        never match resolution conditions.
+
+        Index can be updated incrementally (addAsset replaces asset, removeAsset),
+        space of removed documents is reclaimed by compact().
+        """
+        super(LibrarySearch, self).__init__()
+
+        self._ids = []
+        self._removed = set()
+        self._documents = {}
+
+        self._terms = dict((field, {}) for field in self.TermFields + ("terms",))
+        self._tileable = set()
+        self._resolution = _RangeIndex()
+        self._displacementMin = _RangeIndex()
+        self._displacementMax = _RangeIndex()
+
+        # values by document, to filter small candidate sets without range index sets
+        self._resolutions = []
+        self._displacements = []
+
+        self._colors = []
+        self._lab = None
+
+
+    def __len__(self):
+        return len(self._ids) - len(self._removed)
+
+
+    @staticmethod
+    def fromCatalogue(catalogue):
+        """
+        Build index of all assets of LibraryCatalogue
+
+        :param catalogue: < LibraryCatalogue >
+        :return: < LibrarySearch >
+        """
+
+        search = LibrarySearch()
+
+        for assetID, asset in catalogue.load().items():
+            search.addAsset(assetID, asset.info)
+
+        return search
+
+
+    # **************** INFO NORMALIZATION *****************#
+
+    @staticmethod
+    def _strings(value):
+        # flatten nested lists of strings (i.e. [["rock", "moss"]])
+
+        if value is None: return []
+        if isinstance(value, str): return [value]
+
+        strings = []
+        for item in value:
+            strings.extend(LibrarySearch._strings(item))
+        return strings
+
+
+    @staticmethod
+    def fieldsFromInfo(info):
+        """
+        Normalize asset info of any layout
+
+        :param info: asset info (dict or list)
+
+        :return: dict { "name": str, "tags": [], "categories": [], "classes": [], "groups": [],
+                        "sets": [], "regions": [], "companies": [], "tileable": bool or None,
+                        "resolution": int, "displacement": (min, max) or None, "color": hex or None }
+        """
+
+        fields = dict((field, []) for field in LibrarySearch.TermFields)
+        fields.update({"name": "", "tileable": None, "resolution": 0, "displacement": None, "color": None})
+
+        strings = LibrarySearch._strings
+
+        if isinstance(info, dict):
+            fields["name"] = info.get("name", "")
+            fields["tags"] = strings(info.get("tags"))
+            fields["classes"] = strings(info.get("class"))
+            fields["sets"] = strings(info.get("set"))
+            fields["regions"] = strings(info.get("region"))
+            fields["companies"] = strings(info.get("company"))
+            fields["tileable"] = info.get("tileable")
+            fields["resolution"] = max(info.get("width") or 0, info.get("height") or 0)
+            fields["color"] = info.get("average_color")
+
+            if "displacement_min" in info or "displacement_max" in info:
+                fields["displacement"] = (
+                    (info.get("displacement_min") or 0) / 256.0,
+                    (info.get("displacement_max") or 0) / 256.0
+                )
+
+            return fields
+
+        records = []
+        for item in info or []:
+            if "records" in item:
+                records.extend(item["records"])
+            else:
+                records.append(item)
+
+        for record in records:
+            key = record.get("key") or record.get("name")
+            value = record.get("value")
+
+            if key in (NCInfo.GlobalName, "name"): fields["name"] = value or ""
+            elif key in (NCInfo.GlobalTags, "tags"): fields["tags"] = strings(value)
+            elif key in (NCInfo.GlobalCategory, "category"): fields["categories"] = strings(value)
+            elif key in (NCInfo.GlobalGroup, "group"): fields["groups"] = strings(value)
+            elif key in (NCInfo.GlobalSet, "set"): fields["sets"] = strings(value)
+            elif key in (NCInfo.RegionLocation, "region"): fields["regions"] = strings(value)
+            elif key in ("company",): fields["companies"] = strings(value)
+            elif key in ("class",): fields["classes"] = strings(value)
+            elif key in (NCInfo.TexturesTileable, "tileable"): fields["tileable"] = value
+            elif key in (NCInfo.TexturesDispRange,): fields["displacement"] = tuple(value)
+            elif key in (NCInfo.ColorAvg, "avg_color", "color_avg"): fields["color"] = value
+            elif key in ("width", "height"): fields["resolution"] = max(fields["resolution"], value or 0)
+
+        return fields
+
+
+    # **************** INDEXING *****************#
+
+    def addAsset(self, assetID, info):
+        """
+        Index asset, asset indexed before is replaced
+
+        :param assetID: < str > asset id
+        :param info: asset info (dict or list)
+        """
+
+        if assetID in self._documents:
+            self.removeAsset(assetID)
+
+        fields = self.fieldsFromInfo(info)
+        document = len(self._ids)
+
+        self._ids.append(assetID)
+        self._documents[assetID] = document
+
+        terms = set(word.lower() for word in re.split(r"[\W_]+", fields["name"]) if word)
+
+        for field in self.TermFields:
+            for value in fields[field]:
+                value = value.lower()
+                self._terms[field].setdefault(value, set()).add(document)
+                terms.add(value)
+
+        for term in terms:
+            self._terms["terms"].setdefault(term, set()).add(document)
+
+        if fields["tileable"]:
+            self._tileable.add(document)
+
+        if fields["resolution"]:
+            self._resolution.add(fields["resolution"], document)
+
+        if fields["displacement"]:
+            self._displacementMin.add(fields["displacement"][0], document)
+            self._displacementMax.add(fields["displacement"][1], document)
+
+        self._resolutions.append(fields["resolution"])
+        self._displacements.append(fields["displacement"] or (None, None))
+
+        self._colors.append(hexToRGB(fields["color"]))
+        self._lab = None
+
+
+    def removeAsset(self, assetID):
+        """
+        Remove asset from search results
+
+        :param assetID: < str > asset id
+        """
+
+        document = self._documents.pop(assetID, None)
+
+        if document is not None:
+            self._removed.add(document)
+
+            if len(self._removed) > self.CompactRatio * len(self._ids):
+                self.compact()
+
+
+    def compact(self):
+        """
+        Drop removed documents from all indexes, live documents are renumbered
+        """
+
+        if not self._removed: return
+
+        live = [document for document in range(len(self._ids)) if document not in self._removed]
+        documents = dict((old, new) for new, old in enumerate(live))
+
+        for index in self._terms.values():
+            for term in list(index):
+                remapped = set(documents[d] for d in index[term] if d in documents)
+                if remapped: index[term] = remapped
+                else: del index[term]
+
+        self._tileable = set(documents[d] for d in self._tileable if d in documents)
+
+        for index in (self._resolution, self._displacementMin, self._displacementMax):
+            index.remap(documents)
+
+        self._ids = [self._ids[d] for d in live]
+        self._documents = dict((assetID, documents[d]) for assetID, d in self._documents.items())
+        self._resolutions = [self._resolutions[d] for d in live]
+        self._displacements = [self._displacements[d] for d in live]
+        self._colors = [self._colors[d] for d in live]
+        self._lab = None
+        self._removed = set()
+
+
+    def _labColors(self):
+        if self._lab is None:
+            colors = numpy.array([c if c is not None else (0, 0, 0) for c in self._colors], dtype=numpy.float64)
+            lab = rgbToLab(colors.reshape(-1, 3)).astype(numpy.float32)
+            lab[[c is None for c in self._colors]] = numpy.nan
+            self._lab = lab
+        return self._lab
+
+
+    # **************** SEARCH *****************#
+
+    def find(self, terms=None, tileable=None, minResolution=0, maxResolution=0,
+             displacement=None, color=None, maxColorDistance=None, limit=0, **fields):
+        """
+        Search assets matching all given conditions
+
+        :param terms: list of words matched with any text field or word of asset name
+        :param tileable: < bool > tileable only if True, not tileable only if False
+        :param minResolution: < int > minimal longest texture side (i.e. 4096),
+                              assets of unknown resolution are excluded
+        :param maxResolution: < int > maximal longest texture side
+        :param displacement: (min, max) displacement range must lie within
+        :param color: < str > hex color, results are ordered by L*a*b* distance from it
+        :param maxColorDistance: < float > maximal CIE76 distance from "color"
+        :param limit: < int > maximal number of results, all if 0
+        :param fields: field=[values] of inverted index (i.e. tags=["moss"], regions=["Europe"])
+
+        :return: list of asset ids
+        """
+
+        sets = []
+
+        for field, values in [("terms", terms)] + list(fields.items()):
+            if field not in self._terms:
+                raise KeyError("Unknown search field " + field)
+
+            for value in self._strings(values):
+                sets.append(self._terms[field].get(value.lower(), set()))
+
+        if tileable is True:
+            sets.append(self._tileable)
+
+        if sets:
+            sets.sort(key=len)
+            documents = sets[0] & sets[1] if len(sets) > 1 else set(sets[0])
+            for other in sets[2:]:
+                if not documents: break
+                documents &= other
+
+            # range conditions filter candidates, cheaper than building range sets
+
+            if minResolution or maxResolution:
+                resolutions = self._resolutions
+                documents = set(
+                    document for document in documents
+                    if resolutions[document] and resolutions[document] >= minResolution
+                    and (not maxResolution or resolutions[document] <= maxResolution)
+                )
+
+            if displacement is not None:
+                displacements = self._displacements
+                documents = set(
+                    document for document in documents
+                    if displacements[document][0] is not None
+                    and displacements[document][0] >= displacement[0]
+                    and displacements[document][1] <= displacement[1]
+                )
+
+        else:
+            documents = None
+
+            if minResolution or maxResolution:
+                documents = self._resolution.between(minResolution or None, maxResolution or None)
+
+            if displacement is not None:
+                within = self._displacementMin.between(displacement[0], None)
+                within &= self._displacementMax.between(None, displacement[1])
+                documents = within if documents is None else documents & within
+
+            if documents is None:
+                documents = set(range(len(self._ids)))
+
+        if tileable is False:
+            documents -= self._tileable
+
+        documents -= self._removed
+
+        if color is None:
+            documents = sorted(documents)
+            if limit: documents = documents[:limit]
+            return [self._ids[document] for document in documents]
+
+        rgb = hexToRGB(color)
+        if rgb is None:
+            raise ValueError("Invalid color " + repr(color))
+
+        documents = numpy.fromiter(documents, dtype=numpy.int64, count=len(documents))
+        distances = numpy.sqrt(((self._labColors()[documents] - rgbToLab(rgb)) ** 2).sum(axis=1))
+
+        valid = ~numpy.isnan(distances)
+        if maxColorDistance is not None:
+            valid &= distances <= maxColorDistance
+
+        documents = documents[valid]
+        distances = distances[valid]
+
+        if limit and len(documents) > limit:
+            nearest = numpy.argpartition(distances, limit - 1)[:limit]
+            documents = documents[nearest]
+            distances = distances[nearest]
+
+        order = numpy.argsort(distances, kind="stable")
+
+        return [self._ids[document] for document in documents[order]]
+
+
+
+if __name__ == '__main__':
+
+    # benchmark: "tileable rock surfaces near #7a6a5a at >= 4K" over 100k assets
+
+    import random
+    import time
+
+    random.seed(1)
+    count = 100000
+
+    words = ["rock", "moss", "wood", "concrete", "sand", "grass", "bark", "metal", "brick", "soil"]
+    types = ["surface", "3d", "3dplant", "atlas"]
+
+    search = LibrarySearch()
+
+    start = time.time()
+    for i in range(count):
+        search.addAsset(str(i), {
+            "id": str(i),
+            "name": "%s_%s_s%d_%dK_%s_ms" % (
+                random.choice(words).capitalize(), random.choice(words).capitalize(),
+                i, random.choice([1, 2, 4, 8]), random.choice(types)),
+            "tileable": random.random() < 0.5,
+            "width": random.choice([1024, 2048, 4096, 8192]),
+            "height": 4096,
+            "tags": random.sample(words, 3),
+            "region": [random.choice(["Europe", "Asia", "Oceania"])],
+            "displacement_min": random.randint(0, 100),
+            "displacement_max": random.randint(100, 255),
+            "average_color": "#%02x%02x%02x" % tuple(random.randint(0, 255) for _ in range(3))
+        })
+    print("index %d assets %.2f s" % (count, time.time() - start))
+
+    search.find(color="#000000", limit=1)   # builds color array
+
+    start = time.time()
+    for _ in range(100):
+        found = search.find(terms=["rock", "surface"], tileable=True, minResolution=4096,
+                            color="#7a6a5a", limit=20)
+    print("query %.2f ms, %d results, nearest %s" % ((time.time() - start) * 10, len(found), found[:3]))
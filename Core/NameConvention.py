@@ -1,52 +1,54 @@
-class NamesConventionTextures(object):
-    AO              = "ao"
-    Albedo          = "albedo"
-    Cavity          = "cavity"
-    Displacement    = "displacement"
-    Glossiness      = "glossiness"
-    NormalDetail    = "normal_detail"
-    Normal          = "normal"
-    Roughness       = "roughness"
-    Metal           = "metal"
-    Specular        = "specular"
-    Mask            = "mask"
-    SSS             = "sss"
-    Opacity         = "opacity"
-    IOR             = "ior"
-
-
-class NamesConventionInfo(object):
-    GroupGlobal = "Globals"
-    GlobalSet       = "Set"
-    GlobalTags      = "Tags"
-    GlobalGroup     = "Group"
-    GlobalCategory  = "Categories"
-    GlobalName      = "Name"
-
-    GroupMesh = "Meshes"
-    MeshPointCount  = "Point count"
-    MeshPolyCount   = "Polygon count"
-    MeshLODs        = "LOD count"
-
-    GroupSize = "Size"
-    SizeX       = "Size X"
-    SizeY       = "Size Y"
-    SizeZ       = "Size Z"
-
-    GroupBound = "Bound"
-    BoundMin    = "Minimum"
-    BoundMax    = "Maximum"
-
-    GroupColor = "Color"
-    ColorAvg    = "Average color"
-    ColorColors = "Colors"
-
-    GroupRegion = "Region"
-    RegionLocation = "Location"
-
-    GroupTextures = "Textures"
-    TexturesTileable    = "Tileable"
-    TexturesDispRange   = "Displacement range"
-    TexturesAtlas       = "Atlas"
-
-
+class NamesConventionTextures(object):
+    AO              = "ao"
+    Albedo          = "albedo"
+    Cavity          = "cavity"
+    Displacement    = "displacement"
+    Glossiness      = "glossiness"
+    NormalDetail    = "normal_detail"
+    Normal          = "normal"
+    Roughness       = "roughness"
+    Metal           = "metal"
+    Specular        = "specular"
+    Mask            = "mask"
+    SSS             = "sss"
+    Opacity         = "opacity"
+    IOR             = "ior"
+
+
+class NamesConventionInfo(object):
+    GroupGlobal = "Globals"
+    GlobalSet       = "Set"
+    GlobalTags      = "Tags"
+    GlobalGroup     = "Group"
+    GlobalCategory  = "Categories"
+    GlobalName      = "Name"
+
+    GroupMesh = "Meshes"
+    MeshPointCount  = "Point count"
+    MeshPolyCount   = "Polygon count"
+    MeshLODs        = "LOD count"
+    MeshUnits       = "Units"
+
+    GroupSize = "Size"
+    SizeX       = "Size X"
+    SizeY       = "Size Y"
+    SizeZ       = "Size Z"
+
+    GroupBound = "Bound"
+    BoundMin    = "Minimum"
+    BoundMax    = "Maximum"
+
+    GroupColor = "Color"
+    ColorAvg    = "Average color"
+    ColorColors = "Colors"
+
+    GroupRegion = "Region"
+    RegionLocation = "Location"
+
+    GroupTextures = "Textures"
+    TexturesTileable    = "Tileable"
+    TexturesDispRange   = "Displacement range"
+    TexturesAtlas       = "Atlas"
+
+    GroupProxies = "Proxies"
+    ProxiesThumbnail    = "Thumbnail"
@@ -0,0 +1,382 @@
+from __future__ import print_function
+
+from Core.ImageProcessing import ImageProcessor, ImageFormats, ColorModes
+from Core.InfoFileManagement import InfoRecord
+from Core.Serialization import Serializer
+from Core.NameConvention import NamesConventionInfo as NCInfo
+from Core.NameConvention import NamesConventionTextures as NCTextures
+from Core.ImageHeader import ImageHeader
+
+from PIL import Image as PILImage
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import traceback
+import math
+import os
+
+
+
+def _makeProxies(source, targets, quality):
+    """
+    Worker: decode source once at reduced resolution and write proxies from
+    the largest to the smallest, each one resized from the previous.
+
+    :param source: path to texture
+    :param targets: dict { size: proxy path }
+    :param quality: < int > jpeg quality
+
+    :return: (source, error) error is empty string on success
+    """
+
+    processor = ImageProcessor()
+
+    try:
+        processor.imageFile = source
+        processor.openReduced(max(targets))
+
+        if processor.mode() not in (ColorModes.RGB, ColorModes.L):
+            processor.convertTo(ColorModes.RGB)
+
+        for size in sorted(targets, reverse=True):
+            directory, filename = os.path.split(targets[size])
+            if not os.path.exists(directory):
+                os.makedirs(directory, exist_ok=True)
+
+            processor.resize(size, size)
+            processor.save(directory, os.path.splitext(filename)[0], ImageFormats.JPEG, quality=quality)
+
+        return source, ""
+    except Exception:
+        return source, traceback.format_exc()
+    finally:
+        processor.close()
+
+
+
+def _makeContactSheet(source, targets, quality, maps):
+    """
+    Worker: contact sheet thumbnail, grid of square cells with preview in the
+    first one and texture maps in the following ones. Every image is decoded
+    at reduced resolution of its cell. Map which can not be read leaves its
+    cell black (its own proxies report the error), unreadable preview fails.
+
+    :param source: path to preview
+    :param targets: dict { size: thumbnail path } size is width of sheet
+    :param quality: < int > jpeg quality
+    :param maps: list of texture paths
+
+    :return: (source, error) error is empty string on success
+    """
+
+    size = max(targets)
+    paths = [source] + list(maps)
+
+    columns = int(math.ceil(math.sqrt(len(paths))))
+    rows = int(math.ceil(len(paths) / float(columns)))
+    cell = size // columns
+
+    sheet = PILImage.new(ColorModes.RGB, (columns * cell, rows * cell))
+
+    try:
+        for i, path in enumerate(paths):
+            processor = ImageProcessor()
+
+            try:
+                processor.imageFile = path
+                processor.openReduced(cell)
+                processor.convertTo(ColorModes.RGB)
+                processor.resize(cell, cell)
+                sheet.paste(processor.image(), ((i % columns) * cell, (i // columns) * cell))
+            except Exception:
+                if path == source: raise
+            finally:
+                processor.close()
+
+        directory = os.path.dirname(targets[size])
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        sheet.save(targets[size], "JPEG", optimize=True, quality=quality)
+
+        return source, ""
+    except Exception:
+        return source, traceback.format_exc()
+    finally:
+        sheet.close()
+
+
+
+class ProxyGenerator(object):
+
+    def __init__(self):
+        """
+        Generate reduced proxies of extracted textures (i.e. for DCC viewports) and
+        contact sheet thumbnail of asset: grid of preview and texture maps listed in
+        "contactSheetMaps" which the asset has, preview alone if it has none of them.
+        Proxies are written to "proxies" folder of asset, paths relative to asset
+        folder are recorded in its info file.
+
+        Textures are processed in process pool, every worker holds one image decoded
+        at the largest proxy resolution (JPEG DCT scaling), and number of queued
+        textures is bounded, so memory does not grow with library size.
+        """
+        super(ProxyGenerator, self).__init__()
+
+        self.sizes = [2048, 1024, 512]
+        self.thumbnailSize = 256
+        self.contactSheetMaps = [NCTextures.Albedo, NCTextures.Normal, NCTextures.Roughness, NCTextures.Displacement]
+        self.quality = 90
+        self.directoryName = "proxies"
+        self.previewName = "preview"
+        self.textureDirectories = ["", "textures"]
+        self.textureExtensions = [
+            ImageFormats.JPG, ImageFormats.JPEG, ImageFormats.PNG,
+            ImageFormats.TIF, ImageFormats.TIFF, ImageFormats.TGA
+        ]
+
+        # Core.LibraryCatalogue.LibraryCatalogue, if set proxies are recorded in it too
+        self.catalogue = None
+
+        self._workers = os.cpu_count() or 1
+
+
+    @property
+    def workers(self):
+        return self._workers
+
+    @workers.setter
+    def workers(self, workers):
+        if not isinstance(workers, int):
+            raise TypeError("Expected < int >")
+
+        self._workers = workers if workers > 0 else (os.cpu_count() or 1)
+
+
+    def _proxyPath(self, folder, name, size):
+        return os.path.join(folder, self.directoryName, "%s_%d.%s" % (name, size, ImageFormats.JPEG))
+
+
+    @staticmethod
+    def _isUpToDate(source, target):
+        return os.path.isfile(target) and os.path.getmtime(target) >= os.path.getmtime(source)
+
+
+    def sources(self, folder):
+        """
+        Textures and preview of asset folder
+
+        :param folder: asset folder
+        :return: list of (name, path, sizes) where name is texture file name without
+                 extension and sizes are proxy sizes to generate
+        """
+
+        sources = []
+
+        for subdir in self.textureDirectories:
+            directory = os.path.join(folder, subdir)
+            if not os.path.isdir(directory): continue
+
+            for f in sorted(os.listdir(directory)):
+                name, extension = os.path.splitext(f)
+                if extension[1:] not in self.textureExtensions: continue
+
+                path = os.path.join(directory, f)
+
+                if name == self.previewName:
+                    sources.append((NCInfo.ProxiesThumbnail.lower(), path, [self.thumbnailSize]))
+                    continue
+
+                # proxies are never bigger than source
+
+                size = ImageHeader.sizeFromFile(path)
+                longest = max(size) if size else 0
+                sizes = [s for s in self.sizes if not longest or s < longest]
+
+                if sizes:
+                    sources.append((name, path, sizes))
+
+        return sources
+
+
+    def contactSheetSources(self, folder):
+        """
+        Texture maps of asset folder shown in contact sheet thumbnail
+
+        :param folder: asset folder
+        :return: list of texture paths in order of "contactSheetMaps"
+        """
+
+        found = {}
+
+        for subdir in self.textureDirectories:
+            directory = os.path.join(folder, subdir)
+            if not os.path.isdir(directory): continue
+
+            for f in sorted(os.listdir(directory)):
+                name, extension = os.path.splitext(f)
+                if extension[1:] not in self.textureExtensions: continue
+
+                found.setdefault(name.lower(), os.path.join(directory, f))
+
+        return [found[name] for name in self.contactSheetMaps if name in found]
+
+
+    def jobs(self, folder):
+        """
+        Proxies of asset folder which are missing or older than their texture,
+        thumbnail is also outdated by any texture of its contact sheet
+
+        :param folder: asset folder
+        :return: (jobs, proxies) jobs: list of (source, { size: path }, maps) to generate,
+                 maps are texture paths of contact sheet (empty for texture proxies),
+                 proxies: dict { name: [relative proxy paths] } of all proxies
+        """
+
+        jobs = []
+        proxies = {}
+
+        for name, source, sizes in self.sources(folder):
+            maps = self.contactSheetSources(folder) if name == NCInfo.ProxiesThumbnail.lower() else []
+            targets = {}
+
+            for size in sizes:
+                target = self._proxyPath(folder, name, size)
+                proxies.setdefault(name, []).append(os.path.relpath(target, folder).replace("\\", "/"))
+
+                if not all(self._isUpToDate(path, target) for path in [source] + maps):
+                    targets[size] = target
+
+            if targets:
+                jobs.append((source, targets, maps))
+
+        return jobs, proxies
+
+
+    @staticmethod
+    def _infoWithProxies(info, proxies):
+        if isinstance(info, dict):
+            info["proxies"] = proxies
+            return info
+
+        records = []
+        for name in sorted(proxies):
+            record = InfoRecord(str(name))
+            record.setValueStringList(proxies[name])
+            records.append(record.toDict())
+
+        info = [group for group in info if group.get("group") != NCInfo.GroupProxies]
+        info.append({"group": NCInfo.GroupProxies, "records": records})
+
+        return info
+
+
+    @staticmethod
+    def existingProxies(folder, proxies):
+        """
+        :param proxies: dict { name: [relative proxy paths] }
+        :return: proxies without paths of missing files, names without any proxy are removed
+        """
+
+        existing = {}
+
+        for name, paths in proxies.items():
+            paths = [p for p in paths if os.path.isfile(os.path.join(folder, p))]
+            if paths: existing[name] = paths
+
+        return existing
+
+
+    def recordProxies(self, folder, proxies):
+        """
+        Write proxy paths into info file of asset and to catalogue if it is set.
+        Flat info (dict) gets "proxies" key, info groups (list) get "Proxies" group
+        with one string list record per texture. Only proxies written to disk are recorded.
+        """
+
+        proxies = self.existingProxies(folder, proxies)
+        path = Serializer.infoFile(folder)
+
+        if path:
+            Serializer.save(self._infoWithProxies(Serializer.load(path), proxies), path)
+
+        if self.catalogue is not None:
+            assetID = self.catalogue.assetIDFromFolder(folder)
+
+            if assetID:
+                asset = self.catalogue.asset(assetID)
+                self.catalogue.addAsset(assetID, folder, self._infoWithProxies(asset.info, proxies))
+
+
+    def process(self, folders, callback=None):
+        """
+        Generate proxies for asset folders and record them in info file
+
+        :param folders: list of asset folders
+        :param callback: optional callable(source, error) called for every processed texture
+
+        :return: list of (source, error) for failed textures
+        """
+
+        failed = []
+        remaining = {}
+        proxies = {}
+        queue = []
+
+        for folder in folders:
+            jobs, proxies[folder] = self.jobs(folder)
+            remaining[folder] = len(jobs)
+            queue.extend((folder, source, targets, maps) for source, targets, maps in jobs)
+
+            if not jobs:
+                self.recordProxies(folder, proxies[folder])
+
+        def finish(folder, source, targets, error):
+            if error:
+                failed.append((source, error))
+
+                # proxies of failed texture are not recorded, even older ones left on disk
+                paths = set(os.path.relpath(target, folder).replace("\\", "/") for target in targets.values())
+                for name in list(proxies[folder]):
+                    proxies[folder][name] = [p for p in proxies[folder][name] if p not in paths]
+
+            if callback: callback(source, error)
+
+            remaining[folder] -= 1
+            if not remaining[folder]:
+                self.recordProxies(folder, proxies[folder])
+
+        def job(source, targets, maps):
+            if maps:
+                return _makeContactSheet, (source, targets, self.quality, maps)
+            return _makeProxies, (source, targets, self.quality)
+
+        if self._workers == 1:
+            for folder, source, targets, maps in queue:
+                worker, args = job(source, targets, maps)
+                finish(folder, source, targets, worker(*args)[1])
+            return failed
+
+        maxPending = self._workers * 2
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            pending = {}
+            jobs = iter(queue)
+
+            while True:
+                for folder, source, targets, maps in jobs:
+                    worker, args = job(source, targets, maps)
+                    pending[executor.submit(worker, *args)] = (folder, source, targets)
+                    if len(pending) >= maxPending: break
+
+                if not pending: break
+
+                done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    folder, source, targets = pending.pop(future)
+                    try:
+                        error = future.result()[1]
+                    except Exception:
+                        error = traceback.format_exc()
+                    finish(folder, source, targets, error)
+
+        return failed
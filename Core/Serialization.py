@@ -0,0 +1,247 @@
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+
+
+class SerializationFormats(object):
+    JSON    = "json"
+    MSGPACK = "msgpack"
+    CBOR    = "cbor"
+
+
+
+class Serializer(object):
+
+    # Serialization of info and catalogue data. Compact JSON for machines uses the
+    # fastest installed backend: orjson, ujson, then stdlib json. Indented JSON for
+    # humans is always written by stdlib json (4 spaces, ASCII escaped as former
+    # info files), so files do not depend on installed packages.
+    # Binary formats need msgpack or cbor2 package.
+    # All dumps return bytes (UTF-8 for JSON), loads accept bytes or str.
+
+    # info file name of asset folder by format
+    InfoFileNames = {
+        SerializationFormats.JSON: "info.json",
+        SerializationFormats.MSGPACK: "info.msgpack",
+        SerializationFormats.CBOR: "info.cbor"
+    }
+
+    Extensions = {
+        ".json": SerializationFormats.JSON,
+        ".msgpack": SerializationFormats.MSGPACK,
+        ".cbor": SerializationFormats.CBOR
+    }
+
+
+    @staticmethod
+    def jsonBackend():
+        """
+        :return: < str > name of JSON backend module
+        """
+        if orjson is not None: return "orjson"
+        if ujson is not None: return "ujson"
+        return "json"
+
+
+    @staticmethod
+    def availableFormats():
+        formats = [SerializationFormats.JSON]
+        if msgpack is not None: formats.append(SerializationFormats.MSGPACK)
+        if cbor2 is not None: formats.append(SerializationFormats.CBOR)
+        return formats
+
+
+    @staticmethod
+    def _jsonDefault(value):
+        # numpy values (i.e. image statistics)
+
+        if hasattr(value, "tolist"):
+            return value.tolist()
+
+        raise TypeError("Object of type %s is not JSON serializable" % type(value).__name__)
+
+
+    @staticmethod
+    def dumpsJSON(obj, compact=True):
+        if not compact:
+            return json.dumps(obj, indent=4, ensure_ascii=True, default=Serializer._jsonDefault).encode("utf-8")
+
+        if orjson is not None:
+            # numpy values and int keys as stdlib json does
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+        if ujson is not None:
+            return ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=Serializer._jsonDefault).encode("utf-8")
+
+
+    @staticmethod
+    def loadsJSON(data):
+        if isinstance(data, bytes) and data.startswith(b"\xef\xbb\xbf"):
+            data = data[3:]
+        elif isinstance(data, str) and data.startswith(u"\ufeff"):
+            data = data[1:]
+
+        if orjson is not None:
+            return orjson.loads(data)
+
+        if ujson is not None:
+            return ujson.loads(data)
+
+        return json.loads(data)
+
+
+    @staticmethod
+    def dumps(obj, format=SerializationFormats.JSON, compact=True):
+        """
+        :param obj: JSON serializable object
+        :param format: SerializationFormats
+        :param compact: < bool > JSON without indentation
+        :return: < bytes >
+        """
+
+        if format == SerializationFormats.JSON:
+            return Serializer.dumpsJSON(obj, compact)
+
+        if format == SerializationFormats.MSGPACK:
+            if msgpack is None: raise ImportError("msgpack is not installed")
+            return msgpack.packb(obj, use_bin_type=True)
+
+        if format == SerializationFormats.CBOR:
+            if cbor2 is None: raise ImportError("cbor2 is not installed")
+            return cbor2.dumps(obj)
+
+        raise ValueError("Unknown serialization format " + str(format))
+
+
+    @staticmethod
+    def loads(data, format=SerializationFormats.JSON):
+        if format == SerializationFormats.JSON:
+            return Serializer.loadsJSON(data)
+
+        if format == SerializationFormats.MSGPACK:
+            if msgpack is None: raise ImportError("msgpack is not installed")
+            return msgpack.unpackb(data, raw=False)
+
+        if format == SerializationFormats.CBOR:
+            if cbor2 is None: raise ImportError("cbor2 is not installed")
+            return cbor2.loads(data)
+
+        raise ValueError("Unknown serialization format " + str(format))
+
+
+    @staticmethod
+    def formatFromPath(path):
+        """
+        :return: format by file extension, JSON for unknown extensions
+        """
+        return Serializer.Extensions.get(os.path.splitext(path)[1].lower(), SerializationFormats.JSON)
+
+
+    @staticmethod
+    def save(obj, path, format=None, compact=False):
+        """
+        :param format: SerializationFormats, from file extension if None
+        :param compact: < bool > JSON without indentation
+        """
+
+        data = Serializer.dumps(obj, format or Serializer.formatFromPath(path), compact)
+
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+    @staticmethod
+    def load(path, format=None):
+        """
+        :param format: SerializationFormats, from file extension if None
+        """
+
+        with open(path, "rb") as f:
+            data = f.read()
+
+        return Serializer.loads(data, format or Serializer.formatFromPath(path))
+
+
+    @staticmethod
+    def infoFileName(format=SerializationFormats.JSON):
+        return Serializer.InfoFileNames[format]
+
+
+    @staticmethod
+    def infoFile(folder):
+        """
+        :param folder: asset folder
+        :return: path to existing info file of any format (info.json first) or empty string
+        """
+
+        for format in (SerializationFormats.JSON, SerializationFormats.MSGPACK, SerializationFormats.CBOR):
+            path = os.path.join(folder, Serializer.InfoFileNames[format])
+            if os.path.isfile(path):
+                return path
+
+        return ""
+
+
+
+if __name__ == '__main__':
+
+    # benchmark: serialize and parse info of 100k catalogue assets
+
+    import random
+    import time
+
+    random.seed(1)
+    count = 100000
+
+    words = ["rock", "moss", "wood", "concrete", "sand", "grass", "bark", "metal", "brick", "soil"]
+
+    infos = [
+        {
+            "id": str(i), "name": "Rock_%d" % i, "tileable": True, "width": 4096, "height": 4096,
+            "company": ["Quixel"], "class": ["nature"], "tags": random.sample(words, 5),
+            "set": ["forest"], "region": ["Europe"], "average_color": "#7A6A5A",
+            "displacement_min": 10, "displacement_max": 200,
+            "proxies": {"albedo": ["proxies/albedo_2048.jpeg", "proxies/albedo_1024.jpeg"]}
+        }
+        for i in range(count)
+    ]
+
+    def measure(name, dumps, loads):
+        start = time.time()
+        data = [dumps(info) for info in infos]
+        dumped = time.time() - start
+
+        start = time.time()
+        for d in data: loads(d)
+        loaded = time.time() - start
+
+        print("%-16s dumps %.2f s  loads %.2f s  %5.1f MB" % (name, dumped, loaded, sum(len(d) for d in data) / 1e6))
+
+    measure("json indent=4", lambda o: json.dumps(o, indent=4), json.loads)
+    measure("json compact", lambda o: json.dumps(o, separators=(",", ":")), json.loads)
+    measure(Serializer.jsonBackend() + " compact", Serializer.dumpsJSON, Serializer.loadsJSON)
+
+    for format in Serializer.availableFormats()[1:]:
+        measure(format, lambda o: Serializer.dumps(o, format), lambda d: Serializer.loads(d, format))
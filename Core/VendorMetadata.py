@@ -0,0 +1,208 @@
+class VendorSchema(object):
+
+    def __init__(self, name, tables, fields):
+        """
+        Where vendor asset JSON stores its values
+
+        :param name: < str > vendor name (i.e. "megascans")
+        :param tables: dict { list key: item key } lists of records indexed by one
+                       of their keys (i.e. { "meta": "key" } indexes
+                       [{"key": "tileable", "value": true}, ...] by "key")
+        :param fields: dict { field: path } path is tuple of keys, table name is followed
+                       by item key (i.e. ("meta", "tileable", "value"), ("environment", "region"))
+        """
+        super(VendorSchema, self).__init__()
+
+        self.name = name
+        self.tables = tables
+        self.fields = fields
+
+
+
+MegascansSchema = VendorSchema(
+    name="megascans",
+    tables={
+        "meta": "key",
+        "components": "type",
+        "meshes": "type"
+    },
+    fields={
+        "tags": ("tags",),
+        "biome": ("environment", "biome"),
+        "region": ("environment", "region"),
+        "averageColor": ("averageColor",),
+        "tileable": ("meta", "tileable", "value"),
+        "texelDensity": ("meta", "texelDensity", "value"),
+        "displacementMin": ("components", "displacement", "minIntensity"),
+        "displacementMax": ("components", "displacement", "maxIntensity")
+    }
+)
+
+
+
+class VendorMetadata(object):
+
+    # schemas by vendor name, other vendors (i.e. Poliigon) register their VendorSchema
+
+    schemas = {MegascansSchema.name: MegascansSchema}
+
+
+    def __init__(self, data, schema=MegascansSchema):
+        """
+        Vendor asset JSON indexed once: every table list of schema becomes dict
+        { item key: [items] }, so every field is one lookup instead of scan of list.
+        Values are returned as stored by vendor, conversions are done by callers.
+
+        :param data: loaded vendor JSON (dict)
+        :param schema: < VendorSchema > or vendor name
+        """
+        super(VendorMetadata, self).__init__()
+
+        if isinstance(schema, str):
+            schema = self.schemas[schema]
+
+        self._data = data if isinstance(data, dict) else {}
+        self._schema = schema
+        self._tables = {}
+
+        for table, key in schema.tables.items():
+            index = {}
+            items = self._data.get(table)
+
+            if isinstance(items, list):
+                for item in items:
+                    if isinstance(item, dict) and key in item:
+                        index.setdefault(item[key], []).append(item)
+
+            self._tables[table] = index
+
+
+    @staticmethod
+    def registerSchema(schema):
+        """
+        :param schema: < VendorSchema >
+        """
+
+        if not isinstance(schema, VendorSchema):
+            raise TypeError("Expected < VendorSchema >")
+
+        VendorMetadata.schemas[schema.name] = schema
+
+
+    @staticmethod
+    def fromData(data, schema=MegascansSchema):
+        """
+        :param data: loaded vendor JSON or < VendorMetadata >
+        :return: < VendorMetadata > data itself if it is already indexed
+        """
+
+        if isinstance(data, VendorMetadata):
+            return data
+
+        return VendorMetadata(data, schema)
+
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def schema(self):
+        return self._schema
+
+
+    def __bool__(self):
+        return bool(self._data)
+
+    __nonzero__ = __bool__
+
+
+    def items(self, table, key):
+        """
+        :param table: < str > table name of schema (i.e. "meshes")
+        :param key: item key (i.e. "lod")
+        :return: list of items in vendor order
+        """
+        return self._tables[table].get(key, [])
+
+
+    def value(self, field, default=None):
+        """
+        :param field: < str > field of schema (i.e. "tileable")
+        :param default: returned if value is missing
+        :return: value as stored in vendor JSON
+        """
+
+        path = self._schema.fields[field]
+
+        if path[0] in self._tables:
+            items = self._tables[path[0]].get(path[1])
+            if not items: return default
+
+            value = items[0]
+            path = path[2:]
+        else:
+            value = self._data
+
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                return default
+            value = value[key]
+
+        return value
+
+
+    def values(self):
+        """
+        :return: dict { field: value } of all fields present in vendor JSON
+        """
+
+        missing = object()
+        values = {}
+
+        for field in self._schema.fields:
+            value = self.value(field, missing)
+            if value is not missing:
+                values[field] = value
+
+        return values
+
+
+    def tileable(self):
+        """
+        :return: < bool > tileable value, "true" strings are accepted
+        """
+
+        tileable = self.value("tileable", False)
+
+        if isinstance(tileable, str):
+            return tileable.lower() == "true"
+
+        return bool(tileable)
+
+
+    def displacementRange(self):
+        """
+        :return: (min, max) raw vendor intensity or None if there is no displacement
+        """
+
+        minimum = self.value("displacementMin")
+        maximum = self.value("displacementMax")
+
+        if minimum is None or maximum is None:
+            return None
+
+        return minimum, maximum
+
+
+    def texelDensity(self):
+        """
+        :return: < int > texel density digits of "texelDensity" value (i.e. "1,024 px/m") or None
+        """
+
+        value = self.value("texelDensity")
+        if value is None: return None
+
+        digits = "".join(s for s in str(value).replace(",", ".") if s in "0123456789")
+
+        return int(digits) if digits else None
@@ -1,335 +1,457 @@
-
-import Quixel.quixel_base
-import zipfile as ZF
-import os
-
-
-class Quixel3D(Quixel.quixel_base.QuixelBase):
-
-    def __init__(self):
-        super(Quixel3D, self).__init__()
-
-        self.constraints = {
-            "textureLODs": ["LOD0"]
-        }
-
-
-
-    def isAlphaBrush(self, string):
-        """
-        Parse string to find if its alpha brush.
-        :param string:
-        :return: bool
-        """
-
-        return string.find("Brush") != -1
-
-
-
-    def isHiresGeometry(self, string):
-        """
-        Parse string and try to find if its hires geo.
-        :param string:
-        :return: bool
-        """
-
-        if not self.isGeometry(string): return False
-        return string.find("High") != -1
-
-
-
-    def getValueFromJSONInfoTexelDensity(self, jsondata):
-        """
-        Extract texel density
-
-        :param jsondata: data from Quixel .json file
-        :return: dict
-        """
-
-        records = []
-
-        for record in jsondata['meta']:
-            if record["key"] == "texelDensity":
-                value = ""
-                for s in record["value"].replace(",", "."):
-                    if s in "0123456789":
-                        value += s
-                value = int(value)
-
-                records.append(
-                    {
-                        "key": "texel_density",
-                        "name": "Texel density",
-                        "type": "int",
-                        "value": value
-                    }
-                )
-                break
-
-        return records
-
-
-
-    def mapGeometryFromZip(self, zipobj):
-        """
-        Create list of dicts for each geometry in zip archive
-        (i.e.
-        [
-            {
-                "name": "Billboard_LOD0_ms.fbx",
-                "lod": "LOD1"
-                "ext": ".fbx"
-            },
-            ...
-        ]
-        :param zipobj: zipfile.ZipFile() object
-        :return: list
-        """
-        if not isinstance(zipobj, ZF.ZipFile):
-            raise TypeError("Expect zipfile.ZipFile() object")
-
-        namesMap = []
-
-        for name in zipobj.namelist():
-
-            if not self.isGeometry(name): continue
-            if self.isHiresGeometry(name): continue
-
-            namesMap.append(
-                {
-                    "name": name,
-                    "lod": self.LODFromString(name, caseSense=True),
-                    "ext": os.path.splitext(name)[-1]
-                }
-            )
-
-        return namesMap
-
-
-
-    def mapTexturesFromZip(self, zipobj):
-        """
-        Create list of dicts for each required texture in zip archive
-        (i.e.
-        [
-            {
-                "type": "albedo",
-                "name": "olzmD_4K_Albedo.jpg",
-                "ext": ".jpg"
-
-            }
-            ...
-        ]
-        :param zipobj: zipfile.ZipFile() object
-        :return: list
-        """
-        if not isinstance(zipobj, ZF.ZipFile):
-            raise TypeError("Expect zipfile.ZipFile() object")
-
-        namesMap = []
-
-        for name in zipobj.namelist():
-
-            ext = os.path.splitext(name)[-1]
-
-            texture_type = self.textureTypeFromString(name, 3)
-
-            if self.LODFromString(name) not in ("", "LOD0"): continue
-
-            if not texture_type: continue
-
-            namesMap.append(
-                {
-                    "name": name,
-                    "type": texture_type,
-                    "ext": ext
-                }
-            )
-
-        return namesMap
-
-
-
-    def makeGeometryRecords(self, jsondata):
-        """
-        Extract meshes LOD and triangles count
-
-        :param jsondata: data from Quixel .json file
-        :return: list
-        """
-        meshes = jsondata["meshes"]
-        records = []
-        for record in meshes:
-            if record["type"] != "lod": continue
-            lod = self.LODFromString(record["uris"][0]["uri"])
-            tris = record["tris"]
-            records.append(
-                {
-                    "key": lod.lower(),
-                    "name": lod,
-                    "type": "int",
-                    "value": tris
-                }
-            )
-        return records
-
-
-
-    def makeBoundRecords(self, jsondata):
-        """
-        Extract meshes LOD and triangles count
-
-        :param jsondata: data from Quixel .json file
-        :return: list
-        """
-        meshes = jsondata["meshes"]
-        records = []
-        for record in meshes:
-            if record["type"] != "lod": continue
-            lod = self.LODFromString(record["uris"][0]["uri"])
-            tris = record["tris"]
-            records.append(
-                {
-                    "key": lod.lower(),
-                    "name": lod,
-                    "type": "int",
-                    "value": tris
-                }
-            )
-        return records
-
-
-
-    def makeTextureRecords(self, jsondata):
-        """
-        Extract meshes LOD and triangles count
-
-        :param jsondata: data from Quixel .json file
-        :return: list
-        """
-        meshes = jsondata["meshes"]
-        records = []
-        for record in meshes:
-            if record["type"] != "lod": continue
-            lod = self.LODFromString(record["uris"][0]["uri"])
-            tris = record["tris"]
-            records.append(
-                {
-                    "key": lod.lower(),
-                    "name": lod,
-                    "type": "int",
-                    "value": tris
-                }
-            )
-        return records
-
-
-
-    def makeInfoFromZip(self, zipobj, uniqid, classes, name):
-        """
-        Collect some info from Quixel asset json info file
-
-        :param zipobj: zipfile.ZipFile() object of Quixel asset zip file
-        :return: dict
-        """
-
-        if not isinstance(zipobj, ZF.ZipFile):
-            raise TypeError("Expected < zipfile.ZipFile > type object")
-
-        jsondata = self.getJSONInfoData(zipobj)
-        filename = os.path.basename(zipobj.filename)
-
-        group_asset = {
-            "group": "asset",
-            "records": self.makeAssetRecords(uniqid, jsondata, filename, classes, name)
-        }
-        group_texture = {
-            "group": "textures",
-            "records": self.makeTextureRecords(jsondata)
-        }
-        group_geometry = {
-            "group": "geometry",
-            "records": self.makeGeometryRecords(jsondata)
-        }
-        group_bound = {
-            "group": "bound",
-            "records": self.makeBoundRecords(jsondata)
-        }
-
-        return [
-            group_asset,
-            group_bound,
-            group_geometry,
-            group_texture
-        ]
-
-
-
-    def extractAsset(self, zippath, dstdir, classes, name):
-        """
-        Extract geometry, textures and preview from Quixel 3d asset.
-        Rename all textures and geometry by type (or LOD), rename preview to "preview".
-        Extract some information from json info file in archive.
-
-        :param zippath: path to Quixel 3d zip archive
-        :param dstdir: destination folder to extract
-        :param classes: list of classes to which the asset belongs
-        :param name: name of asset (it will be placed in the "info.json" file)
-        """
-
-        if not ZF.is_zipfile(zippath):
-            raise StandardError(zippath + " is not a zip file")
-
-        zobj = ZF.ZipFile(zippath, "r")
-        uniqid = self.uniqueID()
-        info = self.makeInfoFromZip(zobj, uniqid, classes, name)
-
-        folder_uniqid = os.path.join(dstdir, uniqid)
-        folder_geo = os.path.join(folder_uniqid, "geometry")
-        folder_txt = os.path.join(folder_uniqid, "textures")
-
-        textureMap = self.mapTexturesFromZip(zobj)
-        geometryMap = self.mapGeometryFromZip(zobj)
-
-        if not os.path.exists(folder_uniqid): os.makedirs(folder_uniqid)
-        if not os.path.exists(folder_geo): os.makedirs(folder_geo)
-        if not os.path.exists(folder_txt): os.makedirs(folder_txt)
-
-        for map in textureMap:
-            zobj.extract(map["name"], folder_txt)
-            os.rename(
-                src=os.path.join(folder_txt, map["name"]),
-                dst=os.path.join(folder_txt, map["type"]+map["ext"])
-            )
-
-        for map in geometryMap:
-            zobj.extract(map["name"], folder_geo)
-            os.rename(
-                src=os.path.join(folder_geo, map["name"]),
-                dst=os.path.join(folder_geo, map["lod"]+map["ext"])
-            )
-
-        self.extractPreviewFromZip(zobj, folder_uniqid, "preview")
-        self.saveToJSON(
-            obj=info,
-            path=os.path.join(folder_uniqid, "info.json")
-        )
-
-
-
-
-if __name__ == '__main__':
-
-    storage_surface = "D:/quixel_download/Quixel Megascans/surface"
-    storage_atlas = "D:/quixel_download/Quixel Megascans/atlas"
-    storage_3d = "D:/quixel_download/Quixel Megascans/3d/nature"
-    storage_3dplant = "D:/quixel_download/Quixel Megascans/3dplant"
-
-    parser = Quixel3D()
-    root = storage_3d
-    dst = "C:/Users/edward/Desktop/Quixel"
-
-    for i, zname in enumerate(os.listdir(root)):
-        if i < 1:
-            zpath = os.path.join(root, zname)
+
+import Quixel.quixel_base
+import common_functionality
+from Core.ArchivesManager import ArchiveFileManager
+from Core.ExtractionProfile import ExtractionProfile
+from Core.VendorMetadata import VendorMetadata
+import zipfile as ZF
+import json
+import os
+
+
+class Quixel3D(Quixel.quixel_base.QuixelBase, common_functionality.CommonFunctionality):
+
+    def __init__(self):
+        """
+        Extractor of Quixel 3d asset archive. Archive members are classified by
+        string parsing functions of CommonFunctionality with texture samples of QuixelBase.
+        """
+        super(Quixel3D, self).__init__()
+
+        self.textureSamples = dict(self._textureManager.samples)
+
+        # default ExtractionProfile of extractAsset: LOD0 textures and all geometry LODs
+        self.extractionProfile = ExtractionProfile(textureLODs=["", "LOD0"])
+
+        # Core.ArchiveIndex.ArchiveIndex, if set unchanged archives are not extracted again
+        self.archiveIndex = None
+
+        # remove asset folder (and catalogue row) of previous ingest of changed archive
+        self.replaceStale = False
+
+        # measure extracted textures: resolution from file headers, average color
+        # (if vendor info has none) and palette of albedo
+        self.computeStatistics = False
+
+
+
+    def isAlphaBrush(self, string):
+        """
+        Parse string to find if its alpha brush.
+        :param string:
+        :return: bool
+        """
+
+        return string.find("Brush") != -1
+
+
+
+    def isHiresGeometry(self, string):
+        """
+        Parse string and try to find if its hires geo.
+        :param string:
+        :return: bool
+        """
+
+        if not self.isGeometry(string): return False
+        return string.find("High") != -1
+
+
+
+    def isPreview(self, string):
+        """
+        If string is preview for asset return True, otherwise False
+        :param string: file name
+        :return: bool
+        """
+
+        return self.isImage(string) and string.find("Preview") != -1
+
+
+
+    def extractPreviewFromZip(self, zipobj, dstdir, newname):
+        member = self.manifestFromZip(zipobj).preview()
+
+        if member is None: return
+
+        ArchiveFileManager.copyMember(zipobj, member.name, os.path.join(dstdir, newname+member.extension))
+
+
+
+    def getValueFromJSONInfoTexelDensity(self, jsondata):
+        """
+        Extract texel density
+
+        :param jsondata: data from Quixel .json file
+        :return: dict
+        """
+
+        value = VendorMetadata.fromData(jsondata).texelDensity()
+
+        if value is None:
+            return []
+
+        return [
+            {
+                "key": "texel_density",
+                "name": "Texel density",
+                "type": "int",
+                "value": value
+            }
+        ]
+
+
+
+    def getJSONInfoData(self, zipobj):
+        """
+        Load Quixel .json info file from zip archive
+
+        :param zipobj: zipfile.ZipFile() object
+        :return: dict
+        """
+
+        for member in self.manifestFromZip(zipobj).jsonFiles():
+            return json.loads(zipobj.read(member.name).decode("utf-8-sig"))
+
+        return {}
+
+
+
+    def mapGeometryFromZip(self, zipobj, profile=None):
+        """
+        Create list of dicts for each geometry in zip archive
+        (i.e.
+        [
+            {
+                "name": "Billboard_LOD0_ms.fbx",
+                "lod": "LOD1"
+                "ext": ".fbx"
+            },
+            ...
+        ]
+        :param zipobj: zipfile.ZipFile() object
+        :param profile: ExtractionProfile selecting geometry, "extractionProfile" if None
+        :return: list
+        """
+        if not isinstance(zipobj, ZF.ZipFile):
+            raise TypeError("Expect zipfile.ZipFile() object")
+
+        profile = profile or self.extractionProfile
+        members = self.manifestFromZip(zipobj).geometry(hires=False)
+
+        return [
+            {
+                "name": member.name,
+                "lod": member.lod,
+                "ext": member.extension
+            }
+            for member in profile.selectGeometry(members)
+        ]
+
+
+
+    def mapTexturesFromZip(self, zipobj, profile=None):
+        """
+        Create list of dicts for each required texture in zip archive
+        (i.e.
+        [
+            {
+                "type": "albedo",
+                "name": "olzmD_4K_Albedo.jpg",
+                "ext": ".jpg"
+
+            }
+            ...
+        ]
+        :param zipobj: zipfile.ZipFile() object
+        :param profile: ExtractionProfile selecting textures, "extractionProfile" if None
+        :return: list
+        """
+        if not isinstance(zipobj, ZF.ZipFile):
+            raise TypeError("Expect zipfile.ZipFile() object")
+
+        profile = profile or self.extractionProfile
+        members = self.manifestFromZip(zipobj).textures(billboard=None)
+
+        return [
+            {
+                "name": member.name,
+                "type": member.textureType,
+                "ext": member.extension
+            }
+            for member in profile.selectTextures(members)
+        ]
+
+
+
+    def makeAssetRecords(self, uniqid, jsondata, filename, classes, name):
+        """
+        Create default records of asset
+
+        :param uniqid: asset id
+        :param jsondata: data from Quixel .json file
+        :param filename: name of asset archive
+        :param classes: list of classes to which the asset belongs
+        :param name: name of asset
+        :return: list
+        """
+
+        jsondata = VendorMetadata.fromData(jsondata)
+        biome = jsondata.value("biome")
+
+        return self.makeDefaultRecords(
+            uniqid=uniqid,
+            tags=jsondata.value("tags", []),
+            classes=classes,
+            categories=[],
+            groups=[],
+            sets=[biome] if biome else [],
+            companies="Quixel",
+            name=name or os.path.splitext(filename)[0],
+            avg_color=jsondata.value("averageColor", "")
+        )
+
+
+
+    def makeGeometryRecords(self, jsondata):
+        """
+        Extract meshes LOD and triangles count
+
+        :param jsondata: data from Quixel .json file
+        :return: list
+        """
+        records = []
+        for record in VendorMetadata.fromData(jsondata).items("meshes", "lod"):
+            lod = self.LODFromString(record["uris"][0]["uri"])
+            tris = record["tris"]
+            records.append(
+                {
+                    "key": lod.lower(),
+                    "name": lod,
+                    "type": "int",
+                    "value": tris
+                }
+            )
+        return records
+
+
+
+    def makeBoundRecords(self, jsondata):
+        """
+        Extract meshes LOD and triangles count
+
+        :param jsondata: data from Quixel .json file
+        :return: list
+        """
+        records = []
+        for record in VendorMetadata.fromData(jsondata).items("meshes", "lod"):
+            lod = self.LODFromString(record["uris"][0]["uri"])
+            tris = record["tris"]
+            records.append(
+                {
+                    "key": lod.lower(),
+                    "name": lod,
+                    "type": "int",
+                    "value": tris
+                }
+            )
+        return records
+
+
+
+    def makeTextureRecords(self, jsondata):
+        """
+        Extract meshes LOD and triangles count
+
+        :param jsondata: data from Quixel .json file
+        :return: list
+        """
+        records = []
+        for record in VendorMetadata.fromData(jsondata).items("meshes", "lod"):
+            lod = self.LODFromString(record["uris"][0]["uri"])
+            tris = record["tris"]
+            records.append(
+                {
+                    "key": lod.lower(),
+                    "name": lod,
+                    "type": "int",
+                    "value": tris
+                }
+            )
+        return records
+
+
+
+    def makeInfoFromZip(self, zipobj, uniqid, classes, name):
+        """
+        Collect some info from Quixel asset json info file
+
+        :param zipobj: zipfile.ZipFile() object of Quixel asset zip file
+        :return: dict
+        """
+
+        if not isinstance(zipobj, ZF.ZipFile):
+            raise TypeError("Expected < zipfile.ZipFile > type object")
+
+        jsondata = VendorMetadata(self.getJSONInfoData(zipobj))
+        filename = os.path.basename(zipobj.filename)
+
+        group_asset = {
+            "group": "asset",
+            "records": self.makeAssetRecords(uniqid, jsondata, filename, classes, name)
+        }
+        group_texture = {
+            "group": "textures",
+            "records": self.makeTextureRecords(jsondata)
+        }
+        group_geometry = {
+            "group": "geometry",
+            "records": self.makeGeometryRecords(jsondata)
+        }
+        group_bound = {
+            "group": "bound",
+            "records": self.makeBoundRecords(jsondata)
+        }
+
+        return [
+            group_asset,
+            group_bound,
+            group_geometry,
+            group_texture
+        ]
+
+
+
+    def extractAsset(self, zippath, dstdir, classes, name, profile=None):
+        """
+        Extract geometry, textures and preview from Quixel 3d asset.
+        Rename all textures and geometry by type (or LOD), rename preview to "preview".
+        Extract some information from json info file in archive.
+
+        :param zippath: path to Quixel 3d zip archive
+        :param dstdir: destination folder to extract
+        :param classes: list of classes to which the asset belongs
+        :param name: name of asset (it will be placed in the info file)
+        :param profile: ExtractionProfile, "extractionProfile" if None
+
+        :return: path to extracted asset folder
+        """
+
+        stale = ""
+
+        if self.archiveIndex is not None:
+            folder = self.archiveIndex.lookup(zippath, dstdir, profile)
+            if folder: return folder
+
+            # changed archive or other profile, asset is extracted again
+            stale = self.archiveIndex.folder(zippath, dstdir)
+
+        if not ArchiveFileManager.isZipArchive(zippath):
+            raise ZF.BadZipFile(zippath + " is not a zip file")
+
+        with ZF.ZipFile(zippath, "r") as zobj:
+            folder = self._extractZip(zobj, zippath, dstdir, classes, name, profile)
+
+        if self.archiveIndex is not None and self.replaceStale:
+            self.archiveIndex.discardFolder(stale, folder, self.catalogue)
+
+        return folder
+
+
+
+    def readAsset(self, zobj, dstdir, classes, name, profile=None):
+        """
+        Archive part of extraction: make info, copy textures, geometry and preview to asset folder
+
+        :param zobj: zipfile.ZipFile() object of Quixel 3d asset zip file
+        :param dstdir: destination folder to extract
+        :param classes: list of classes to which the asset belongs
+        :param name: name of asset
+        :param profile: ExtractionProfile, "extractionProfile" if None
+
+        :return: (info, folder, textures) textures is dict { texture type: extracted file path }
+        """
+
+        uniqid = self.uniqueID()
+        info = self.makeInfoFromZip(zobj, uniqid, classes, name)
+
+        folder_uniqid = os.path.join(dstdir, uniqid)
+        folder_geo = os.path.join(folder_uniqid, "geometry")
+        folder_txt = os.path.join(folder_uniqid, "textures")
+
+        textureMap = self.mapTexturesFromZip(zobj, profile)
+        geometryMap = self.mapGeometryFromZip(zobj, profile)
+        textures = {}
+
+        if not os.path.exists(folder_uniqid): os.makedirs(folder_uniqid)
+        if not os.path.exists(folder_geo): os.makedirs(folder_geo)
+        if not os.path.exists(folder_txt): os.makedirs(folder_txt)
+
+        for map in textureMap:
+            textures[map["type"]] = os.path.join(folder_txt, map["type"]+map["ext"])
+            ArchiveFileManager.copyMember(zobj, map["name"], textures[map["type"]])
+
+        for map in geometryMap:
+            ArchiveFileManager.copyMember(zobj, map["name"], os.path.join(folder_geo, map["lod"]+map["ext"]))
+
+        if (profile or self.extractionProfile).preview:
+            self.extractPreviewFromZip(zobj, folder_uniqid, "preview")
+
+        return info, folder_uniqid, textures
+
+
+
+    def applyStatistics(self, info, statistics):
+        """
+        Merge assetStatistics into info groups, vendor average color is kept
+
+        :param info: list of info group dicts of makeInfoFromZip
+        :param statistics: dict of assetStatistics
+        :return: info
+        """
+
+        groups = dict((group["group"], group["records"]) for group in info)
+
+        for record in groups["asset"]:
+            if record["key"] == "color_avg" and not record["value"]:
+                record["value"] = statistics.get("average_color", "")
+
+        for key, name, type in (("width", "Width", "int"), ("height", "Height", "int"), ("palette", "Palette", "list")):
+            if key in statistics:
+                groups["textures"].append({"key": key, "name": name, "type": type, "value": statistics[key]})
+
+        return info
+
+
+
+    def _extractZip(self, zobj, zippath, dstdir, classes, name, profile):
+        info, folder, textures = self.readAsset(zobj, dstdir, classes, name, profile)
+
+        if self.computeStatistics:
+            self.applyStatistics(info, self.assetStatistics(textures))
+
+        self.saveAssetInfo(info, folder)
+
+        if self.archiveIndex is not None:
+            self.archiveIndex.record(zippath, folder, zobj, profile)
+
+        return folder
+
+
+
+
+if __name__ == '__main__':
+
+    storage_surface = "D:/quixel_download/Quixel Megascans/surface"
+    storage_atlas = "D:/quixel_download/Quixel Megascans/atlas"
+    storage_3d = "D:/quixel_download/Quixel Megascans/3d/nature"
+    storage_3dplant = "D:/quixel_download/Quixel Megascans/3dplant"
+
+    parser = Quixel3D()
+    root = storage_3d
+    dst = "C:/Users/edward/Desktop/Quixel"
+
+    for i, zname in enumerate(os.listdir(root)):
+        if i < 1:
+            zpath = os.path.join(root, zname)
             parser.extractAsset(zpath, dst, ["cls"], "n")
\ No newline at end of file
@@ -1,8 +1,8 @@
-
-import Quixel.quixel_base
-
-
-
-class QuixelAtlas(Quixel.quixel_base.QuixelBase):
-    def __init__(self, ):
+
+import Quixel.quixel_base
+
+
+
+class QuixelAtlas(Quixel.quixel_base.QuixelBase):
+    def __init__(self, ):
         super(QuixelAtlas, self).__init__()
\ No newline at end of file
@@ -1,12 +1,12 @@
-
-import Quixel.quixel_base
-
-
-
-class QuixelSurface(Quixel.quixel_base.QuixelBase):
-    def __init__(self, ):
-        super(QuixelSurface, self).__init__()
-
-
-if __name__ == '__main__':
+
+import Quixel.quixel_base
+
+
+
+class QuixelSurface(Quixel.quixel_base.QuixelBase):
+    def __init__(self, ):
+        super(QuixelSurface, self).__init__()
+
+
+if __name__ == '__main__':
     pass
\ No newline at end of file
@@ -1,426 +1,427 @@
-from __future__ import print_function
-
-
-from Core.CommonFunctionality import CommonFunctions
-from Core.StringParser import StringParser
-from Core.TextureManagement import TextureManager
-from Core.ArchivesManager import ArchiveFileManager
-from Core.InfoFileManagement import InfoRecord, InfoRecordGroup
-from Core.ImageProcessing import ImageProcessor
-from Core.NameConvention import NamesConventionTextures as NCTextures
-from Core.NameConvention import NamesConventionInfo as NCInfo
-
-import tempfile
-import sys
-import os
-
-
-
-class QuiexelAssetTypes(object):
-    Atlas = "atlas"
-    Model3D = "3d"
-    Plant3D = "3dplant"
-    Surface = "surface"
-
-
-
-class QuixelBase(object):
-
-    def __init__(self):
-        super(QuixelBase, self).__init__()
-
-        # asset attributes
-
-        self._assetFileName     = ""                            # name of asset parsed from asset path
-        self._assetFileArchive  = ""                            # path to asset archive
-        self._assetType         = ""                            # type if quixel asset ( 3dplant, surface ... )
-        self._assetVendorData   = None                          # data from asset .json info file
-        self._quixelAssetTypes = [
-            QuiexelAssetTypes.Surface,
-            QuiexelAssetTypes.Model3D,
-            QuiexelAssetTypes.Plant3D,
-            QuiexelAssetTypes.Atlas
-        ]
-
-        # info groups
-
-        self._infoGroupGlobal       = InfoRecordGroup()             # main info group for info.json file
-        self._infoGroupColor        = InfoRecordGroup()             # color info group for info.json file
-        self._infoGroupRegion       = InfoRecordGroup()             # region info group for info.json file
-        self._infoGroupTextures     = InfoRecordGroup()             # texture info group for info.json file
-        self._infoGroupMesh         = InfoRecordGroup()             # geometry info group for info.json file
-        self._infoGroups            = []                            # list of all info groups
-
-        self._infoGroupGlobal.name      = NCInfo.GroupGlobal
-        self._infoGroupRegion.name      = NCInfo.GroupRegion
-        self._infoGroupColor.name       = NCInfo.GroupColor
-        self._infoGroupTextures.name    = NCInfo.GroupTextures
-        self._infoGroupMesh.name        = NCInfo.GroupMesh
-
-
-        # managers
-
-        self._commonFunc        = CommonFunctions()
-        self._textureManager    = TextureManager()
-        self._archiveManager    = ArchiveFileManager()
-        self._imageProcessor    = ImageProcessor()
-        self._stringParser      = StringParser()
-
-        self._textureManager.samples = {
-            NCTextures.Displacement:   ["Displacement"],
-            NCTextures.NormalDetail:   ["NormalBump"],
-            NCTextures.Glossiness:     ["Gloss"],
-            NCTextures.Roughness:      ["Roughness"],
-            NCTextures.Specular:       ["Specular"],
-            NCTextures.Opacity:        ["Opacity"],
-            NCTextures.Normal:         ["Normal"],
-            NCTextures.Albedo:         ["Albedo"],
-            NCTextures.Cavity:         ["Cavity"],
-            NCTextures.Mask:           ["Fuzz"],
-            NCTextures.SSS:            ["Translucency"],
-            NCTextures.AO:             ["AO"]
-        }
-
-
-
-
-    # **************** SETTERS / GETTERS *****************#
-
-    @property
-    def assetArchive(self):
-        return self._assetFileArchive
-
-
-    @property
-    def assetType(self):
-        return self._assetType
-
-
-    @assetArchive.setter
-    def assetArchive(self, path):
-        if not isinstance(path, str):
-            raise TypeError("Expected < str >")
-
-        if not self._archiveManager.isArchive(path):
-            raise StandardError(path + " is not archive")
-
-        self._initAsset(path)
-
-
-
-
-    # **************** PRIVATE METHODS *****************#
-
-    def _collecVendorInfo(self):
-        try:
-            info = self._assetVendorData["tags"]
-            record = InfoRecord(NCInfo.GlobalTags)
-            record.setValueStringList([info])
-            self._infoGroupGlobal.addRecord(record)
-        except:
-            pass
-
-        try:
-            info = self._assetVendorData["environment"]["biome"].replace("-", " ")
-            record = InfoRecord(NCInfo.GlobalSet)
-            record.setValueStringList([info])
-            self._infoGroupGlobal.addRecord(record)
-        except:
-            pass
-
-        try:
-            info = self._assetVendorData["averageColor"]
-            record = InfoRecord(NCInfo.ColorAvg)
-            record.setValueColor(info)
-            self._infoGroupColor.addRecord(record)
-        except:
-            pass
-
-        try:
-            info = self._assetVendorData["environment"]["region"]
-            record = InfoRecord(NCInfo.RegionLocation)
-            record.setValueString(info)
-            self._infoGroupRegion.addRecord(record)
-        except:
-            pass
-
-
-        if self._assetType == QuiexelAssetTypes.Surface:
-            for item in self._assetVendorData["meta"]:
-                if item["key"] == "tileable":
-                    try:
-                        record = InfoRecord(NCInfo.TexturesTileable)
-                        record.setValueBool(item["value"])
-                        self._infoGroupTextures.addRecord(record)
-                        break
-                    except:
-                        break
-
-            for item in self._assetVendorData["components"]:
-                if item["type"] == "displacement":
-                    try:
-                        record = InfoRecord(NCInfo.TexturesDispRange)
-                        min = item["minIntensity"] / 256
-                        max = item["maxIntensity"] / 256
-                        record.setValueRangeFloat((min, max))
-                        self._infoGroupTextures.addRecord(record)
-                        break
-                    except:
-                        break
-
-
-
-
-
-    def _initAsset(self, path):
-
-        # setup default parameters
-
-        self._assetFileArchive = path
-        self._assetFileName = os.path.basename(path)
-        self._assetFileName = os.path.splitext(self._assetFileName)[0]
-        self._archiveManager.archiveFile = path
-
-
-
-        # load asset .json info file
-
-        self._archiveManager.open()
-
-        try:
-            name = self._archiveManager.content(["json"])[0]
-            self._archiveManager.extractMember(
-                directory=tempfile.gettempdir(),
-                name=name
-            )
-
-            filepath = os.path.join(tempfile.gettempdir(), name)
-
-            self._assetVendorData = self._commonFunc.loadFromJSON(filepath)
-            os.remove(filepath)
-
-            self._archiveManager.close()
-            self._collecVendorInfo()
-        except:
-            print(
-                self.__class__.__name__ + ": Asset" + path + "has not .json info file",
-                file=sys.stderr
-            )
-
-        self._archiveManager.close()
-
-
-
-        # parse categories and group info from asset name
-
-        sepnames = self._assetFileName.split("_")
-
-        record = InfoRecord(NCInfo.GlobalCategory)
-        record.setValueStringList([sepnames[0]])
-        self._infoGroupGlobal.addRecord(record)
-
-        if len(sepnames) > 5:
-            record = InfoRecord(NCInfo.GlobalGroup)
-            record.setValueStringList([sepnames[1]])
-            self._infoGroupGlobal.addRecord(record)
-
-        record = InfoRecord(NCInfo.GlobalName)
-        record.setValueString("")
-        self._infoGroupGlobal.addRecord(record)
-
-
-        # parse asset type
-
-        for asset_type in self._quixelAssetTypes:
-            t = "_"+asset_type
-            if t in self._assetFileName:
-                self._assetType = asset_type
-                break
-
-
-    def _saveInfoData(self, directory):
-        self._infoGroups.insert(0, self._infoGroupGlobal)
-        self._infoGroups.insert(1, self._infoGroupRegion)
-        self._infoGroups.insert(2, self._infoGroupColor)
-
-        data = []
-
-        for group in self._infoGroups:
-            data.append(group.toDict())
-
-        self._commonFunc.saveToJSON(
-            obj=data,
-            path=os.path.join(directory, "info.json")
-        )
-
-
-    def _extractPreview(self, directory, newname="preview"):
-        for name in self._archiveManager.content():
-            if name.find("Preview") != -1:
-                self._archiveManager.extract(directory, {name: newname})
-                break
-
-
-
-    #**************** PUBLIC METHODS *******************#
-
-    def clearAssetArchive(self):
-        self._archiveManager.clear()
-
-        self._assetFileName = ""
-        self._assetFileArchive = ""
-        self._assetType = ""
-        self._assetVendorData = None
-        self._infoGroupGlobal = InfoRecordGroup()
-
-
-    def setCategories(self, categories=[""]):
-        record = InfoRecord(NCInfo.GlobalCategory)
-        record.setValueStringList(categories)
-        self._infoGroupGlobal.changeRecord(NCInfo.GlobalCategory, record)
-
-
-    def setGroups(self, groups=[""]):
-        record = InfoRecord(NCInfo.GlobalGroup)
-        record.setValueStringList(groups)
-        self._infoGroupGlobal.changeRecord(NCInfo.GlobalGroup, record)
-
-
-    def setSets(self, sets=[""]):
-        record = InfoRecord(NCInfo.GlobalSet)
-        record.setValueStringList(sets)
-        self._infoGroupGlobal.changeRecord(NCInfo.GlobalSet, record)
-
-
-    def setName(self, name=""):
-        record = InfoRecord(NCInfo.GlobalName)
-        record.setValueString(name)
-        self._infoGroupGlobal.changeRecord(NCInfo.GlobalName, record)
-
-
-
-
-class QuixelSurface(QuixelBase):
-
-    def __init__(self):
-        super(QuixelSurface, self).__init__()
-
-        record = InfoRecord(NCInfo.TexturesAtlas)
-        record.setValueBool(False)
-
-        self._infoGroupTextures = InfoRecordGroup()
-        self._infoGroupTextures.name = NCInfo.GroupTextures
-        self._infoGroupTextures.addRecord(record)
-
-
-
-    def _collecVendorInfo(self):
-
-        super(QuixelSurface, self)._collecVendorInfo()
-
-        if not self._assetVendorData: return
-
-        for item in self._assetVendorData["meta"]:
-            if item["key"] == "tileable":
-                try:
-                    record = InfoRecord(NCInfo.TexturesTileable)
-                    record.setValueBool(item["value"])
-                    self._infoGroupTextures.addRecord(record)
-                    break
-                except:
-                    break
-
-        for item in self._assetVendorData["components"]:
-            if item["type"] == "displacement":
-                try:
-                    record = InfoRecord(NCInfo.TexturesDispRange)
-                    min = item["minIntensity"]/256
-                    max = item["maxIntensity"]/256
-                    record.setValueRangeFloat((min, max))
-                    self._infoGroupTextures.addRecord(record)
-                    break
-                except:
-                    break
-
-
-    def saveInfoData(self, directory):
-        self._infoGroups.append(self._infoGroupTextures)
-        self._saveInfoData(directory)
-
-
-
-    def extract(self, directory):
-        namemap = {}
-
-        self._archiveManager.open()
-
-        for name in self._archiveManager.content(["png", "jpg", "jpeg", "exr"]):
-
-            if name.find("Preview") != -1:
-                namemap[name] = "preview"
-                continue
-
-            self._textureManager.string = str(name)
-            textype = self._textureManager.typeFromString(3)
-
-            if not textype: continue
-
-            namemap[name] = textype
-
-        self._archiveManager.extract(directory, namemap)
-        self._archiveManager.close()
-
-
-
-    def isBillboardTexture(self, string):
-        """
-        If string is billboard texture return True, otherwise False
-        :param string: texture name (or file name, preferably not full name)
-        :return: bool
-        """
-
-        if string.find("Billboard") != -1:
-            return True
-        return False
-
-
-    def billboardMap(self, prefix='billboard_'):
-        """
-        Create list of dicts [{archived_file_name: billboard_type}, ...]
-        (i.e.
-        [
-            {"Billboard_4K_Albedo.jpg": "albedo"},
-            {"Billboard_4K_Normal.jpg": "normal"},
-            ...
-        ]
-        :return: list
-        """
-
-        schemes = []
-
-        is_opened = self._archiveManager.isOpened
-
-        if not is_opened: self._archiveManager.open()
-
-        for name in self._archiveManager.content():
-            if not self.isBillboardTexture(name):
-                continue
-
-            self._textureManager.string = name
-            texture_type = self._textureManager.typeFromString(3)
-            schemes.append(
-                { name: prefix+texture_type }
-            )
-
-        return schemes
-
-
-if __name__ == '__main__':
-
-    src = "D:/quixel_download/Quixel Megascans/surface/construction/Concrete_Damaged_Base_pjttH20_2K_surface_ms.zip"
-    dst = "C:/Users/edward/Desktop/quixel"
-
-    qsurf = QuixelSurface()
-    qsurf.assetArchive = src
-    qsurf.extract(dst)
-    qsurf.saveInfoData(dst)
+from __future__ import print_function
+
+
+from Core.CommonFunctionality import CommonFunctions
+from Core.StringParser import StringParser
+from Core.TextureManagement import TextureManager
+from Core.ArchivesManager import ArchiveFileManager, ArchiveHandlePool
+from Core.InfoFileManagement import InfoRecord, InfoRecordGroup
+from Core.VendorMetadata import VendorMetadata
+from Core.Serialization import Serializer, SerializationFormats
+from Core.ImageProcessing import ImageProcessor
+from Core.NameConvention import NamesConventionTextures as NCTextures
+from Core.NameConvention import NamesConventionInfo as NCInfo
+
+import sys
+import os
+
+
+
+class QuiexelAssetTypes(object):
+    Atlas = "atlas"
+    Model3D = "3d"
+    Plant3D = "3dplant"
+    Surface = "surface"
+
+
+
+class QuixelBase(object):
+
+    # archives opened by all assets of the process, asset archive is parsed
+    # once for _initAsset, extract, billboardMap ...
+
+    archivePool = ArchiveHandlePool()
+
+
+    def __init__(self):
+        super(QuixelBase, self).__init__()
+
+        # asset attributes
+
+        self._assetFileName     = ""                            # name of asset parsed from asset path
+        self._assetFileArchive  = ""                            # path to asset archive
+        self._assetType         = ""                            # type if quixel asset ( 3dplant, surface ... )
+        self._assetVendorData   = None                          # data from asset .json info file
+        self._vendorMetadata    = VendorMetadata(None)          # indexed asset .json info file
+        self._quixelAssetTypes = [
+            QuiexelAssetTypes.Surface,
+            QuiexelAssetTypes.Model3D,
+            QuiexelAssetTypes.Plant3D,
+            QuiexelAssetTypes.Atlas
+        ]
+
+        # Core.LibraryCatalogue.LibraryCatalogue, if set asset info is added to it
+        # (asset id is asset folder name), info file is written if "writeInfoFiles"
+
+        self.catalogue = None
+        self.writeInfoFiles = True
+        self.infoFileFormat = SerializationFormats.JSON
+
+        # info groups
+
+        self._infoGroupGlobal       = InfoRecordGroup()             # main info group for info.json file
+        self._infoGroupColor        = InfoRecordGroup()             # color info group for info.json file
+        self._infoGroupRegion       = InfoRecordGroup()             # region info group for info.json file
+        self._infoGroupTextures     = InfoRecordGroup()             # texture info group for info.json file
+        self._infoGroupMesh         = InfoRecordGroup()             # geometry info group for info.json file
+        self._infoGroups            = []                            # list of all info groups
+
+        self._infoGroupGlobal.name      = NCInfo.GroupGlobal
+        self._infoGroupRegion.name      = NCInfo.GroupRegion
+        self._infoGroupColor.name       = NCInfo.GroupColor
+        self._infoGroupTextures.name    = NCInfo.GroupTextures
+        self._infoGroupMesh.name        = NCInfo.GroupMesh
+
+
+        # managers
+
+        self._commonFunc        = CommonFunctions()
+        self._textureManager    = TextureManager()
+        self._archiveManager    = ArchiveFileManager(QuixelBase.archivePool)
+        self._imageProcessor    = ImageProcessor()
+        self._stringParser      = StringParser()
+
+        self._textureManager.samples = {
+            NCTextures.Displacement:   ["Displacement"],
+            NCTextures.NormalDetail:   ["NormalBump"],
+            NCTextures.Glossiness:     ["Gloss"],
+            NCTextures.Roughness:      ["Roughness"],
+            NCTextures.Specular:       ["Specular"],
+            NCTextures.Opacity:        ["Opacity"],
+            NCTextures.Normal:         ["Normal"],
+            NCTextures.Albedo:         ["Albedo"],
+            NCTextures.Cavity:         ["Cavity"],
+            NCTextures.Mask:           ["Fuzz"],
+            NCTextures.SSS:            ["Translucency"],
+            NCTextures.AO:             ["AO"]
+        }
+
+
+
+
+    # **************** SETTERS / GETTERS *****************#
+
+    @property
+    def assetArchive(self):
+        return self._assetFileArchive
+
+
+    @property
+    def assetType(self):
+        return self._assetType
+
+
+    @assetArchive.setter
+    def assetArchive(self, path):
+        if not isinstance(path, str):
+            raise TypeError("Expected < str >")
+
+        if not self._archiveManager.isArchive(path):
+            raise StandardError(path + " is not archive")
+
+        self._initAsset(path)
+
+
+
+
+    # **************** PRIVATE METHODS *****************#
+
+    def _addVendorRecord(self, group, name, setter, value):
+        # vendor value of unexpected type is skipped as missing one
+
+        record = InfoRecord(name)
+
+        try:
+            getattr(record, setter)(value)
+        except TypeError:
+            return
+
+        group.addRecord(record)
+
+
+    def _hasTextureInfo(self):
+        return self._assetType == QuiexelAssetTypes.Surface
+
+
+    def _collecVendorInfo(self):
+        values = self._vendorMetadata.values()
+
+        if "tags" in values:
+            self._addVendorRecord(self._infoGroupGlobal, NCInfo.GlobalTags, "setValueStringList", [values["tags"]])
+
+        if isinstance(values.get("biome"), str):
+            self._addVendorRecord(
+                self._infoGroupGlobal, NCInfo.GlobalSet, "setValueStringList", [values["biome"].replace("-", " ")]
+            )
+
+        if "averageColor" in values:
+            self._addVendorRecord(self._infoGroupColor, NCInfo.ColorAvg, "setValueColor", values["averageColor"])
+
+        if "region" in values:
+            self._addVendorRecord(self._infoGroupRegion, NCInfo.RegionLocation, "setValueString", values["region"])
+
+        if self._hasTextureInfo():
+            self._collecTextureInfo(values)
+
+
+    def _collecTextureInfo(self, values):
+        """
+        :param values: dict of VendorMetadata.values()
+        """
+
+        if "tileable" in values:
+            self._addVendorRecord(self._infoGroupTextures, NCInfo.TexturesTileable, "setValueBool", values["tileable"])
+
+        if "displacementMin" in values and "displacementMax" in values:
+            try:
+                displacement = (values["displacementMin"] / 256, values["displacementMax"] / 256)
+            except TypeError:
+                return
+
+            self._addVendorRecord(self._infoGroupTextures, NCInfo.TexturesDispRange, "setValueRangeFloat", displacement)
+
+
+
+    def _initAsset(self, path):
+
+        # setup default parameters
+
+        self._assetFileArchive = path
+        self._assetFileName = os.path.basename(path)
+        self._assetFileName = os.path.splitext(self._assetFileName)[0]
+        self._archiveManager.archiveFile = path
+
+
+
+        # load asset .json info file
+
+        self._archiveManager.open()
+
+        try:
+            name = self._archiveManager.content(["json"])[0]
+            data = self._archiveManager.readMember(name)
+
+            self._assetVendorData = self._commonFunc.loadFromJSONData(data)
+            self._vendorMetadata = VendorMetadata(self._assetVendorData)
+
+            self._archiveManager.close()
+            self._collecVendorInfo()
+        except:
+            print(
+                self.__class__.__name__ + ": Asset" + path + "has not .json info file",
+                file=sys.stderr
+            )
+
+        self._archiveManager.close()
+
+
+
+        # parse categories and group info from asset name
+
+        sepnames = self._assetFileName.split("_")
+
+        record = InfoRecord(NCInfo.GlobalCategory)
+        record.setValueStringList([sepnames[0]])
+        self._infoGroupGlobal.addRecord(record)
+
+        if len(sepnames) > 5:
+            record = InfoRecord(NCInfo.GlobalGroup)
+            record.setValueStringList([sepnames[1]])
+            self._infoGroupGlobal.addRecord(record)
+
+        record = InfoRecord(NCInfo.GlobalName)
+        record.setValueString("")
+        self._infoGroupGlobal.addRecord(record)
+
+
+        # parse asset type
+
+        for asset_type in self._quixelAssetTypes:
+            t = "_"+asset_type
+            if t in self._assetFileName:
+                self._assetType = asset_type
+                break
+
+
+    def _saveInfoData(self, directory):
+        self._infoGroups.insert(0, self._infoGroupGlobal)
+        self._infoGroups.insert(1, self._infoGroupRegion)
+        self._infoGroups.insert(2, self._infoGroupColor)
+
+        data = []
+
+        for group in self._infoGroups:
+            data.append(group.toDict())
+
+        self.saveAssetInfo(data, directory)
+
+
+    def saveAssetInfo(self, info, directory):
+        """
+        Write asset info to info file of asset folder ("info.json" or binary info of
+        "infoFileFormat") if "writeInfoFiles" and to catalogue if it is set.
+        Asset id is asset folder name.
+
+        :param info: list of info group dicts
+        :param directory: asset folder
+        """
+
+        if self.writeInfoFiles:
+            Serializer.save(
+                obj=info,
+                path=os.path.join(directory, Serializer.infoFileName(self.infoFileFormat))
+            )
+
+        if self.catalogue is not None:
+            self.catalogue.addAsset(os.path.basename(os.path.normpath(directory)), directory, info)
+
+
+    def _extractPreview(self, directory, newname="preview"):
+        for name in self._archiveManager.content():
+            if name.find("Preview") != -1:
+                self._archiveManager.extract(directory, {name: newname})
+                break
+
+
+
+    #**************** PUBLIC METHODS *******************#
+
+    def clearAssetArchive(self):
+        self._archiveManager.clear()
+
+        self._assetFileName = ""
+        self._assetFileArchive = ""
+        self._assetType = ""
+        self._assetVendorData = None
+        self._vendorMetadata = VendorMetadata(None)
+        self._infoGroupGlobal = InfoRecordGroup()
+
+
+    def setCategories(self, categories=[""]):
+        record = InfoRecord(NCInfo.GlobalCategory)
+        record.setValueStringList(categories)
+        self._infoGroupGlobal.changeRecord(NCInfo.GlobalCategory, record)
+
+
+    def setGroups(self, groups=[""]):
+        record = InfoRecord(NCInfo.GlobalGroup)
+        record.setValueStringList(groups)
+        self._infoGroupGlobal.changeRecord(NCInfo.GlobalGroup, record)
+
+
+    def setSets(self, sets=[""]):
+        record = InfoRecord(NCInfo.GlobalSet)
+        record.setValueStringList(sets)
+        self._infoGroupGlobal.changeRecord(NCInfo.GlobalSet, record)
+
+
+    def setName(self, name=""):
+        record = InfoRecord(NCInfo.GlobalName)
+        record.setValueString(name)
+        self._infoGroupGlobal.changeRecord(NCInfo.GlobalName, record)
+
+
+
+
+class QuixelSurface(QuixelBase):
+
+    def __init__(self):
+        super(QuixelSurface, self).__init__()
+
+        record = InfoRecord(NCInfo.TexturesAtlas)
+        record.setValueBool(False)
+
+        self._infoGroupTextures = InfoRecordGroup()
+        self._infoGroupTextures.name = NCInfo.GroupTextures
+        self._infoGroupTextures.addRecord(record)
+
+
+
+    def _hasTextureInfo(self):
+        # asset type is parsed after vendor info
+        return True
+
+
+    def saveInfoData(self, directory):
+        self._infoGroups.append(self._infoGroupTextures)
+        self._saveInfoData(directory)
+
+
+
+    def extract(self, directory):
+        namemap = {}
+
+        self._archiveManager.open()
+
+        for name in self._archiveManager.content(["png", "jpg", "jpeg", "exr"]):
+
+            if name.find("Preview") != -1:
+                namemap[name] = "preview"
+                continue
+
+            self._textureManager.string = str(name)
+            textype = self._textureManager.typeFromString(3)
+
+            if not textype: continue
+
+            namemap[name] = textype
+
+        self._archiveManager.extract(directory, namemap)
+        self._archiveManager.close()
+
+
+
+    def isBillboardTexture(self, string):
+        """
+        If string is billboard texture return True, otherwise False
+        :param string: texture name (or file name, preferably not full name)
+        :return: bool
+        """
+
+        if string.find("Billboard") != -1:
+            return True
+        return False
+
+
+    def billboardMap(self, prefix='billboard_'):
+        """
+        Create list of dicts [{archived_file_name: billboard_type}, ...]
+        (i.e.
+        [
+            {"Billboard_4K_Albedo.jpg": "albedo"},
+            {"Billboard_4K_Normal.jpg": "normal"},
+            ...
+        ]
+        :return: list
+        """
+
+        schemes = []
+
+        is_opened = self._archiveManager.isOpened
+
+        if not is_opened: self._archiveManager.open()
+
+        for name in self._archiveManager.content():
+            if not self.isBillboardTexture(name):
+                continue
+
+            self._textureManager.string = name
+            texture_type = self._textureManager.typeFromString(3)
+            schemes.append(
+                { name: prefix+texture_type }
+            )
+
+        if not is_opened: self._archiveManager.close()
+
+        return schemes
+
+
+if __name__ == '__main__':
+
+    src = "D:/quixel_download/Quixel Megascans/surface/construction/Concrete_Damaged_Base_pjttH20_2K_surface_ms.zip"
+    dst = "C:/Users/edward/Desktop/quixel"
+
+    qsurf = QuixelSurface()
+    qsurf.assetArchive = src
+    qsurf.extract(dst)
+    qsurf.saveInfoData(dst)
@@ -0,0 +1,185 @@
+from Core.IngestManagement import IngestManager, IngestStages
+from Core.ArchiveIndex import ArchiveIndex
+from Core.LibraryCatalogue import LibraryCatalogue
+from Core.ArchivesManager import ArchiveFileManager
+from Quixel.quixel_base import QuiexelAssetTypes
+from Quixel.asset_3d import Quixel3D
+
+import zipfile as ZF
+import threading
+import quixel
+import os
+
+
+
+# parsers are created once per worker process and reused for all its tasks,
+# 3d assets are extracted by Quixel3D (geometry LODs, textures and preview)
+
+_parsers = {}
+_archiveIndex = None
+_catalogue = None
+
+
+def _parserClass(task):
+    if task.assetType in (QuiexelAssetTypes.Model3D, QuiexelAssetTypes.Plant3D):
+        return Quixel3D
+
+    return quixel.QuixelParser
+
+
+def _parser(parserClass):
+    if parserClass not in _parsers:
+        _parsers[parserClass] = parserClass()
+
+    return _parsers[parserClass]
+
+
+def _quixelParser(task):
+    global _archiveIndex, _catalogue
+
+    parser = _parser(_parserClass(task))
+
+    if not task.indexFile:
+        parser.archiveIndex = None
+    else:
+        if _archiveIndex is None or _archiveIndex.path != task.indexFile:
+            _archiveIndex = ArchiveIndex(task.indexFile)
+        parser.archiveIndex = _archiveIndex
+
+    if not task.catalogueFile:
+        parser.catalogue = None
+    else:
+        if _catalogue is None or _catalogue.path != task.catalogueFile:
+            _catalogue = LibraryCatalogue(task.catalogueFile)
+        parser.catalogue = _catalogue
+
+    parser.writeInfoFiles = task.infoFiles
+    parser.infoFileFormat = task.infoFormat
+    parser.computeStatistics = task.statistics
+    parser.replaceStale = task.replaceStale
+
+    return parser
+
+
+
+def extractSurfaceTask(task):
+    return _quixelParser(task).extractSurfaceAsset(
+        task.archive, task.directory, task.classes, task.name, task.profile)
+
+
+def extractAtlasTask(task):
+    return _quixelParser(task).extractAtlasAsset(
+        task.archive, task.directory, task.classes, task.name, task.profile)
+
+
+def extract3DTask(task):
+    return _quixelParser(task).extractAsset(
+        task.archive, task.directory, task.classes, task.name, task.profile)
+
+
+
+# pipeline stages: every I/O thread has own parsers, archive index and catalogue
+# are recorded by IngestPipeline
+
+_threadParsers = threading.local()
+
+
+def _threadParser(task):
+    parserClass = _parserClass(task)
+    parsers = getattr(_threadParsers, "parsers", None)
+
+    if parsers is None:
+        parsers = _threadParsers.parsers = {}
+
+    if parserClass not in parsers:
+        parsers[parserClass] = parserClass()
+
+    parser = parsers[parserClass]
+    parser.writeInfoFiles = task.infoFiles
+    parser.infoFileFormat = task.infoFormat
+
+    return parser
+
+
+def readStage(task):
+    if not ArchiveFileManager.isZipArchive(task.archive):
+        raise ZF.BadZipFile(task.archive + " is not a zip file")
+
+    with ZF.ZipFile(task.archive, "r") as zobj:
+        info, folder, textures = _threadParser(task).readAsset(
+            zobj, task.directory, task.classes, task.name, task.profile)
+
+    return (info, folder), (textures if task.statistics else None)
+
+
+def analyzeStage(textures):
+    return _parser(quixel.QuixelParser).assetStatistics(textures)
+
+
+def writeStage(task, state, statistics):
+    info, folder = state
+    parser = _threadParser(task)
+
+    if statistics is not None:
+        parser.applyStatistics(info, statistics)
+
+    if task.infoFiles:
+        parser.saveAssetInfo(info, folder)
+
+    # asset id is asset folder name for all parsers
+    return os.path.basename(folder), folder, info
+
+
+
+class QuixelIngestManager(IngestManager):
+
+    def __init__(self):
+        """
+        Batch ingest of Megascans download tree.
+        Expected layout: <library>/surface, <library>/atlas, <library>/3d, <library>/3dplant
+        (any depth of sub folders inside each type folder).
+        """
+        super(QuixelIngestManager, self).__init__()
+
+        self.archiveExtensions = ["zip"]
+
+        self.registerHandler(QuiexelAssetTypes.Surface, extractSurfaceTask)
+        self.registerHandler(QuiexelAssetTypes.Atlas, extractAtlasTask)
+        self.registerHandler(QuiexelAssetTypes.Model3D, extract3DTask)
+        self.registerHandler(QuiexelAssetTypes.Plant3D, extract3DTask)
+
+        stages = IngestStages(readStage, writeStage, analyzeStage)
+
+        for assetType in (QuiexelAssetTypes.Surface, QuiexelAssetTypes.Atlas,
+                          QuiexelAssetTypes.Model3D, QuiexelAssetTypes.Plant3D):
+            self.registerStages(assetType, stages)
+
+
+    def discoverLibrary(self, library, destination, classes=None, assetTypes=None):
+        """
+        Collect archives from asset type folders of Megascans library
+
+        :param library: root folder of Megascans download tree
+        :param destination: destination library folder
+        :param classes: list of classes to which assets belong
+        :param assetTypes: list of asset types to collect, all registered if None
+
+        :return: list<IngestTask>
+        """
+
+        if assetTypes is None:
+            assetTypes = [
+                QuiexelAssetTypes.Surface,
+                QuiexelAssetTypes.Atlas,
+                QuiexelAssetTypes.Model3D,
+                QuiexelAssetTypes.Plant3D
+            ]
+
+        tasks = []
+
+        for asset_type in assetTypes:
+            directory = os.path.join(library, asset_type)
+            if not os.path.isdir(directory): continue
+            tasks.extend(self.discover(directory, asset_type, destination, classes))
+
+        return tasks
@@ -1,298 +1,400 @@
-import json
-import os
-import numpy
-import cv2 as cv
-from colormap import rgb2hex
-from datetime import datetime
-from PySide.QtCore import QRegExp, Qt
-
-
-
-
-class CommonFunctionality(object):
-
-    def __init__(self):
-        """
-        This class provide common functions.
-
-        property "textureSamples": <dict> containing sample names for each type of
-                                    supported texture "texture_type": ["sample", ...]}
-                                    ( i.e. { "Albedo": [ 'Diffuse', 'diffuseColor' ] } )
-        """
-        super(CommonFunctionality, self).__init__()
-
-        self.textureSamples = {}
-
-        self.textureExtensions = ["jpg", "jpeg", "tif", "tiff", "tga", "exr", "png"]
-
-        self.geometryExtensions = ["fbx", "obj"]
-
-        self.LODRegExpPattern = "LOD[0-9]*[0-9]"
-
-        self.variationRegExpPattern = "VAR[0-9]*[0-9]"
-
-        self.resolutionsMap = {
-            "1K": 1024, "2K": 2048,
-            "3K": 3072, "4K": 4096,
-            "5K": 5120, "6K": 6144,
-            "7K": 7168, "8K": 8196
-        }
-
-        self.assetClasses = ["nature", "city", ]
-
-
-
-    def saveToJSON(self, obj, path):
-        f = open(path, "w")
-        json.dump(obj, f, indent=4)
-        f.close()
-
-
-
-    def uniqueID(self):
-        return datetime.now().strftime('%Y%m%d%H%M%S%f')
-
-
-
-    def isMatchedWithExtensions(self, string, extensions=[]):
-        extension = string.split(".")[-1]
-        return extension in extensions
-
-
-
-    def isImage(self, string):
-        return self.isMatchedWithExtensions(string, self.textureExtensions)
-
-
-
-    def isGeometry(self, string):
-        return self.isMatchedWithExtensions(string, self.geometryExtensions)
-
-
-
-    def extensionFromString(self, string):
-        """
-        Parse string and try to find file extension.
-        :param string:
-        :return: < string > file extension or empty
-        """
-
-        suffix = string.split(".")[-1]
-        return suffix
-
-
-
-    def textureTypeFromString(self, string, mode):
-        """
-        Parse string and try to find texture type
-
-        :param string:
-
-        :param mode <int>:
-        0 - (in all types) use only texture types
-        1 - (in all samples per type) use only texture samples
-        2 - (in all types and after in all samples per type) try find in ALL types, if did not, try find in samples per type
-        3 - (for each type and its samples) iterate by types. if not coincidence, iterate from samples of current type
-
-        :return: < string >
-        """
-
-
-        if mode == 0:
-            for type in self.textureSamples:
-                if string.find(type) != -1:
-                    return type
-            return ""
-
-        elif mode == 1:
-            for type in self.textureSamples:
-                for sample in self.textureSamples[type]:
-                    if string.find(sample) != -1:
-                        return type
-
-        elif mode == 2:
-            for type in self.textureSamples:
-                if string.find(type) != -1:
-                    return type
-            for type in self.textureSamples:
-                for sample in self.textureSamples[type]:
-                    if string.find(sample) != -1:
-                        return type
-
-        else:
-            for type in self.textureSamples:
-                if string.find(type) != -1:
-                    return type
-                else:
-                    for sample in self.textureSamples[type]:
-                        if string.find(sample) != -1:
-                            return type
-
-        return ""
-
-
-
-    def LODFromString(self, string, caseSense=True):
-
-        rx = QRegExp(self.LODRegExpPattern)
-        rx.setMinimal(False)
-        rx.setCaseSensitivity(Qt.CaseInsensitive)
-        if caseSense: rx.setCaseSensitivity(Qt.CaseSensitive)
-
-        index = rx.indexIn(string)
-        length = rx.matchedLength()
-
-        match = string[index:index+length]
-
-        return match
-
-
-
-    def textureSizeFromString(self, string):
-        for resolution in self.resolutionsMap:
-            if string.find(resolution) != -1:
-                res = self.resolutionsMap[resolution]
-                return res, res
-
-
-
-    def textureSizeFromFile(self, file_path):
-        if not os.path.isfile(file_path):
-            raise OSError(file_path + " is not a file")
-
-        image = cv.imread(file_path, 0)
-        shape = image.shape
-        h = shape[0]
-        w = shape[1]
-
-        return w, h
-
-
-
-    def textureSizeFromAnyFile(self, files_directory, extensions=["jpeg", "jpg", "tif", "tiff"]):
-        if not os.path.isdir(files_directory):
-            raise OSError(files_directory + " is not a directory")
-
-        for f in os.listdir(files_directory):
-            ext = self.extensionFromString(f)
-            if ext in extensions:
-                file = os.path.join(files_directory, f)
-                image = cv.imread(file, 0)
-                shape = image.shape
-                h = shape[0]
-                w = shape[1]
-                return w, h
-
-        return -1, -1
-
-
-
-    def textureAverageColor(self, filepath):
-        """
-        Read image and get average color
-        :param filepath: path to image file
-        :return <string>:  hex format color
-        """
-
-        img = cv.imread(filepath, 1)
-        avg_color_per_row = numpy.average(img, axis=0)
-        r, g, b = numpy.average(avg_color_per_row, axis=0)
-
-        r, g, b = int(r), int(g), int(b)
-
-        return rgb2hex(r, g, b)
-
-
-
-    def variationFromString(self, string, caseSense=True):
-        rx = QRegExp(self.variationRegExpPattern)
-        rx.setMinimal(False)
-        rx.setCaseSensitivity(Qt.CaseInsensitive)
-        if caseSense: rx.setCaseSensitivity(Qt.CaseSensitive)
-
-        index = rx.indexIn(string)
-        length = rx.matchedLength()
-
-        match = string[index:index+length]
-
-        return match
-
-
-
-    def makeDefaultRecords(self, uniqid, tags, classes, categories,
-                           groups, sets, companies, name, avg_color):
-        """
-        Create default records for asset
-
-        :return: list
-        """
-
-        return [
-            {
-                "key": "id",
-                "name": "ID",
-                "type": "string",
-                "value": uniqid
-            },
-            {
-                "key": "tags",
-                "name": "Tags",
-                "type": "list",
-                "value": tags
-            },
-            {
-                "key": "class",
-                "name": "Class",
-                "type": "list",
-                "value": classes
-            },
-            {
-                "key": "category",
-                "name": "Category",
-                "type": "list",
-                "value": categories
-            },
-            {
-                "key": "group",
-                "name": "Group",
-                "type": "list",
-                "value": groups
-            },
-            {
-                "key": "name",
-                "name": "Name",
-                "type": "string",
-                "value": name
-            },
-            {
-                "key": "company",
-                "name": "Company",
-                "type": "string",
-                "value": companies
-            },
-            {
-                "key": "set",
-                "name": "Set",
-                "type": "list",
-                "value": sets
-            },
-            {
-                "key": "color_avg",
-                "name": "Average color",
-                "type": "color",
-                "value": avg_color
-            },
-        ]
-
-
-
-
-
-
-if __name__ == '__main__':
-
-    import zipfile
-
-    cf = CommonFunctionality()
-    root = r"D:\cg\library\materials\poliigon\surface\Rock\RockGrey008_hires\RockGrey008_COL_VAR1_HIRES.jpg"
-    print(cf.textureAverageColor(root))
+import os
+import re
+import weakref
+import cv2 as cv
+from colormap import rgb2hex
+from Core.StringParser import LOD_PATTERN, VARIATION_PATTERN, firstMatch
+from Core.CommonFunctionality import uniqueID
+from Core.Serialization import Serializer, SerializationFormats
+from Core.ImageProcessing import colorStatistics
+from Core.ImageHeader import ImageHeader
+from Core.ArchiveManifest import ArchiveManifest
+from Core.TextureManagement import TextureTypeMatcher
+
+
+
+
+class CommonFunctionality(object):
+
+    def __init__(self):
+        """
+        This class provide common functions.
+
+        property "textureSamples": <dict> containing sample names for each type of
+                                    supported texture "texture_type": ["sample", ...]}
+                                    ( i.e. { "Albedo": [ 'Diffuse', 'diffuseColor' ] } )
+                                    search patterns are compiled on assignment, reassign
+                                    the dict after changing it in place
+        """
+        super(CommonFunctionality, self).__init__()
+
+        self._textureSamples = {}
+        self._textureMatcher = None
+
+        self.textureExtensions = ["jpg", "jpeg", "tif", "tiff", "tga", "exr", "png"]
+
+        self.geometryExtensions = ["fbx", "obj"]
+
+        self.LODRegExpPattern = LOD_PATTERN
+
+        self.variationRegExpPattern = VARIATION_PATTERN
+
+        self.resolutionsMap = {
+            "1K": 1024, "2K": 2048,
+            "3K": 3072, "4K": 4096,
+            "5K": 5120, "6K": 6144,
+            "7K": 7168, "8K": 8196
+        }
+
+        self.assetClasses = ["nature", "city", ]
+
+        self._manifests = weakref.WeakKeyDictionary()
+
+        self._regExps = {}
+
+
+
+    @property
+    def textureSamples(self):
+        return self._textureSamples
+
+    @textureSamples.setter
+    def textureSamples(self, samples):
+        self._textureSamples = samples
+        self._textureMatcher = None
+
+
+
+    def manifestFromZip(self, zipobj):
+        """
+        Return ArchiveManifest of zip archive. Members are classified once per
+        zipfile.ZipFile object and the manifest is reused by all map builders.
+
+        :param zipobj: zipfile.ZipFile() object
+        :return: ArchiveManifest
+        """
+
+        manifest = self._manifests.get(zipobj)
+
+        if manifest is None:
+            manifest = ArchiveManifest(zipobj.namelist(), self)
+            self._manifests[zipobj] = manifest
+
+        return manifest
+
+
+
+    def saveToJSON(self, obj, path, compact=False):
+        Serializer.save(obj, path, SerializationFormats.JSON, compact)
+
+
+
+    def uniqueID(self):
+        return uniqueID()
+
+
+
+    def isMatchedWithExtensions(self, string, extensions=[]):
+        extension = string.split(".")[-1]
+        return extension in extensions
+
+
+
+    def isImage(self, string):
+        return self.isMatchedWithExtensions(string, self.textureExtensions)
+
+
+
+    def isGeometry(self, string):
+        return self.isMatchedWithExtensions(string, self.geometryExtensions)
+
+
+
+    def extensionFromString(self, string):
+        """
+        Parse string and try to find file extension.
+        :param string:
+        :return: < string > file extension or empty
+        """
+
+        suffix = string.split(".")[-1]
+        return suffix
+
+
+
+    def textureTypeFromString(self, string, mode):
+        """
+        Parse string and try to find texture type
+
+        :param string:
+
+        :param mode <int>:
+        0 - (in all types) use only texture types
+        1 - (in all samples per type) use only texture samples
+        2 - (in all types and after in all samples per type) try find in ALL types, if did not, try find in samples per type
+        3 - (for each type and its samples) iterate by types. if not coincidence, iterate from samples of current type
+
+        :return: < string >
+        """
+
+        if self._textureMatcher is None:
+            self._textureMatcher = TextureTypeMatcher(self._textureSamples)
+
+        return self._textureMatcher.typeFromString(string, mode)
+
+
+
+    def _regExp(self, pattern, caseSense):
+        """
+        Compiled pattern, compiled once per pattern and case sensitivity
+        """
+        key = (pattern, caseSense)
+        regexp = self._regExps.get(key)
+
+        if regexp is None:
+            regexp = re.compile(pattern, 0 if caseSense else re.IGNORECASE)
+            self._regExps[key] = regexp
+
+        return regexp
+
+
+
+    def LODFromString(self, string, caseSense=True):
+        return firstMatch(self._regExp(self.LODRegExpPattern, caseSense), string)
+
+
+
+    def textureSizeFromString(self, string):
+        for resolution in self.resolutionsMap:
+            if string.find(resolution) != -1:
+                res = self.resolutionsMap[resolution]
+                return res, res
+
+
+
+    def textureSizeFromFile(self, file_path):
+        """
+        Width and height of image. Read from file header, image is decoded
+        only if its format is not supported by ImageHeader.
+
+        :param file_path: path to image file
+        :return: (width, height)
+        """
+
+        if not os.path.isfile(file_path):
+            raise OSError(file_path + " is not a file")
+
+        size = ImageHeader.sizeFromFile(file_path)
+        if size is not None:
+            return size
+
+        image = cv.imread(file_path, 0)
+        shape = image.shape
+        h = shape[0]
+        w = shape[1]
+
+        return w, h
+
+
+
+    def textureSizeFromZipMember(self, zipobj, name):
+        """
+        Width and height of archived image read from member header, nothing is extracted
+
+        :param zipobj: zipfile.ZipFile() object
+        :param name: name of archive member
+        :return: (width, height) or None if format is not supported
+        """
+
+        with zipobj.open(name) as stream:
+            return ImageHeader.sizeFromStream(stream, self.extensionFromString(name))
+
+
+
+    def textureSizeFromAnyFile(self, files_directory, extensions=["jpeg", "jpg", "tif", "tiff"]):
+        if not os.path.isdir(files_directory):
+            raise OSError(files_directory + " is not a directory")
+
+        for f in os.listdir(files_directory):
+            ext = self.extensionFromString(f)
+            if ext in extensions:
+                return self.textureSizeFromFile(os.path.join(files_directory, f))
+
+        return -1, -1
+
+
+
+    def _readReduced(self, filepath, reduction):
+        """
+        Read color image, decoded at 1/reduction resolution (JPEG DCT scaling).
+        cv decodes channels in BGR order, they are flipped to RGB here, so colors
+        match the ones measured by Core.ImageProcessing on PIL images.
+
+        :return: numpy array (h, w, 3) in RGB order
+        """
+
+        flags = {
+            1: cv.IMREAD_COLOR,
+            2: cv.IMREAD_REDUCED_COLOR_2,
+            4: cv.IMREAD_REDUCED_COLOR_4,
+            8: cv.IMREAD_REDUCED_COLOR_8
+        }
+
+        if reduction not in flags:
+            raise ValueError("Reduction must be one of 1, 2, 4, 8")
+
+        img = cv.imread(filepath, flags[reduction])
+
+        if img is None:
+            raise OSError("Can not read image " + filepath)
+
+        return img[:, :, ::-1]
+
+
+
+    def textureAverageColor(self, filepath, reduction=1):
+        """
+        Read image and get average color. Channels are in RGB order (pure red image
+        gives "#FF0000"), earlier versions reported cv's BGR channels as RGB,
+        so colors recorded by them have red and blue swapped.
+
+        :param filepath: path to image file
+        :param reduction: < int > 1, 2, 4 or 8, decode image at reduced resolution
+        :return <string>:  hex format color
+        """
+
+        img = self._readReduced(filepath, reduction)
+        r, g, b = img.reshape(-1, 3).mean(axis=0)
+
+        r, g, b = int(r), int(g), int(b)
+
+        return rgb2hex(r, g, b)
+
+
+
+    def textureStatistics(self, filepath, reduction=8, paletteSize=5):
+        """
+        Fast color statistics of texture for library color indexing
+
+        :param filepath: path to image file
+        :param reduction: < int > 1, 2, 4 or 8, decode image at reduced resolution
+        :param paletteSize: < int > number of dominant colors
+
+        :return: dict { "mean": hex, "min": (r, g, b), "max": (r, g, b), "palette": [hex, ...] }
+        """
+
+        stats = colorStatistics(self._readReduced(filepath, reduction), paletteSize)
+
+        stats["mean"] = rgb2hex(*[int(round(v)) for v in stats["mean"]])
+        stats["palette"] = [rgb2hex(*color) for color, weight in stats["palette"]]
+
+        return stats
+
+
+
+    def assetStatistics(self, textures):
+        """
+        CPU part of extraction: measure extracted textures
+
+        :param textures: dict { texture type: file path } of extracted textures
+        :return: dict { "width": int, "height": int, "average_color": hex, "palette": [hex, ...] },
+                 keys are missing if there is no texture to measure
+        """
+
+        statistics = {}
+        sizes = [self.textureSizeFromFile(path) for path in textures.values()]
+
+        if sizes:
+            statistics["width"], statistics["height"] = max(sizes)
+
+        if "albedo" in textures:
+            colors = self.textureStatistics(textures["albedo"])
+            statistics["average_color"] = colors["mean"]
+            statistics["palette"] = colors["palette"]
+
+        return statistics
+
+
+
+    def variationFromString(self, string, caseSense=True):
+        return firstMatch(self._regExp(self.variationRegExpPattern, caseSense), string)
+
+
+
+    def makeDefaultRecords(self, uniqid, tags, classes, categories,
+                           groups, sets, companies, name, avg_color):
+        """
+        Create default records for asset
+
+        :return: list
+        """
+
+        return [
+            {
+                "key": "id",
+                "name": "ID",
+                "type": "string",
+                "value": uniqid
+            },
+            {
+                "key": "tags",
+                "name": "Tags",
+                "type": "list",
+                "value": tags
+            },
+            {
+                "key": "class",
+                "name": "Class",
+                "type": "list",
+                "value": classes
+            },
+            {
+                "key": "category",
+                "name": "Category",
+                "type": "list",
+                "value": categories
+            },
+            {
+                "key": "group",
+                "name": "Group",
+                "type": "list",
+                "value": groups
+            },
+            {
+                "key": "name",
+                "name": "Name",
+                "type": "string",
+                "value": name
+            },
+            {
+                "key": "company",
+                "name": "Company",
+                "type": "string",
+                "value": companies
+            },
+            {
+                "key": "set",
+                "name": "Set",
+                "type": "list",
+                "value": sets
+            },
+            {
+                "key": "color_avg",
+                "name": "Average color",
+                "type": "color",
+                "value": avg_color
+            },
+        ]
+
+
+
+
+
+
+if __name__ == '__main__':
+
+    import zipfile
+
+    cf = CommonFunctionality()
+    root = r"D:\cg\library\materials\poliigon\surface\Rock\RockGrey008_hires\RockGrey008_COL_VAR1_HIRES.jpg"
+    print(cf.textureAverageColor(root))
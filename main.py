@@ -0,0 +1,237 @@
+from __future__ import print_function
+
+import argparse
+import logging
+import sys
+import os
+
+
+
+def ingest(args):
+    from Quixel.quixel_ingest import QuixelIngestManager
+    from Core.ExtractionProfile import ExtractionProfile
+
+    manager = QuixelIngestManager()
+    manager.workers = args.workers
+
+    if args.profile == "preview":
+        manager.extractionProfile = ExtractionProfile.previewLibrary(args.max_resolution or 1024)
+    elif args.max_resolution:
+        manager.extractionProfile = ExtractionProfile(maxResolution=args.max_resolution)
+
+    if not args.full:
+        manager.indexFile = args.index or os.path.join(args.destination, "archives.db")
+
+    manager.catalogueFile = args.catalogue
+    manager.writeInfoFiles = not args.no_info_files
+    manager.infoFileFormat = args.info_format
+    manager.computeStatistics = args.statistics
+    manager.replaceStale = args.replace_stale
+
+    tasks = manager.discoverLibrary(args.library, args.destination, args.classes, args.types)
+    total = len(tasks)
+    failed = []
+    skipped = []
+    succeeded = []
+
+    def report(result):
+        done = report.count = report.count + 1
+        if result.skipped:
+            skipped.append(result)
+        elif result.success:
+            succeeded.append(result)
+            print("[%d/%d] OK    %s -> %s" % (done, total, result.task.archive, result.folder))
+        else:
+            failed.append(result)
+            print("[%d/%d] FAIL  %s" % (done, total, result.task.archive), file=sys.stderr)
+
+    report.count = 0
+
+    if args.pipeline:
+        from Core.IngestManagement import IngestPipeline
+
+        pipeline = IngestPipeline(manager)
+        pipeline.ioWorkers = args.io_workers
+        pipeline.run(tasks, callback=report)
+    else:
+        manager.run(tasks, callback=report)
+
+    for result in failed:
+        print("\n" + result.task.archive + "\n" + result.error, file=sys.stderr)
+
+    print("%d assets ingested, %d unchanged, %d failed" % (
+        total - len(failed) - len(skipped), len(skipped), len(failed)))
+
+    if args.proxies:
+        folders = [result.folder for result in skipped] + [result.folder for result in succeeded]
+        if makeProxies(folders, args.workers, args.catalogue):
+            return 1
+
+    return 1 if failed else 0
+
+
+
+def makeProxies(folders, workers, catalogue=""):
+    from Core.ProxyGeneration import ProxyGenerator
+    from Core.LibraryCatalogue import LibraryCatalogue
+
+    generator = ProxyGenerator()
+    generator.workers = workers
+
+    if catalogue:
+        generator.catalogue = LibraryCatalogue(catalogue)
+
+    failed = generator.process(folders)
+
+    for source, error in failed:
+        print("\n" + source + "\n" + error, file=sys.stderr)
+
+    print("proxies of %d assets updated, %d textures failed" % (len(folders), len(failed)))
+
+    return failed
+
+
+
+def libraryFolders(args):
+    from Core.LibraryCatalogue import LibraryCatalogue
+    from Core.Serialization import Serializer
+
+    if args.catalogue:
+        return [asset.folder for asset in LibraryCatalogue(args.catalogue).load().values()]
+
+    folders = [os.path.join(args.library, f) for f in sorted(os.listdir(args.library))]
+    return [f for f in folders if Serializer.infoFile(f)]
+
+
+
+def proxies(args):
+    return 1 if makeProxies(libraryFolders(args), args.workers, args.catalogue) else 0
+
+
+
+def geometry(args):
+    from Core.GeometryAnalysis import GeometryAnalyzer
+    from Core.LibraryCatalogue import LibraryCatalogue
+
+    folders = libraryFolders(args)
+
+    analyzer = GeometryAnalyzer()
+    analyzer.workers = args.workers
+
+    if args.catalogue:
+        analyzer.catalogue = LibraryCatalogue(args.catalogue)
+
+    empty = []
+    failed = analyzer.process(folders, emptyCallback=empty.append)
+
+    for path, error in failed:
+        print("\n" + path + "\n" + error, file=sys.stderr)
+
+    print("geometry of %d assets analyzed, %d without geometry files, %d files failed" % (
+        len(folders) - len(empty), len(empty), len(failed)))
+
+    return 1 if failed else 0
+
+
+
+def search(args):
+    from Core.LibraryCatalogue import LibraryCatalogue
+    from Core.LibrarySearch import LibrarySearch
+
+    catalogue = LibraryCatalogue(args.catalogue)
+    index = LibrarySearch.fromCatalogue(catalogue)
+
+    fields = dict((field, getattr(args, field)) for field in ("tags", "categories", "sets", "regions") if getattr(args, field))
+
+    found = index.find(
+        terms=args.terms, tileable=True if args.tileable else None, minResolution=args.min_resolution,
+        color=args.color, maxColorDistance=args.max_color_distance, limit=args.limit, **fields
+    )
+
+    for assetID in found:
+        print("%s  %s" % (assetID, catalogue.asset(assetID).folder))
+
+    return 0
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Asset library scripter")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    cmd = commands.add_parser("ingest", help="extract Megascans download tree to library")
+    cmd.add_argument("library", help="Megascans root folder (contains surface/atlas/3d/3dplant)")
+    cmd.add_argument("destination", help="destination library folder")
+    cmd.add_argument("--types", nargs="+", default=None,
+                     choices=["surface", "atlas", "3d", "3dplant"], help="asset types to ingest")
+    cmd.add_argument("--classes", nargs="+", default=[], help="classes to which assets belong")
+    cmd.add_argument("--workers", type=int, default=0, help="worker processes (default: cpu count)")
+    cmd.add_argument("--profile", default="full", choices=["full", "preview"],
+                     help="members to extract: everything or lightweight preview library maps")
+    cmd.add_argument("--max-resolution", type=int, default=0,
+                     help="extract only one resolution of every map, not greater than this if possible")
+    cmd.add_argument("--index", default="", help="archive index database (default: <destination>/archives.db)")
+    cmd.add_argument("--full", action="store_true", help="ignore archive index and extract every archive")
+    cmd.add_argument("--replace-stale", action="store_true",
+                     help="remove asset folder of previous ingest of changed archive")
+    cmd.add_argument("--proxies", action="store_true",
+                     help="generate reduced texture proxies and contact sheet thumbnail of ingested assets")
+    cmd.add_argument("--catalogue", default="", help="library catalogue database to add asset info to")
+    cmd.add_argument("--no-info-files", action="store_true",
+                     help="do not write info files to asset folders (requires --catalogue)")
+    cmd.add_argument("--statistics", action="store_true",
+                     help="measure extracted textures: resolution, average color and palette of albedo")
+    cmd.add_argument("--pipeline", action="store_true",
+                     help="overlap archive reading / writing (I/O threads) with texture statistics (worker processes)")
+    cmd.add_argument("--io-workers", type=int, default=4, help="I/O threads of --pipeline")
+    cmd.add_argument("--info-format", default="json", choices=["json", "msgpack", "cbor"],
+                     help="format of asset info files: info.json or binary info.msgpack / info.cbor")
+    cmd.set_defaults(func=ingest)
+
+    cmd = commands.add_parser("proxies", help="generate texture proxies of extracted library")
+    cmd.add_argument("library", help="library folder (contains asset folders with info files)")
+    cmd.add_argument("--workers", type=int, default=0, help="worker processes (default: cpu count)")
+    cmd.add_argument("--catalogue", default="", help="library catalogue database to take assets from and record to")
+    cmd.set_defaults(func=proxies)
+
+    cmd = commands.add_parser("geometry", help="record point/polygon counts, bounds and units of library geometry")
+    cmd.add_argument("library", help="library folder (contains asset folders with info files)")
+    cmd.add_argument("--workers", type=int, default=0, help="worker processes (default: cpu count)")
+    cmd.add_argument("--catalogue", default="", help="library catalogue database to take assets from and record to")
+    cmd.set_defaults(func=geometry)
+
+    cmd = commands.add_parser("search", help="search assets of library catalogue")
+    cmd.add_argument("catalogue", help="library catalogue database")
+    cmd.add_argument("terms", nargs="*", help="words matched with tags, categories, sets, regions or asset name")
+    cmd.add_argument("--tags", nargs="+", default=[], help="required tags")
+    cmd.add_argument("--categories", nargs="+", default=[], help="required categories")
+    cmd.add_argument("--sets", nargs="+", default=[], help="required sets")
+    cmd.add_argument("--regions", nargs="+", default=[], help="required regions")
+    cmd.add_argument("--tileable", action="store_true", help="tileable assets only")
+    cmd.add_argument("--min-resolution", type=int, default=0, help="minimal texture resolution (longest side)")
+    cmd.add_argument("--color", default=None, help="hex color, results are ordered by distance from it")
+    cmd.add_argument("--max-color-distance", type=float, default=None, help="maximal L*a*b* distance from --color")
+    cmd.add_argument("--limit", type=int, default=20, help="maximal number of results (0: all)")
+    cmd.set_defaults(func=search)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "ingest" and args.no_info_files and not args.catalogue:
+        parser.error("--no-info-files requires --catalogue")
+
+    if args.command == "ingest":
+        from Core.Serialization import Serializer
+
+        if args.info_format not in Serializer.availableFormats():
+            parser.error("--info-format %s: package is not installed" % args.info_format)
+
+    # removed stale asset folders are reported
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    return args.func(args)
+
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# modules are imported from repository root as main.py does (i.e. "from Core.X import Y")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
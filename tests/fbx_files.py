@@ -0,0 +1,159 @@
+from Core.FBXBinary import FBX_MAGIC, FBX_VERSION_64BIT
+
+import numpy
+import struct
+import zlib
+
+
+
+# writer of synthetic FBX binary files for reader tests and benchmarks
+
+
+def _properties(properties):
+    data = b""
+
+    for p in properties:
+        if isinstance(p, bytes):
+            data += b"S" + struct.pack("<I", len(p)) + p
+        elif isinstance(p, float):
+            data += b"D" + struct.pack("<d", p)
+        elif isinstance(p, int):
+            data += b"L" + struct.pack("<q", p)
+        else:
+            raw = zlib.compress(p.tobytes(), 1)
+            data += {"f8": b"d", "i4": b"i"}[p.dtype.str[1:]] + struct.pack("<III", len(p), 1, len(raw)) + raw
+
+    return data
+
+
+def node(name, properties=(), children=()):
+    """
+    :return: callable(offset, version) returning node record bytes
+    """
+
+    def record(offset, version):
+        wide = version >= FBX_VERSION_64BIT
+        header = (25 if wide else 13) + len(name)
+        data = _properties(properties)
+
+        body = b""
+        for child in children:
+            body += child(offset + header + len(data) + len(body), version)
+        if children:
+            body += b"\x00" * (25 if wide else 13)
+
+        end = offset + header + len(data) + len(body)
+        fmt = "<QQQB" if wide else "<IIIB"
+
+        return struct.pack(fmt, end, len(properties), len(data), len(name)) + name + data + body
+
+    return record
+
+
+def mesh(name, vertices, polygons, translation=None, rotation=None, scaling=None):
+    """
+    :param name: model name (i.e. "Rock_LOD0")
+    :param vertices: sequence of (x, y, z)
+    :param polygons: sequence of vertex index lists
+    :param translation: Lcl Translation of model, rotation (degrees) and scaling likewise
+    """
+
+    return {
+        "name": name,
+        "vertices": numpy.asarray(vertices, dtype=numpy.float64),
+        "polygons": polygons,
+        "translation": translation,
+        "rotation": rotation,
+        "scaling": scaling
+    }
+
+
+def _indices(polygons):
+    indices = []
+
+    for polygon in polygons:
+        indices.extend(polygon[:-1])
+        indices.append(-polygon[-1] - 1)
+
+    return numpy.array(indices, dtype=numpy.int32)
+
+
+def _model(id, name, kind, item):
+    properties = []
+
+    for key, value in (("Lcl Translation", item.get("translation")), ("Lcl Rotation", item.get("rotation")),
+                       ("Lcl Scaling", item.get("scaling"))):
+        if value is not None:
+            properties.append(node(b"P", (key.encode(), key.encode(), b"", b"A") + tuple(float(v) for v in value)))
+
+    children = [node(b"Properties70", (), properties)] if properties else []
+
+    return node(b"Model", (id, (name + "\x00\x01Model").encode(), kind), children)
+
+
+def fbxData(meshes, version=7400, unitScale=1.0, lodGroup=""):
+    """
+    FBX binary file with one geometry and model per mesh
+
+    :param meshes: list of mesh()
+    :param version: FBX version, 64 bit node records since 7500
+    :param unitScale: GlobalSettings UnitScaleFactor (centimeters per unit)
+    :param lodGroup: name of LodGroup model, meshes are its levels in order if set
+    :return: < bytes >
+    """
+
+    objects = []
+    connections = []
+    root = 0
+
+    if lodGroup:
+        root = 1000
+        objects.append(_model(root, lodGroup, b"LodGroup", {}))
+        connections.append(node(b"C", (b"OO", root, 0)))
+
+    for i, item in enumerate(meshes):
+        geometry, model = 2 * i + 1, 2 * i + 2
+
+        objects.append(node(b"Geometry", (geometry, b"\x00\x01Geometry", b"Mesh"), [
+            node(b"Vertices", (item["vertices"].reshape(-1),)),
+            node(b"PolygonVertexIndex", (_indices(item["polygons"]),)),
+            node(b"LayerElementNormal", (0,), [node(b"Normals", (item["vertices"].reshape(-1),))])
+        ]))
+        objects.append(_model(model, item["name"], b"Mesh", item))
+
+        connections.append(node(b"C", (b"OO", geometry, model)))
+        connections.append(node(b"C", (b"OO", model, root)))
+
+    sections = [
+        node(b"FBXHeaderExtension", (), [node(b"FBXVersion", (version,))]),
+        node(b"GlobalSettings", (), [node(b"Properties70", (), [
+            node(b"P", (b"UnitScaleFactor", b"double", b"Number", b"", float(unitScale)))
+        ])]),
+        node(b"Objects", (), objects),
+        node(b"Connections", (), connections)
+    ]
+
+    data = FBX_MAGIC + b"\x1a\x00" + struct.pack("<I", version)
+    for section in sections:
+        data += section(len(data), version)
+    data += b"\x00" * (25 if version >= FBX_VERSION_64BIT else 13)
+
+    return data
+
+
+def writeFBX(path, meshes, **kwargs):
+    with open(path, "wb") as f:
+        f.write(fbxData(meshes, **kwargs))
+
+    return path
+
+
+def triangles(count, size=100.0, seed=0):
+    """
+    Random triangle soup: (vertices, polygons) of "count" points
+    """
+
+    vertices = numpy.random.RandomState(seed).rand(count, 3) * size
+    polygons = [[i, (i + 1) % count, (i + 2) % count] for i in range(0, count, 3)]
+
+    return vertices, polygons
@@ -0,0 +1,179 @@
+from Core.ArchiveIndex import ArchiveIndex
+from Core.ExtractionProfile import ExtractionProfile
+from Core.LibraryCatalogue import LibraryCatalogue
+
+import pytest
+import zipfile
+import sqlite3
+import quixel
+import json
+import os
+
+
+
+def _surface(path, albedo=b"albedo"):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("Rock.json", json.dumps({"tags": ["rock"], "meta": [{"key": "tileable", "value": True}]}))
+        archive.writestr("Rock_2K_Albedo.jpg", albedo)
+        archive.writestr("Rock_2K_Normal.jpg", b"normal")
+
+    return path
+
+
+def _parser(tmp_path, replaceStale=True):
+    parser = quixel.QuixelParser()
+    parser.archiveIndex = ArchiveIndex(str(tmp_path / "index.db"))
+    parser.catalogue = LibraryCatalogue(str(tmp_path / "catalogue.db"))
+    parser.replaceStale = replaceStale
+    return parser
+
+
+def _folder(library, name="asset"):
+    folder = os.path.join(library, name)
+    os.makedirs(folder)
+    return folder
+
+
+def test_profile_is_part_of_fingerprint(tmp_path):
+    path = _surface(str(tmp_path / "Rock_sfjmafua_2K_surface_ms.zip"))
+    library = str(tmp_path / "library")
+    folder = _folder(library)
+    index = ArchiveIndex(str(tmp_path / "index.db"))
+    preview = ExtractionProfile.previewLibrary()
+
+    index.record(path, folder)
+
+    assert index.lookup(path, library) == folder
+    assert index.lookup(path, library, ExtractionProfile()) == ""
+
+    index.record(path, folder, profile=preview)
+
+    assert index.lookup(path, library) == ""
+    assert index.lookup(path, library, ExtractionProfile.previewLibrary()) == folder
+    assert index.lookup(path, library, ExtractionProfile.previewLibrary(2048)) == ""
+
+    index.close()
+
+
+def test_destination_is_part_of_key(tmp_path):
+    path = _surface(str(tmp_path / "Rock_sfjmafua_2K_surface_ms.zip"))
+    first = _folder(str(tmp_path / "first"))
+    second = _folder(str(tmp_path / "second"))
+    index = ArchiveIndex(str(tmp_path / "index.db"))
+
+    index.record(path, first)
+
+    assert index.lookup(path, str(tmp_path / "second")) == ""
+    assert index.folder(path, str(tmp_path / "second")) == ""
+
+    index.record(path, second)
+
+    assert index.lookup(path, str(tmp_path / "first")) == first
+    assert index.lookup(path, str(tmp_path / "second")) == second
+
+    index.remove(path, str(tmp_path / "first"))
+
+    assert index.lookup(path, str(tmp_path / "first")) == ""
+    assert index.lookup(path, str(tmp_path / "second")) == second
+
+    index.close()
+
+
+@pytest.mark.parametrize("profile", [False, True])
+def test_index_keyed_by_path_only(tmp_path, profile):
+    path = _surface(str(tmp_path / "Rock_sfjmafua_2K_surface_ms.zip"))
+    library = str(tmp_path / "library")
+    folder = _folder(library)
+    database = str(tmp_path / "index.db")
+
+    index = ArchiveIndex(str(tmp_path / "current.db"))
+    index.record(path, folder)
+    size, mtime, crc = index._db().execute("SELECT size, mtime, crc FROM archives").fetchone()
+    index.close()
+
+    connection = sqlite3.connect(database)
+    connection.execute(
+        "CREATE TABLE archives (path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, crc TEXT, folder TEXT%s)"
+        % (", profile TEXT DEFAULT ''" if profile else ""))
+    connection.execute(
+        "INSERT INTO archives (path, size, mtime, crc, folder) VALUES (?, ?, ?, ?, ?)",
+        (ArchiveIndex._key(path), size, mtime, crc, folder))
+    connection.commit()
+    connection.close()
+
+    index = ArchiveIndex(database)
+
+    assert index.lookup(path, library) == folder
+    assert index.lookup(path, str(tmp_path / "other")) == ""
+
+    index.close()
+
+
+def test_changed_archive_replaces_asset_folder(tmp_path):
+    path = _surface(str(tmp_path / "Rock_sfjmafua_2K_surface_ms.zip"))
+    library = str(tmp_path / "library")
+    parser = _parser(tmp_path)
+
+    first = parser.extractSurfaceAsset(path, library, ["nature"], "Rock")
+
+    assert parser.extractSurfaceAsset(path, library, ["nature"], "Rock") == first
+
+    _surface(path, b"new albedo")
+    second = parser.extractSurfaceAsset(path, library, ["nature"], "Rock")
+
+    assert second != first
+    assert not os.path.exists(first)
+    assert os.listdir(library) == [os.path.basename(second)]
+    assert [asset.folder for asset in parser.catalogue.load().values()] == [second]
+
+    parser.catalogue.close()
+    parser.archiveIndex.close()
+
+
+def test_changed_archive_keeps_asset_folder_by_default(tmp_path):
+    path = _surface(str(tmp_path / "Rock_sfjmafua_2K_surface_ms.zip"))
+    library = str(tmp_path / "library")
+    parser = _parser(tmp_path, replaceStale=False)
+
+    first = parser.extractSurfaceAsset(path, library, ["nature"], "Rock")
+
+    _surface(path, b"new albedo")
+    second = parser.extractSurfaceAsset(path, library, ["nature"], "Rock")
+
+    assert sorted(os.listdir(library)) == sorted([os.path.basename(first), os.path.basename(second)])
+    assert parser.archiveIndex.lookup(path, library) == second
+    assert len(parser.catalogue) == 2
+
+    parser.catalogue.close()
+    parser.archiveIndex.close()
+
+
+def test_discard_folder_outside_library(tmp_path):
+    stale = _folder(str(tmp_path / "other"))
+    folder = _folder(str(tmp_path / "library"))
+
+    assert not ArchiveIndex.discardFolder(stale, folder)
+    assert os.path.isdir(stale)
+
+    assert ArchiveIndex.discardFolder(_folder(str(tmp_path / "library"), "stale"), folder)
+    assert os.listdir(str(tmp_path / "library")) == ["asset"]
+
+
+def test_other_profile_extracts_again(tmp_path):
+    path = _surface(str(tmp_path / "Rock_sfjmafua_2K_surface_ms.zip"))
+    library = str(tmp_path / "library")
+    parser = _parser(tmp_path)
+    albedo = ExtractionProfile(textureTypes=["albedo"])
+
+    first = parser.extractSurfaceAsset(path, library, ["nature"], "Rock", albedo)
+    assert sorted(os.listdir(first)) == ["albedo.jpg", "info.json"]
+
+    second = parser.extractSurfaceAsset(path, library, ["nature"], "Rock")
+    assert sorted(os.listdir(second)) == ["albedo.jpg", "info.json", "normal.jpg"]
+
+    assert not os.path.exists(first)
+    assert parser.extractSurfaceAsset(path, library, ["nature"], "Rock") == second
+    assert len(parser.catalogue) == 1
+
+    parser.catalogue.close()
+    parser.archiveIndex.close()
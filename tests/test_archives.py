@@ -0,0 +1,131 @@
+from Core.ArchivesManager import ArchiveFileManager
+
+import zipfile
+import pytest
+import os
+
+
+
+def _manager(path):
+    manager = ArchiveFileManager()
+    manager.archiveFile = path
+    manager.open()
+    return manager
+
+
+def test_extract_renames_members(tmp_path):
+    path = str(tmp_path / "asset.zip")
+
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("textures/albedo.jpg", b"albedo")
+        archive.writestr("preview.png", b"preview")
+
+    target = tmp_path / "out"
+    manager = _manager(path)
+    manager.extract(str(target), {"textures/albedo.jpg": "Albedo", "preview.png": ""})
+    manager.close()
+
+    assert (target / "Albedo.jpg").read_bytes() == b"albedo"
+    assert (target / "preview.png").read_bytes() == b"preview"
+
+
+@pytest.mark.parametrize("name, new_name", [
+    ("../../evil.txt", ""),
+    ("../../evil.txt", "../../evil.txt"),
+    ("/tmp/evil.txt", ""),
+    ("C:/evil.txt", ""),
+    ("safe.txt", "../evil")
+])
+def test_extract_refuses_paths_out_of_directory(tmp_path, name, new_name):
+    path = str(tmp_path / "evil.zip")
+
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(name, b"evil")
+
+    target = tmp_path / "a" / "b"
+    manager = _manager(path)
+
+    with pytest.raises(IOError):
+        manager.extract(str(target), {name: new_name})
+
+    manager.close()
+
+    written = [os.path.join(root, f) for root, dirs, files in os.walk(str(tmp_path)) for f in files]
+    assert written == [path]
+
+
+def _tar(path, name, compression):
+    import tarfile
+    import io
+
+    data = b"evil"
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+
+    if compression == "zst":
+        zstandard = pytest.importorskip("zstandard")
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as tar:
+            tar.addfile(info, io.BytesIO(data))
+        with open(path, "wb") as f:
+            f.write(zstandard.ZstdCompressor().compress(buffer.getvalue()))
+    else:
+        with tarfile.open(path, "w:" + compression) as tar:
+            tar.addfile(info, io.BytesIO(data))
+
+
+@pytest.mark.parametrize("compression", ["", "gz", "zst"])
+def test_extract_stream_refuses_paths_out_of_directory(tmp_path, compression):
+    path = str(tmp_path / ("evil.tar." + compression if compression else "evil.tar"))
+    _tar(path, "../../evil2.txt", compression)
+
+    manager = ArchiveFileManager()
+    manager.archiveFile = path
+
+    with pytest.raises(IOError):
+        manager.extractStream(str(tmp_path / "a" / "b"), {"../../evil2.txt": ""})
+
+    manager.open()
+
+    with pytest.raises(IOError):
+        manager.extractMember(str(tmp_path / "a" / "b"), "../../evil2.txt")
+
+    manager.close()
+
+    written = [os.path.join(root, f) for root, dirs, files in os.walk(str(tmp_path)) for f in files]
+    assert written == [path]
+
+
+def test_handle_pool_concurrent_reads(tmp_path):
+    from Core.ArchivesManager import ArchiveHandlePool
+    from concurrent.futures import ThreadPoolExecutor
+    import threading
+
+    path = str(tmp_path / "maps.zip")
+    members = dict(("Rock_4K_Map%d.jpg" % i, os.urandom(50000 + i)) for i in range(16))
+
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+    pool = ArchiveHandlePool()
+
+    def read(name):
+        with pool.handle(path) as archive:
+            with archive.open(name) as member:
+                return archive, threading.get_ident(), member.read(7000) + member.read()
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(read, sorted(members) * 20))
+
+    for name, (archive, thread, data) in zip(sorted(members) * 20, results):
+        assert data == members[name]
+
+    # one archive object per thread
+    assert len(set(id(archive) for archive, thread, data in results)) == len(set(thread for archive, thread, data in results))
+    assert all(archive.fp is not None for archive, thread, data in results)
+
+    pool.capacity = 0
+
+    assert len(pool) == 0
+    assert all(archive.fp is None for archive, thread, data in results)
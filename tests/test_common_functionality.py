@@ -0,0 +1,41 @@
+from common_functionality import CommonFunctionality
+
+from PIL import Image
+import pytest
+
+
+
+@pytest.mark.parametrize("reduction", [1, 8])
+def test_texture_colors_are_rgb(tmp_path, reduction):
+    path = str(tmp_path / "red.png")
+    Image.new("RGB", (64, 64), (255, 0, 0)).save(path)
+
+    functionality = CommonFunctionality()
+    statistics = functionality.textureStatistics(path, reduction)
+
+    assert functionality.textureAverageColor(path, reduction).upper() == "#FF0000"
+    assert statistics["mean"].upper() == "#FF0000"
+    assert statistics["palette"] == ["#FF0000"]
+    assert statistics["min"] == statistics["max"] == (255, 0, 0)
+
+
+def test_jpeg_colors_are_rgb(tmp_path):
+    path = str(tmp_path / "red.jpg")
+    Image.new("RGB", (64, 64), (255, 0, 0)).save(path)
+
+    r, g, b = CommonFunctionality().textureStatistics(path)["max"]
+
+    assert r > 250 and g < 5 and b < 5
+
+
+def test_unreadable_texture(tmp_path):
+    path = str(tmp_path / "broken.png")
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n broken")
+
+    with pytest.raises(OSError):
+        CommonFunctionality().textureAverageColor(path)
+
+    with pytest.raises(ValueError):
+        CommonFunctionality().textureAverageColor(path, reduction=3)
@@ -0,0 +1,26 @@
+from Core.ExtractionProfile import ExtractionProfile
+from Core.ArchiveManifest import ArchiveMember
+
+
+
+def _member(name, textureType, lod="", variation=""):
+    member = ArchiveMember(name)
+    member.textureType = textureType
+    member.lod = lod
+    member.variation = variation
+    return member
+
+
+def test_filters_are_case_insensitive():
+    members = [
+        _member("a_Albedo_VAR1.jpg", "albedo", variation="VAR1"),
+        _member("a_Albedo_var2.jpg", "albedo", variation="var2"),
+        _member("a_Normal_var1_lod0.JPG", "normal", lod="lod0", variation="var1"),
+        _member("a_Normal_LOD1.png", "normal", lod="LOD1")
+    ]
+
+    profile = ExtractionProfile.previewLibrary(0)
+
+    assert [member.name for member in profile.selectTextures(members)] == ["a_Albedo_VAR1.jpg", "a_Normal_var1_lod0.JPG"]
+    assert ExtractionProfile(variations=["var1"]).fingerprint() == ExtractionProfile(variations=["VAR1"]).fingerprint()
+    assert ExtractionProfile(variations=["var1"]).fingerprint() != ExtractionProfile(variations=["var2"]).fingerprint()
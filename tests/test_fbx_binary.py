@@ -0,0 +1,100 @@
+from Core.FBXBinary import FBXBinaryReader, isBinaryFBX
+from fbx_files import mesh, triangles, writeFBX
+
+import pytest
+
+
+
+QUAD = [(0, 0, 0), (2, 0, 0), (2, 3, 0), (0, 3, 0)]
+
+
+def _read(path):
+    reader = FBXBinaryReader()
+    reader.importFile(path)
+    return reader
+
+
+@pytest.mark.parametrize("version", [7400, 7500])
+def test_statistics(tmp_path, version):
+    vertices, polygons = triangles(300, seed=1)
+    path = writeFBX(str(tmp_path / "Rock.fbx"), [
+        mesh("Rock", vertices, polygons),
+        mesh("Cap", QUAD, [[0, 1, 2, 3]])
+    ], version=version, unitScale=100.0)
+
+    reader = _read(path)
+
+    assert isBinaryFBX(path)
+    assert reader.scenePointsCount() == 304
+    assert reader.scenePolygonsCount() == 101
+    assert reader.sceneUnits() == "m"
+    assert reader.sceneBoundsMinMax() == (
+        tuple(round(float(v), 3) for v in vertices.min(axis=0).clip(max=0)),
+        tuple(round(float(v), 3) for v in vertices.max(axis=0))
+    )
+    assert reader.LODCounts() == [(304, 101)]
+
+
+@pytest.mark.parametrize("scale, units", [(0.1, "mm"), (1.0, "cm"), (2.54, "inch"), (3.0, "")])
+def test_units(tmp_path, scale, units):
+    path = writeFBX(str(tmp_path / "Rock.fbx"), [mesh("Rock", QUAD, [[0, 1, 2, 3]])], unitScale=scale)
+    assert _read(path).sceneUnits() == units
+
+
+@pytest.mark.parametrize("version", [7400, 7500])
+def test_lod_group_order(tmp_path, version):
+    # levels are children of LOD group in connection order, whatever their names
+    path = writeFBX(str(tmp_path / "Rock.fbx"), [
+        mesh("Rock_LOD2", QUAD, [[0, 1, 2, 3]]),
+        mesh("Rock_LOD0", QUAD[:3], [[0, 1, 2]]),
+        mesh("Rock_LOD1", QUAD + [(1, 1, 1), (1, 2, 1)], [[0, 1, 2], [2, 3, 4, 5]])
+    ], version=version, lodGroup="Rock_LODGroup")
+
+    assert _read(path).LODCounts() == [(4, 1), (3, 1), (6, 2)]
+
+
+def test_lod_names(tmp_path):
+    path = writeFBX(str(tmp_path / "Rock.fbx"), [
+        mesh("Rock_LOD1", QUAD[:3], [[0, 1, 2]]),
+        mesh("Rock_LOD0", QUAD, [[0, 1, 2], [0, 2, 3]]),
+        mesh("Stone_LOD0", QUAD, [[0, 1, 2, 3]])
+    ])
+
+    assert _read(path).LODCounts() == [(8, 3), (3, 1)]
+
+
+def test_transforms(tmp_path):
+    path = writeFBX(str(tmp_path / "Rock.fbx"), [
+        mesh("Moved", QUAD, [[0, 1, 2, 3]], translation=(10, 0, 5)),
+        mesh("Turned", QUAD, [[0, 1, 2, 3]], rotation=(0, 0, 90), scaling=(2, 2, 2)),
+        mesh("Tilted", QUAD, [[0, 1, 2, 3]], rotation=(90, 0, 0), translation=(0, -20, 0))
+    ])
+
+    reader = _read(path)
+
+    # Moved: x 10..12, y 0..3, z 5; Turned: x -6..0, y 0..4, z 0; Tilted: y -20, z 0..3
+    assert reader.sceneBoundsMinMax() == ((-6.0, -20.0, 0.0), (12.0, 4.0, 5.0))
+    assert reader.sceneBounds() == (18.0, 24.0, 5.0)
+
+
+def test_not_fbx(tmp_path):
+    path = str(tmp_path / "Rock.fbx")
+
+    with open(path, "wb") as f:
+        f.write(b"; FBX 7.4.0 project file")
+
+    assert not isBinaryFBX(path)
+
+    with pytest.raises(IOError):
+        _read(path)
+
+
+def test_default_transforms_keep_bounds(tmp_path):
+    path = writeFBX(str(tmp_path / "Rock.fbx"), [
+        mesh("Rock", QUAD, [[0, 1, 2, 3]], translation=(0, 0, 0), rotation=(0, 0, 0), scaling=(1, 1, 1))
+    ])
+
+    reader = _read(path)
+
+    assert reader._worldMatrix(reader._parents[reader._geometries[0]["id"]]) is None
+    assert reader.sceneBoundsMinMax() == ((0.0, 0.0, 0.0), (2.0, 3.0, 0.0))
@@ -0,0 +1,121 @@
+from Core.GeometryAnalysis import GeometryAnalyzer
+from Core.Serialization import Serializer
+from fbx_files import mesh, writeFBX
+
+import os
+
+
+
+def _result(lods, minimum=(0, 0, 0), maximum=(1, 1, 1), units="cm"):
+    return {"units": units, "min": list(minimum), "max": list(maximum), "lods": [list(counts) for counts in lods]}
+
+
+def _geometry(info):
+    groups = dict((group["group"], dict((r["name"], r["value"]) for r in group["records"])) for group in info)
+    return groups["Meshes"], groups["Bound"]
+
+
+QUAD = [(0, 0, 0), (2, 0, 0), (2, 3, 0), (0, 3, 0)]
+
+
+def test_lod_from_file_name():
+    geometry = GeometryAnalyzer.geometryFromResults({
+        "asset/Rock_LOD1.fbx": _result([(40, 20)]),
+        "asset/Rock_LOD0.fbx": _result([(400, 200)])
+    })
+
+    assert geometry["points"] == [400, 40]
+    assert geometry["polygons"] == [200, 20]
+
+
+def test_lod_from_hierarchy():
+    geometry = GeometryAnalyzer.geometryFromResults({
+        "asset/Rock.fbx": _result([(400, 200), (40, 20), (4, 2)])
+    })
+
+    assert geometry["points"] == [400, 40, 4]
+    assert geometry["polygons"] == [200, 20, 2]
+
+
+def test_plant_variations_are_summed_and_bounds_joined():
+    geometry = GeometryAnalyzer.geometryFromResults({
+        "asset/Var1/Fern_Var1_LOD0.fbx": _result([(100, 50)], (-1, 0, -2), (1, 5, 2), "m"),
+        "asset/Var2/Fern_Var2_LOD0.fbx": _result([(300, 150)], (-3, 0, -1), (2, 4, 1), "m"),
+        "asset/Var2/Fern_Var2_LOD1.fbx": _result([(30, 15)], (-3, 0, -1), (2, 4, 1), "m")
+    })
+
+    assert geometry == {
+        "units": "m", "points": [400, 30], "polygons": [200, 15], "min": [-3, 0, -2], "max": [2, 5, 2]
+    }
+
+    assert GeometryAnalyzer.geometryFromResults({}) is None
+
+
+def test_info_with_geometry():
+    geometry = {"units": "cm", "points": [4, 3], "polygons": [1, 1], "min": [0, 0, 0], "max": [2, 3, 0]}
+
+    flat = GeometryAnalyzer._infoWithGeometry({"name": "Rock"}, geometry)
+
+    assert flat == {
+        "name": "Rock", "point_count": [4, 3], "polygon_count": [1, 1], "lod_count": 2,
+        "units": "cm", "bound_min": [0, 0, 0], "bound_max": [2, 3, 0]
+    }
+
+    groups = [{"group": "asset", "records": []}, {"group": "Meshes", "records": [{"name": "stale"}]}]
+    groups = GeometryAnalyzer._infoWithGeometry(groups, geometry)
+
+    assert [group["group"] for group in groups] == ["asset", "Meshes", "Bound"]
+
+    meshes, bound = _geometry(groups)
+
+    assert meshes == {"Point count": [4, 3], "Polygon count": [1, 1], "LOD count": 2, "Units": "cm"}
+    assert bound == {"Minimum": [0.0, 0.0, 0.0], "Maximum": [2.0, 3.0, 0.0]}
+
+
+def test_process(tmp_path):
+    rock = str(tmp_path / "rock")
+    fern = str(tmp_path / "fern")
+    surface = str(tmp_path / "surface")
+
+    for folder in (rock, os.path.join(rock, "geometry"), fern, surface):
+        os.makedirs(folder)
+
+    writeFBX(os.path.join(rock, "geometry", "LOD0.fbx"), [mesh("Rock", QUAD, [[0, 1, 2, 3]])], unitScale=100.0)
+    writeFBX(os.path.join(rock, "geometry", "LOD1.fbx"), [mesh("Rock", QUAD[:3], [[0, 1, 2]])], unitScale=100.0)
+    writeFBX(os.path.join(fern, "Fern.fbx"), [
+        mesh("Fern_LOD0", QUAD, [[0, 1, 2], [0, 2, 3]]),
+        mesh("Fern_LOD1", [(-1, -1, -1)] + QUAD[1:], [[0, 1, 2]])
+    ])
+
+    with open(os.path.join(fern, "Broken.fbx"), "wb") as f:
+        f.write(b"not fbx")
+
+    Serializer.save([{"group": "asset", "records": []}], os.path.join(rock, "info.json"))
+    Serializer.save({"name": "Fern"}, os.path.join(fern, "info.json"))
+
+    analyzer = GeometryAnalyzer()
+    analyzer.workers = 1
+
+    empty = []
+    files = []
+    failed = analyzer.process([rock, fern, surface], callback=lambda path, error: files.append(path),
+                              emptyCallback=empty.append)
+
+    assert empty == [surface]
+    assert sorted(files) == sorted(analyzer.files(rock) + analyzer.files(fern))
+    assert [os.path.basename(path) for path, error in failed] == ["Broken.fbx"]
+
+    meshes, bound = _geometry(Serializer.load(os.path.join(rock, "info.json")))
+
+    assert meshes == {"Point count": [4, 3], "Polygon count": [1, 1], "LOD count": 2, "Units": "m"}
+    assert bound == {"Minimum": [0.0, 0.0, 0.0], "Maximum": [2.0, 3.0, 0.0]}
+
+    info = Serializer.load(os.path.join(fern, "info.json"))
+
+    assert info["point_count"] == [4, 4]
+    assert info["polygon_count"] == [2, 1]
+    assert info["units"] == "cm"
+    assert info["bound_min"] == [-1.0, -1.0, -1.0]
+    assert info["bound_max"] == [2.0, 3.0, 0.0]
+
+    assert not os.listdir(surface)
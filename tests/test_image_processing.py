@@ -0,0 +1,96 @@
+from Core.ImageProcessing import ImageProcessor
+
+from PIL import Image
+import pytest
+
+
+
+def _image(mode, color, size=1024):
+    if mode == "P":
+        image = Image.new("RGB", (size, size), color).convert("P", palette=Image.ADAPTIVE)
+    else:
+        image = Image.new(mode, (size, size), color)
+
+    return image
+
+
+@pytest.mark.parametrize("mode, color, expected", [
+    ("RGB", (200, 100, 50), "#C86432"),
+    ("RGBA", (200, 100, 50, 255), "#C86432"),
+    ("P", (200, 100, 50), "#C86432"),
+    ("L", 128, "#808080"),
+    ("LA", (128, 255), "#808080"),
+    ("1", 1, "#FFFFFF"),
+    ("I;16", 32768, "#808080")
+])
+def test_statistics_of_image_modes(tmp_path, mode, color, expected):
+    path = str(tmp_path / "texture.png")
+    image = _image(mode, color)
+
+    image.save(path)
+
+    processor = ImageProcessor()
+    processor.imageFile = path
+
+    assert processor.statistics()["mean"] == expected
+
+
+def test_reducible_modes():
+    palette = Image.new("RGB", (8, 8), (1, 2, 3)).convert("P", palette=Image.ADAPTIVE)
+
+    transparent = palette.copy()
+    transparent.info["transparency"] = 0
+
+    assert ImageProcessor._reducible(palette).mode == "RGB"
+    assert ImageProcessor._reducible(transparent).mode == "RGBA"
+    assert ImageProcessor._reducible(palette.convert("PA")).mode == "RGBA"
+    assert ImageProcessor._reducible(Image.new("1", (8, 8))).mode == "L"
+    assert ImageProcessor._reducible(Image.new("I;16", (8, 8))).mode == "L"
+    assert ImageProcessor._reducible(Image.new("LA", (8, 8))).mode == "LA"
+
+
+def test_statistics_of_opened_palette_image(tmp_path):
+    path = str(tmp_path / "texture.png")
+    _image("P", (10, 20, 30)).save(path)
+
+    processor = ImageProcessor()
+    processor.imageFile = path
+    processor.open()
+
+    assert processor.mode() == "P"
+    assert processor.statistics(sampleSize=128)["mean"] == "#0A141E"
+
+
+def test_open_reduced_palette_image(tmp_path):
+    path = str(tmp_path / "texture.png")
+    _image("P", (10, 20, 30)).save(path)
+
+    processor = ImageProcessor()
+    processor.imageFile = path
+    processor.openReduced(256)
+
+    assert processor.mode() == "RGB"
+    assert processor.size() == (256, 256)
+
+
+def test_statistics_keeps_lazy_operations(tmp_path):
+    path = str(tmp_path / "texture.png")
+    _image("RGB", (200, 100, 50)).save(path)
+
+    processor = ImageProcessor()
+    processor.lazy = True
+    processor.imageFile = path
+    processor.invert()
+    processor.resize(512, 512)
+
+    assert processor.statistics()["mean"] == "#379BCD"
+    assert processor.statistics()["mean"] == "#379BCD"
+
+    processor.save(str(tmp_path), "inverted", format="png")
+
+    with Image.open(str(tmp_path / "inverted.png")) as saved:
+        assert saved.size == (512, 512)
+        assert saved.getpixel((10, 10)) == (55, 155, 205)
+
+    assert processor.statistics()["mean"] == "#379BCD"
+    processor.close()
@@ -0,0 +1,115 @@
+from Core.IngestManagement import IngestManager, IngestPipeline, IngestStages, IngestTask
+
+import multiprocessing
+import numpy
+import time
+import os
+
+
+
+# stages run in worker processes, they must be module level functions
+
+def readStage(task):
+    return task.archive, task.archive
+
+
+def analyzeStage(archive):
+    if archive == "crash.zip":
+        os._exit(1)
+
+    return len(archive)
+
+
+def writeStage(task, state, statistics):
+    return state, os.path.join(task.directory, state), {"length": statistics}
+
+
+def failingAnalyzeStage(archive):
+    if archive == "fail.zip":
+        raise ValueError(archive)
+
+    return len(archive)
+
+
+# benchmark stages of Core.IngestManagement: I/O waits of archive read / info write
+# and CPU bound statistics
+
+def benchRead(task):
+    time.sleep(0.03)
+    return task.archive, task.archive
+
+
+def benchAnalyze(arguments):
+    pixels = numpy.random.randint(0, 255, (512 * 512, 3)).astype(numpy.float64)
+    return float(pixels.mean())
+
+
+def benchWrite(task, state, statistics):
+    time.sleep(0.01)
+    return state, task.directory, {"mean": statistics}
+
+
+def benchHandler(task):
+    state, arguments = benchRead(task)
+    return benchWrite(task, state, benchAnalyze(arguments))[1]
+
+
+
+def _run(analyze, names, workers=2):
+    manager = IngestManager()
+    manager.workers = workers
+    manager.registerStages("test", IngestStages(readStage, writeStage, analyze))
+
+    pipeline = IngestPipeline(manager)
+    pipeline.ioWorkers = 2
+
+    return pipeline.run([IngestTask(name, "test", "library") for name in names])
+
+
+def test_pipeline_processes_all_tasks():
+    names = ["asset_%d.zip" % i for i in range(20)]
+    results = _run(analyzeStage, names)
+
+    assert sorted(result.task.archive for result in results) == sorted(names)
+    assert all(result.success for result in results)
+
+
+def test_pipeline_reports_failed_analysis():
+    names = ["asset_%d.zip" % i for i in range(19)] + ["fail.zip"]
+    results = _run(failingAnalyzeStage, names)
+
+    failed = [result.task.archive for result in results if not result.success]
+    assert failed == ["fail.zip"]
+    assert len(results) == 20
+
+
+def test_pipeline_survives_dead_worker():
+    names = ["asset_%d.zip" % i for i in range(10)] + ["crash.zip"] + ["asset_%d.zip" % i for i in range(10, 19)]
+    results = _run(analyzeStage, names)
+
+    failed = [result for result in results if not result.success]
+
+    assert len(results) == 20
+    assert [result.task.archive for result in failed] == ["crash.zip"]
+    assert "BrokenProcessPool" in failed[0].error
+    assert sorted(result.task.archive for result in results if result.success) == sorted(set(names) - {"crash.zip"})
+
+
+def test_benchmark_stages_run_in_spawned_processes():
+    # stages are pickled by reference, spawned workers import them from this module
+
+    method = multiprocessing.get_start_method(allow_none=True)
+    multiprocessing.set_start_method("spawn", force=True)
+
+    try:
+        manager = IngestManager()
+        manager.workers = 2
+        manager.registerHandler("bench", benchHandler)
+        manager.registerStages("bench", IngestStages(benchRead, benchWrite, benchAnalyze))
+
+        tasks = [IngestTask("asset_%d.zip" % i, "bench", "library") for i in range(4)]
+
+        assert all(result.success for result in manager.run(tasks))
+        assert all(result.success for result in IngestPipeline(manager).run(tasks))
+    finally:
+        multiprocessing.set_start_method(method, force=True)
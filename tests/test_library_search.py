@@ -0,0 +1,94 @@
+from Core.LibrarySearch import LibrarySearch
+
+import random
+
+
+
+def _info(i, tags, width=4096, color="#7A6A5A"):
+    return {
+        "id": str(i), "name": "Asset_%d" % i, "tileable": i % 2 == 0, "width": width, "height": width,
+        "tags": tags, "displacement_min": 10, "displacement_max": 200, "average_color": color
+    }
+
+
+def test_find():
+    search = LibrarySearch()
+    search.addAsset("1", _info(1, ["rock", "moss"]))
+    search.addAsset("2", _info(2, ["rock"], 2048, "#000000"))
+    search.addAsset("3", _info(3, ["wood"]))
+
+    assert search.find(terms=["rock"]) == ["1", "2"]
+    assert search.find(tags=["moss"]) == ["1"]
+    assert search.find(terms=["rock"], minResolution=4096) == ["1"]
+    assert search.find(tileable=True) == ["2"]
+    assert search.find(terms=["rock"], color="#000000") == ["2", "1"]
+
+
+def test_incremental_updates_are_compacted():
+    random.seed(1)
+    search = LibrarySearch()
+    words = ["rock", "moss", "wood", "sand"]
+
+    for i in range(100):
+        search.addAsset(str(i), _info(i, random.sample(words, 2)))
+
+    for step in range(2000):
+        i = random.randrange(100)
+        search.addAsset(str(i), _info(i, random.sample(words, 2), random.choice([1024, 4096])))
+
+    assert len(search) == 100
+    assert len(search._ids) <= 100 / (1 - LibrarySearch.CompactRatio) + 1
+    assert len(search._resolutions) == len(search._ids) == len(search._colors)
+    assert max(len(documents) for documents in search._terms["terms"].values()) <= len(search._ids)
+
+    for assetID in search.find():
+        assert search._ids[search._documents[assetID]] == assetID
+
+    for word in words:
+        found = search.find(terms=[word], minResolution=4096, color="#7A6A5A")
+        assert len(found) == len(set(found))
+
+
+def test_compact_keeps_results():
+    search = LibrarySearch()
+
+    for i in range(10):
+        search.addAsset(str(i), _info(i, ["rock"] if i % 3 else ["wood"], 4096 if i % 2 else 1024))
+
+    search.CompactRatio = 1.0
+    search.removeAsset("3")
+    search.removeAsset("4")
+
+    before = [search.find(terms=["rock"]), search.find(minResolution=4096), search.find(tileable=False),
+              search.find(displacement=(0, 1)), search.find(color="#7A6A5A")]
+
+    search.compact()
+
+    after = [search.find(terms=["rock"]), search.find(minResolution=4096), search.find(tileable=False),
+             search.find(displacement=(0, 1)), search.find(color="#7A6A5A")]
+
+    assert before == after
+    assert len(search._ids) == 8
+    assert "3" not in search.find()
+
+
+def test_fields_from_quixel_info(tmp_path):
+    from Quixel.asset_3d import Quixel3D
+    from test_quixel_3d import _archive
+
+    import zipfile
+
+    with zipfile.ZipFile(_archive(tmp_path)) as archive:
+        info = Quixel3D().makeInfoFromZip(archive, "rock_abc123", ["nature"], "Rock")
+
+    fields = LibrarySearch.fieldsFromInfo(info)
+
+    assert fields["name"] == "Rock"
+    assert fields["tags"] == ["rock", "cliff"]
+    assert fields["sets"] == ["forest"]
+    assert fields["color"] == "#7A6A5A"
+
+    search = LibrarySearch()
+    search.addAsset("rock_abc123", info)
+
+    assert search.find(terms=["cliff"], color="#7A6A5A") == ["rock_abc123"]
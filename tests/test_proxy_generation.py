@@ -0,0 +1,94 @@
+from Core.ProxyGeneration import ProxyGenerator
+
+from PIL import Image
+import pytest
+import json
+import os
+
+
+
+def _asset(folder):
+    os.makedirs(os.path.join(folder, "textures"))
+
+    Image.new("RGB", (1024, 1024), (200, 100, 50)).save(os.path.join(folder, "textures", "albedo.jpg"))
+    Image.new("RGB", (512, 512), (1, 2, 3)).convert("P", palette=Image.ADAPTIVE).save(os.path.join(folder, "preview.png"))
+
+    with open(os.path.join(folder, "textures", "normal.png"), "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n broken")
+
+    with open(os.path.join(folder, "info.json"), "w") as f:
+        json.dump({"id": "1", "name": "Rock"}, f)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failed_proxies_are_not_recorded(tmp_path, workers):
+    folder = str(tmp_path / "1")
+    _asset(folder)
+
+    generator = ProxyGenerator()
+    generator.workers = workers
+
+    failed = generator.process([folder])
+
+    assert [os.path.basename(source) for source, error in failed] == ["normal.png"]
+
+    with open(os.path.join(folder, "info.json")) as f:
+        proxies = json.load(f)["proxies"]
+
+    assert proxies == {
+        "albedo": ["proxies/albedo_512.jpeg"],
+        "thumbnail": ["proxies/thumbnail_256.jpeg"]
+    }
+
+    for paths in proxies.values():
+        for path in paths:
+            assert os.path.isfile(os.path.join(folder, path))
+
+
+def test_contact_sheet_thumbnail(tmp_path):
+    folder = str(tmp_path / "1")
+    _asset(folder)
+    Image.new("RGB", (256, 256), (0, 0, 250)).save(os.path.join(folder, "textures", "roughness.png"))
+
+    generator = ProxyGenerator()
+    generator.workers = 1
+    generator.process([folder])
+
+    thumbnail = Image.open(os.path.join(folder, "proxies", "thumbnail_256.jpeg"))
+    assert thumbnail.size == (256, 256)
+
+    # 2 x 2 cells: preview, albedo, normal (unreadable, left black), roughness
+    cells = [thumbnail.getpixel((x, y)) for y in (64, 192) for x in (64, 192)]
+    expected = [(1, 2, 3), (200, 100, 50), (0, 0, 0), (0, 0, 250)]
+
+    for pixel, color in zip(cells, expected):
+        assert max(abs(a - b) for a, b in zip(pixel, color)) < 8
+
+
+def test_thumbnail_outdated_by_contact_sheet_map(tmp_path):
+    folder = str(tmp_path / "1")
+    os.makedirs(folder)
+    Image.new("RGB", (512, 512), (1, 2, 3)).save(os.path.join(folder, "preview.png"))
+
+    generator = ProxyGenerator()
+    generator.workers = 1
+    generator.process([folder])
+
+    thumbnail = os.path.join(folder, "proxies", "thumbnail_256.jpeg")
+
+    # preview alone is not tiled
+    assert Image.open(thumbnail).size == (256, 256)
+    assert generator.jobs(folder)[0] == []
+
+    os.utime(thumbnail, (os.path.getmtime(thumbnail) - 10,) * 2)
+
+    albedo = os.path.join(folder, "albedo.png")
+    Image.new("RGB", (256, 256), (200, 100, 50)).save(albedo)
+
+    jobs = generator.jobs(folder)[0]
+    assert [(os.path.basename(source), maps) for source, targets, maps in jobs] == [("preview.png", [albedo])]
+
+    generator.process([folder])
+
+    assert Image.open(thumbnail).size == (256, 128)
+    assert generator.jobs(folder)[0] == []
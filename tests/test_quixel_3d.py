@@ -0,0 +1,185 @@
+from Quixel.asset_3d import Quixel3D
+from Core.ArchiveIndex import ArchiveIndex
+
+import zipfile
+import json
+import os
+
+
+
+VENDOR_INFO = {
+    "tags": ["rock", "cliff"],
+    "environment": {"biome": "forest", "region": "Europe"},
+    "averageColor": "#7A6A5A",
+    "meta": [{"key": "texelDensity", "value": "1,024 px/m"}],
+    "meshes": [
+        {"type": "lod", "uris": [{"uri": "Rock_LOD0.fbx"}], "tris": 1000},
+        {"type": "lod", "uris": [{"uri": "Rock_LOD1.fbx"}], "tris": 100}
+    ]
+}
+
+
+def _archive(directory, name="Rock_3d_abc123.zip"):
+    path = os.path.join(str(directory), name)
+
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("Rock.json", json.dumps(VENDOR_INFO))
+        archive.writestr("Rock_4K_Albedo.jpg", b"albedo")
+        archive.writestr("Rock_4K_Normal_LOD0.jpg", b"normal")
+        archive.writestr("Rock_4K_Normal_LOD1.jpg", b"normal lod1")
+        archive.writestr("Rock_LOD0.fbx", b"lod0")
+        archive.writestr("Rock_LOD1.fbx", b"lod1")
+        archive.writestr("Rock_High.fbx", b"high")
+        archive.writestr("Rock_Preview.png", b"preview")
+
+    return path
+
+
+def test_extract_asset(tmp_path):
+    folder = Quixel3D().extractAsset(_archive(tmp_path), str(tmp_path / "library"), ["nature"], "Rock")
+
+    assert sorted(os.listdir(folder)) == ["geometry", "info.json", "preview.png", "textures"]
+    assert sorted(os.listdir(os.path.join(folder, "textures"))) == ["albedo.jpg", "normal.jpg"]
+    assert sorted(os.listdir(os.path.join(folder, "geometry"))) == ["LOD0.fbx", "LOD1.fbx"]
+
+    with open(os.path.join(folder, "textures", "normal.jpg"), "rb") as f:
+        assert f.read() == b"normal"
+
+    with open(os.path.join(folder, "info.json")) as f:
+        info = dict((group["group"], group["records"]) for group in json.load(f))
+
+    asset = dict((record["key"], record["value"]) for record in info["asset"])
+
+    assert asset["id"] == os.path.basename(folder)
+    assert asset["name"] == "Rock"
+    assert asset["tags"] == ["rock", "cliff"]
+    assert asset["set"] == ["forest"]
+    assert asset["color_avg"] == "#7A6A5A"
+    assert [record["value"] for record in info["geometry"]] == [1000, 100]
+
+
+def test_extract_asset_skips_indexed_archive(tmp_path):
+    parser = Quixel3D()
+    parser.archiveIndex = ArchiveIndex(str(tmp_path / "index.db"))
+
+    path = _archive(tmp_path)
+    folder = parser.extractAsset(path, str(tmp_path / "library"), ["nature"], "Rock")
+
+    assert parser.extractAsset(path, str(tmp_path / "library"), ["nature"], "Rock") == folder
+    assert os.listdir(str(tmp_path / "library")) == [os.path.basename(folder)]
+
+    parser.archiveIndex.close()
+
+
+def test_map_builders_share_manifest(tmp_path, monkeypatch):
+    import Core.ArchiveManifest
+
+    created = []
+    original = Core.ArchiveManifest.ArchiveManifest.__init__
+
+    def counted(self, *args, **kwargs):
+        created.append(self)
+        original(self, *args, **kwargs)
+
+    monkeypatch.setattr(Core.ArchiveManifest.ArchiveManifest, "__init__", counted)
+
+    parser = Quixel3D()
+
+    with zipfile.ZipFile(_archive(tmp_path)) as archive:
+        assert parser.getJSONInfoData(archive)["tags"] == ["rock", "cliff"]
+
+        textures = parser.mapTexturesFromZip(archive)
+        geometry = parser.mapGeometryFromZip(archive)
+
+        assert len(created) == 1
+        assert parser.manifestFromZip(archive) is created[0]
+
+    assert [(texture["type"], texture["name"]) for texture in textures] == [
+        ("albedo", "Rock_4K_Albedo.jpg"), ("normal", "Rock_4K_Normal_LOD0.jpg")
+    ]
+    assert [(mesh["lod"], mesh["name"]) for mesh in geometry] == [
+        ("LOD0", "Rock_LOD0.fbx"), ("LOD1", "Rock_LOD1.fbx")
+    ]
+
+
+def test_extract_asset_with_profile(tmp_path):
+    from Core.ExtractionProfile import ExtractionProfile
+
+    profile = ExtractionProfile(textureTypes=["normal"], textureLODs=["LOD1"], geometryLODs=["LOD1"], preview=False)
+    folder = Quixel3D().extractAsset(_archive(tmp_path), str(tmp_path / "library"), ["nature"], "Rock", profile)
+
+    assert sorted(os.listdir(folder)) == ["geometry", "info.json", "textures"]
+    assert os.listdir(os.path.join(folder, "textures")) == ["normal.jpg"]
+    assert os.listdir(os.path.join(folder, "geometry")) == ["LOD1.fbx"]
+
+    with open(os.path.join(folder, "textures", "normal.jpg"), "rb") as f:
+        assert f.read() == b"normal lod1"
+
+
+def test_texel_density():
+    assert Quixel3D().getValueFromJSONInfoTexelDensity(VENDOR_INFO)[0]["value"] == 1024
+
+
+def test_extract_asset_to_catalogue(tmp_path):
+    from Core.LibraryCatalogue import LibraryCatalogue
+    from Core.Serialization import SerializationFormats, Serializer
+
+    parser = Quixel3D()
+    parser.catalogue = LibraryCatalogue(str(tmp_path / "catalogue.db"))
+    parser.infoFileFormat = SerializationFormats.MSGPACK if "msgpack" in Serializer.availableFormats() else SerializationFormats.JSON
+
+    folder = parser.extractAsset(_archive(tmp_path), str(tmp_path / "library"), ["nature"], "Rock")
+
+    assert Serializer.infoFile(folder) == os.path.join(folder, Serializer.infoFileName(parser.infoFileFormat))
+    assert parser.catalogue.asset(os.path.basename(folder)).info == Serializer.load(Serializer.infoFile(folder))
+
+    parser.writeInfoFiles = False
+    folder = parser.extractAsset(_archive(tmp_path, "Tree_3d_def456.zip"), str(tmp_path / "library"), ["nature"], "Tree")
+
+    assert Serializer.infoFile(folder) == ""
+    assert parser.catalogue.asset(os.path.basename(folder)).folder == folder
+
+    parser.catalogue.close()
+
+
+def test_ingest_extracts_3d_geometry(tmp_path):
+    from Core.IngestManagement import IngestPipeline
+    from Core.LibraryCatalogue import LibraryCatalogue
+    from Quixel.quixel_ingest import QuixelIngestManager
+
+    os.makedirs(str(tmp_path / "megascans" / "3d"))
+    os.makedirs(str(tmp_path / "megascans" / "3dplant"))
+    _archive(tmp_path / "megascans" / "3d")
+    _archive(tmp_path / "megascans" / "3dplant", "Fern_3dplant_def456.zip")
+
+    for pipeline in (False, True):
+        library = str(tmp_path / ("pipeline" if pipeline else "handler"))
+
+        manager = QuixelIngestManager()
+        manager.workers = 1
+        manager.indexFile = os.path.join(library, "archives.db")
+        manager.catalogueFile = library + ".db"
+
+        tasks = manager.discoverLibrary(str(tmp_path / "megascans"), library, ["nature"])
+        results = IngestPipeline(manager).run(tasks) if pipeline else manager.run(tasks)
+
+        assert len(results) == 2 and all(result.success for result in results)
+
+        catalogue = LibraryCatalogue(manager.catalogueFile)
+
+        for result in results:
+            assert sorted(os.listdir(os.path.join(result.folder, "geometry"))) == ["LOD0.fbx", "LOD1.fbx"]
+            assert catalogue.asset(os.path.basename(result.folder)).folder == result.folder
+            assert manager.archiveIndex.lookup(result.task.archive, library) == result.folder
+
+        catalogue.close()
+        manager.archiveIndex.close()
+
+
+def test_parser_extracts_lod0_textures_of_3d_asset(tmp_path):
+    import quixel
+
+    folder = quixel.QuixelParser().extract3DAsset(_archive(tmp_path, "Rock_4K_3d_abc123.zip"), str(tmp_path / "library"), ["nature"], "Rock")
+
+    with open(os.path.join(folder, "normal.jpg"), "rb") as f:
+        assert f.read() == b"normal"
@@ -0,0 +1,36 @@
+from Core.Serialization import Serializer, SerializationFormats
+import Core.Serialization
+
+import numpy
+import pytest
+import json
+
+
+
+INFO = {"name": u"Ročk", "tags": ["rock", "cliff"], "width": 4096, "tileable": True, "mean": [0.5, 1.25]}
+
+
+@pytest.mark.parametrize("backend", ["orjson", "ujson", "json"])
+def test_indented_json_does_not_depend_on_backend(monkeypatch, backend):
+    if backend != "json":
+        pytest.importorskip(backend)
+
+    for module in ("orjson", "ujson"):
+        if module != backend:
+            monkeypatch.setattr(Core.Serialization, module, None)
+
+    expected = json.dumps(INFO, indent=4).encode("utf-8")
+
+    assert Serializer.dumps(INFO, compact=False) == expected
+    assert Serializer.dumps(dict(INFO, width=numpy.int64(4096)), compact=False) == expected
+    assert Serializer.loads(Serializer.dumps(INFO)) == INFO
+
+
+def test_save_is_indented(tmp_path):
+    path = str(tmp_path / Serializer.infoFileName(SerializationFormats.JSON))
+    Serializer.save(INFO, path)
+
+    with open(path, "rb") as f:
+        assert f.read() == json.dumps(INFO, indent=4).encode("utf-8")
+
+    assert Serializer.load(path) == INFO
@@ -0,0 +1,54 @@
+from Core.CommonFunctionality import UniqueIDGenerator, uniqueID
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import signal
+import pytest
+import os
+
+
+
+# minted in worker processes, must be module level function
+
+def mintThreaded(count, threads=4):
+    with ThreadPoolExecutor(threads) as executor:
+        chunks = executor.map(lambda n: [uniqueID() for _ in range(n)], [count // threads] * threads)
+        return [i for chunk in chunks for i in chunk]
+
+
+def test_ids_are_unique_across_processes_and_threads():
+    with ProcessPoolExecutor(4) as executor:
+        chunks = list(executor.map(mintThreaded, [20000] * 8))
+
+    ids = [i for chunk in chunks for i in chunk] + mintThreaded(20000)
+
+    assert len(ids) == 9 * 20000
+    assert len(set(ids)) == len(ids)
+    assert all(len(i) == 30 for i in ids)
+
+    for chunk in chunks:
+        assert len(set(i[20:27] for i in chunk)) == 1
+
+
+def test_ids_of_one_generator_increase():
+    generator = UniqueIDGenerator(worker=7)
+    ids = [generator.next() for _ in range(5000)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork is not available")
+def test_fork_while_lock_is_held():
+    generator = UniqueIDGenerator()
+    parent = generator.next()
+
+    with generator._lock:
+        pid = os.fork()
+
+        if pid == 0:
+            # deadlocked child is killed by alarm
+            signal.alarm(10)
+            child = generator.next()
+            os._exit(0 if child[20:27] != parent[20:27] else 1)
+
+    assert os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]) == 0